@@ -9,31 +9,54 @@ __version__ = '2.0.2'
 
 # This code is written for Python 3.
 import importlib
+import importlib.util
 import sys
 if sys.version_info[0] != 3:
     print("Code requires Python 3.")
     sys.exit(1)
 
 
-# Let users know if they're missing any of our hard dependencies
+# Let users know if they're missing any of our hard dependencies.
+# The modules are only located, not imported, to keep the import fast.
 hard_dependencies = ("numpy", "pandas", "scipy",
                      "matplotlib", "CoolProp")
-missing_dependencies = []
-dependency = None
-
-for dependency in hard_dependencies:
-    try:
-        importlib.import_module(dependency)
-    except ImportError as e_info:
-        missing_dependencies.append(dependency)
+missing_dependencies = [
+    dependency for dependency in hard_dependencies
+    if importlib.util.find_spec(dependency) is None
+]
 
 if missing_dependencies:
     raise ImportError(
         "Missing required dependencies {0}".format(missing_dependencies))
-del hard_dependencies, dependency, missing_dependencies
+del hard_dependencies, missing_dependencies
 
 from .data import DATABASE
 from .data import ADSORBATE_LIST
 from .data import ADSORBATE_NAME_LIST
 from .data import MATERIAL_LIST
 from .api import *
+from .api import _LAZY_API
+from . import batch
+
+
+def __getattr__(name):
+    """Import plotting and optional parsing functions on first use."""
+    if name in _LAZY_API:
+        value = getattr(importlib.import_module(_LAZY_API[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        "module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_API))
+
+
+# Star imports include the functions loaded on first use
+__all__ = [name for name in globals() if not name.startswith('_')] + list(_LAZY_API)
+
+# Module level __getattr__ is only available from Python 3.7
+if sys.version_info < (3, 7):
+    for _name in _LAZY_API:
+        __getattr__(_name)
@@ -10,6 +10,7 @@ from .characterisation.area_langmuir import area_langmuir_raw
 from .characterisation.dr_da_plots import da_plot
 from .characterisation.dr_da_plots import dr_plot
 from .characterisation.iast import iast
+from .characterisation.iast import iast_batch
 from .characterisation.iast import iast_binary_svp
 from .characterisation.iast import iast_binary_vle
 from .characterisation.iast import reverse_iast
@@ -20,7 +21,9 @@ from .characterisation.initial_henry import initial_henry_virial
 from .characterisation.isosteric_enthalpy import isosteric_enthalpy
 from .characterisation.isosteric_enthalpy import isosteric_enthalpy_raw
 from .characterisation.psd_dft import psd_dft
+from .characterisation.psd_dft import psd_dft_batch
 from .characterisation.psd_mesoporous import psd_mesoporous
+from .characterisation.psd_mesoporous import psd_mesoporous_batch
 from .characterisation.psd_microporous import psd_microporous
 from .characterisation.tplot import t_plot
 from .characterisation.tplot import t_plot_raw
@@ -28,15 +31,10 @@ from .core.adsorbate import Adsorbate
 from .core.material import Material
 from .core.modelisotherm import ModelIsotherm
 from .core.pointisotherm import PointIsotherm
-from .graphing.iastgraphs import plot_iast_vle
-from .graphing.isothermgraphs import plot_iso
 from .parsing import *
 from .parsing.csv_bel_parser import isotherm_from_bel
 from .parsing.csvinterface import isotherm_from_csv
 from .parsing.csvinterface import isotherm_to_csv
-from .parsing.excelinterface import isotherm_from_xl
-from .parsing.excelinterface import isotherm_to_xl
-from .parsing.isodbinterface import isotherm_from_isodb
 from .parsing.jsoninterface import isotherm_from_json
 from .parsing.jsoninterface import isotherm_from_jsonf
 from .parsing.jsoninterface import isotherm_to_json
@@ -49,3 +47,13 @@ from .utilities.exceptions import ParameterError
 from .utilities.exceptions import ParsingError
 from .utilities.exceptions import pgError
 from .utilities.folder_utilities import util_get_file_paths
+
+# Functions which require matplotlib, the excel libraries or requests.
+# They are imported by the package on first access.
+_LAZY_API = {
+    'plot_iast_vle': '.graphing.iastgraphs',
+    'plot_iso': '.graphing.isothermgraphs',
+    'isotherm_from_xl': '.parsing.excelinterface',
+    'isotherm_to_xl': '.parsing.excelinterface',
+    'isotherm_from_isodb': '.parsing.isodbinterface',
+}
@@ -0,0 +1,230 @@
+"""
+Characterisation of many isotherms at once.
+
+The isotherms are split in chunks, which are processed either
+in the current process or by a pool of worker processes.
+Errors from pyGAPS on a single isotherm are recorded
+instead of stopping the whole run.
+"""
+
+import concurrent.futures
+import math
+import numbers
+import os
+import time
+
+import numpy
+import pandas
+
+from .characterisation.alphas import alpha_s
+from .characterisation.area_bet import area_BET
+from .characterisation.area_langmuir import area_langmuir
+from .characterisation.dr_da_plots import da_plot
+from .characterisation.dr_da_plots import dr_plot
+from .characterisation.initial_enthalpy import initial_enthalpy_comp
+from .characterisation.initial_enthalpy import initial_enthalpy_point
+from .characterisation.initial_henry import initial_henry_slope
+from .characterisation.initial_henry import initial_henry_virial
+from .characterisation.psd_dft import psd_dft
+from .characterisation.psd_mesoporous import psd_mesoporous
+from .characterisation.psd_microporous import psd_microporous
+from .characterisation.tplot import t_plot
+from .utilities.exceptions import ParameterError
+from .utilities.exceptions import pgError
+
+#: Characterisation methods which can be requested by name.
+METHODS = {
+    method.__name__: method for method in [
+        alpha_s,
+        area_BET,
+        area_langmuir,
+        da_plot,
+        dr_plot,
+        initial_enthalpy_comp,
+        initial_enthalpy_point,
+        initial_henry_slope,
+        initial_henry_virial,
+        psd_dft,
+        psd_mesoporous,
+        psd_microporous,
+        t_plot,
+    ]
+}
+
+_COLUMNS = ['isotherm', 'material', 'adsorbate', 'temperature',
+            'method', 'time', 'error', 'result']
+
+
+def characterise(isotherms, methods,
+                 n_jobs=None,
+                 executor=None,
+                 chunksize=None):
+    """
+    Apply several characterisation methods to a collection of isotherms.
+
+    Each method is applied to each isotherm. The isotherms are sent
+    in chunks to a pool of processes, by passing the number of processes
+    as ``n_jobs``, or an existing executor.
+
+    Parameters
+    ----------
+    isotherms : iterable of PointIsotherm or ModelIsotherm
+        The isotherms to characterise.
+    methods : list or dict
+        The methods to apply. Each method can be the name of a
+        pyGAPS characterisation function (see ``METHODS``), any function
+        which takes an isotherm as the first argument, or a tuple of either
+        and a dictionary of other arguments to pass to the function,
+        eg: ``['area_BET', ('t_plot', {'limits': [0.3, 0.5]})]``.
+        A dictionary of labels and methods can be passed instead,
+        to apply the same function with different arguments.
+    n_jobs : int, optional
+        Number of processes to use. If ``None``, the isotherms are
+        characterised one after another in the current process.
+    executor : concurrent.futures.Executor, optional
+        An executor to submit the chunks to, instead
+        of creating a process pool with ``n_jobs``.
+    chunksize : int, optional
+        Number of isotherms sent to a process at once. By default,
+        the isotherms are split in about four chunks for each process.
+
+    Returns
+    -------
+    DataFrame
+        A table with a row for each isotherm and method, with the position of
+        the isotherm in the collection, its material, adsorbate and temperature,
+        the method label, the time taken in seconds, the error raised if the
+        calculation failed and the returned result. Any scalar values
+        of the results are also expanded into their own columns.
+
+    Raises
+    ------
+    ``ParameterError``
+        When a method is not recognised.
+
+    Notes
+    -----
+    Only errors raised by pyGAPS (such as ``CalculationError`` or
+    ``ParameterError``) are recorded, other exceptions are raised.
+
+    Worker processes only know of the materials and adsorbates which
+    were added to the global lists at runtime if they are started by
+    forking the current process, which is the default on Linux.
+    Plotting is not possible from other processes, so ``verbose``
+    should not be passed to the methods when using a pool.
+
+    """
+    isotherms = list(isotherms)
+    methods = _resolve_methods(methods)
+
+    if n_jobs is None and executor is None:
+        records = _characterise_chunk(0, isotherms, methods)
+
+    else:
+        if chunksize is None:
+            workers = n_jobs or os.cpu_count() or 1
+            chunksize = max(1, math.ceil(len(isotherms) / (4 * workers)))
+
+        pool = executor or concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs)
+        try:
+            futures = [
+                pool.submit(_characterise_chunk, start,
+                            isotherms[start:start + chunksize], methods)
+                for start in range(0, len(isotherms), chunksize)
+            ]
+            records = []
+            for future in futures:
+                records.extend(future.result())
+        finally:
+            if executor is None:
+                pool.shutdown(wait=True)
+
+    return _results_table(records)
+
+
+def _resolve_methods(methods):
+    """Return a list of label, function and arguments of each method."""
+    if isinstance(methods, dict):
+        items = list(methods.items())
+    else:
+        items = [(None, method) for method in methods]
+
+    resolved = []
+    for label, method in items:
+        parameters = {}
+        if isinstance(method, tuple):
+            method, parameters = method
+
+        if isinstance(method, str):
+            if method not in METHODS:
+                raise ParameterError(
+                    "Method {0} is not recognised. Viable methods "
+                    "are {1}".format(method, list(METHODS)))
+            method = METHODS[method]
+        elif not callable(method):
+            raise ParameterError(
+                "Pass methods as names or functions, not {0}".format(method))
+
+        resolved.append((label or method.__name__, method, parameters))
+
+    return resolved
+
+
+def _characterise_chunk(start, isotherms, methods):
+    """
+    Apply the methods to a chunk of isotherms.
+
+    Defined at module level so that it can be sent to other processes.
+    Returns a record for each isotherm and method.
+    """
+    records = []
+
+    for position, isotherm in enumerate(isotherms, start):
+        for label, method, parameters in methods:
+            result, error = None, None
+            start_time = time.perf_counter()
+            try:
+                result = method(isotherm, **parameters)
+            except pgError as e:
+                error = e
+            records.append((
+                position,
+                isotherm.material,
+                str(isotherm.adsorbate),
+                isotherm.temperature,
+                label,
+                time.perf_counter() - start_time,
+                error,
+                result,
+            ))
+
+    return records
+
+
+def _results_table(records):
+    """Build the table of results, expanding any scalar values."""
+    rows = []
+    extra = {}
+
+    for record in records:
+        row = dict(zip(_COLUMNS, record))
+        result = row['result']
+
+        if isinstance(result, dict):
+            values = result.items()
+        else:
+            values = [('value', result)]
+
+        for key, value in values:
+            if key not in row and _is_scalar(value):
+                row[key] = value
+                extra.setdefault(key, None)
+
+        rows.append(row)
+
+    return pandas.DataFrame(rows, columns=_COLUMNS + list(extra))
+
+
+def _is_scalar(value):
+    """Check if a value is a single number."""
+    return isinstance(value, numbers.Number) and numpy.ndim(value) == 0
@@ -6,7 +6,6 @@ import scipy
 
 from ..core.adsorbate import Adsorbate
 from ..core.isotherm import Isotherm
-from ..graphing.calcgraph import plot_tp
 from ..utilities.exceptions import ParameterError
 from ..utilities.math_utilities import find_linear_sections
 from .area_bet import area_BET
@@ -160,6 +159,7 @@ def alpha_s(isotherm, reference_isotherm, reference_area=None,
                     round(result.get('area'), 4)
                 ))
 
+            from ..graphing.calcgraph import plot_tp
             plot_tp(alpha_curve, loading, results, alpha_s=True,
                     alpha_reducing_p=reducing_pressure)
 
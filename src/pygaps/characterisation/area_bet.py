@@ -2,17 +2,16 @@
 
 import warnings
 
+import numpy
 import scipy.constants as const
 import scipy.stats
 
 from ..core.adsorbate import Adsorbate
-from ..graphing.calcgraph import bet_plot
-from ..graphing.calcgraph import roq_plot
 from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
 
 
-def area_BET(isotherm, limits=None, verbose=False):
+def area_BET(isotherm, limits=None, full_search=False, verbose=False):
     r"""
     Calculate BET-determined surface area from an isotherm.
 
@@ -27,6 +26,10 @@ def area_BET(isotherm, limits=None, verbose=False):
         The isotherm of which to calculate the BET surface area.
     limits : [float, float], optional
         Manual limits for region selection.
+    full_search : bool, optional
+        Whether to evaluate every possible region and select the best one
+        which satisfies the Rouquerol criteria, instead of the default
+        selection. See :func:`bet_optimal_region`. Ignored if limits are given.
     verbose : bool, optional
         Prints extra information and plots graphs of the calculation.
 
@@ -44,6 +47,10 @@ def area_BET(isotherm, limits=None, verbose=False):
         - ``bet_slope`` (float) : slope of the BET plot
         - ``bet_intercept`` (float) : intercept of the BET plot
         - ``corr_coef`` (float) : correlation coefficient of the linear region in the BET plot
+        - ``limits`` (list) : the indices of the first point and the point after the last
+          in the BET region
+        - ``region_scores`` (array) : only with ``full_search``, the correlation
+          coefficient of each admissible region
 
     Notes
     -----
@@ -95,7 +102,9 @@ def area_BET(isotherm, limits=None, verbose=False):
         * The loading at the statistical monolayer should be situated within the
           limits of the BET region
 
-    This module implements all these checks.
+    This module implements all these checks. With ``full_search``, every region
+    of three or more points is evaluated at once, and the longest region which
+    satisfies all the checks is selected, as described in :func:`bet_optimal_region`.
 
     Regardless, the BET surface area should still be interpreted carefully. The following
     assumptions are implicitly made in this approach:
@@ -128,9 +137,15 @@ def area_BET(isotherm, limits=None, verbose=False):
                                  pressure_mode='relative')
 
     # use the bet function
-    (bet_area, c_const, n_monolayer, p_monolayer, slope,
-     intercept, minimum, maximum, corr_coef) = area_BET_raw(
-        pressure, loading, cross_section, limits=limits)
+    scores = None
+    if full_search and limits is None:
+        minimum, maximum, scores = bet_optimal_region(pressure, loading)
+        (bet_area, c_const, n_monolayer, p_monolayer, slope,
+         intercept, corr_coef) = _bet_fit(pressure, loading, cross_section, minimum, maximum)
+    else:
+        (bet_area, c_const, n_monolayer, p_monolayer, slope,
+         intercept, minimum, maximum, corr_coef) = area_BET_raw(
+            pressure, loading, cross_section, limits=limits)
 
     if verbose:
 
@@ -145,6 +160,7 @@ def area_BET(isotherm, limits=None, verbose=False):
               round(n_monolayer, 5), "mol/{}".format(isotherm.adsorbent_unit))
 
         # Generate plot of the BET points chosen
+        from ..graphing.calcgraph import bet_plot
         bet_plot(pressure,
                  bet_transform(pressure, loading),
                  minimum, maximum,
@@ -153,13 +169,14 @@ def area_BET(isotherm, limits=None, verbose=False):
                  bet_transform(p_monolayer, n_monolayer))
 
         # Generate plot of the Rouquerol points chosen
+        from ..graphing.calcgraph import roq_plot
         roq_plot(pressure,
                  roq_transform(pressure, loading),
                  minimum, maximum,
                  p_monolayer,
                  roq_transform(p_monolayer, n_monolayer))
 
-    return {
+    results = {
         'area': bet_area,
         'c_const': c_const,
         'n_monolayer': n_monolayer,
@@ -169,9 +186,13 @@ def area_BET(isotherm, limits=None, verbose=False):
         'corr_coef': corr_coef,
         'limits': [minimum, maximum]
     }
+    if scores is not None:
+        results['region_scores'] = scores
+
+    return results
 
 
-def area_BET_raw(pressure, loading, cross_section, limits=None):
+def area_BET_raw(pressure, loading, cross_section, limits=None, full_search=False):
     """
     Calculate BET-determined surface area.
 
@@ -189,6 +210,9 @@ def area_BET_raw(pressure, loading, cross_section, limits=None):
         Adsorbed cross-section of the molecule of the adsorbate, in nm.
     limits : [float, float], optional
         Manual limits for region selection.
+    full_search : bool, optional
+        Whether to select the region with :func:`bet_optimal_region`.
+        Ignored if limits are given.
 
     Returns
     -------
@@ -220,7 +244,10 @@ def area_BET_raw(pressure, loading, cross_section, limits=None):
     roq_t_array = roq_transform(pressure, loading)
 
     # select the maximum and minimum of the points and the pressure associated
-    if limits is None:
+    if full_search and limits is None:
+        minimum, maximum, _ = bet_optimal_region(pressure, loading)
+
+    elif limits is None:
         maximum = len(roq_t_array) - 1
         for index, value in enumerate(roq_t_array):
             if index == maximum:
@@ -256,6 +283,15 @@ def area_BET_raw(pressure, loading, cross_section, limits=None):
         raise CalculationError("The isotherm does not have enough points in the BET "
                                "region. Unable to calculate BET area.")
 
+    (bet_area, c_const, n_monolayer, p_monolayer,
+     slope, intercept, corr_coef) = _bet_fit(pressure, loading, cross_section, minimum, maximum)
+
+    return (bet_area, c_const, n_monolayer, p_monolayer,
+            slope, intercept, minimum, maximum, corr_coef)
+
+
+def _bet_fit(pressure, loading, cross_section, minimum, maximum):
+    """Fit the BET region and check the results for consistency."""
     # calculate the BET transform, slope and intercept
     bet_t_array = bet_transform(
         pressure[minimum:maximum], loading[minimum:maximum])
@@ -275,7 +311,137 @@ def area_BET_raw(pressure, loading, cross_section, limits=None):
         warnings.warn("The monolayer point is not within the BET region")
 
     return (bet_area, c_const, n_monolayer, p_monolayer,
-            slope, intercept, minimum, maximum, corr_coef)
+            slope, intercept, corr_coef)
+
+
+def bet_optimal_region(pressure, loading,
+                       min_points=3, min_corr=0.995, p_tolerance=0.1):
+    r"""
+    Find the best BET region by evaluating every possible one.
+
+    All contiguous regions of at least ``min_points`` points are fitted
+    at once: the sums required for the slope, intercept and correlation
+    coefficient of each region are obtained from cumulative sums over the
+    points. The Rouquerol criteria are then applied as masks:
+
+        * The BET constant (C) and the monolayer loading should be positive
+        * The Rouquerol transform :math:`n_{ads}(1-p/p_0)` should be strictly
+          increasing over the region
+        * The loading at the statistical monolayer should be within the region
+        * The relative pressure at which the monolayer loading is reached
+          should be close to :math:`1 / (\sqrt{C} + 1)`
+
+    Of the regions satisfying all criteria, and with a correlation
+    coefficient of at least ``min_corr``, the one with the most points is
+    selected. If there are several, the one with the best correlation is chosen.
+
+    Parameters
+    ----------
+    pressure : array
+        Pressures, relative.
+    loading : array
+        Loadings, in mol/basis.
+    min_points : int, optional
+        The minimum number of points in a region.
+    min_corr : float, optional
+        The minimum correlation coefficient of the BET fit.
+    p_tolerance : float, optional
+        The relative tolerance between the pressure at the monolayer loading
+        and the one calculated from the C constant. If ``None``, the check is skipped.
+
+    Returns
+    -------
+    minimum : int
+        Index of the first point of the best region.
+    maximum : int
+        Index of the point after the last point of the best region.
+    scores : array
+        Correlation coefficient of the region starting at each row
+        index and ending before each column index,
+        or NaN if the region is not admissible.
+
+    Raises
+    ------
+    ``CalculationError``
+        If no region satisfies the criteria.
+
+    """
+    pressure = numpy.asarray(pressure, dtype=float)
+    loading = numpy.asarray(loading, dtype=float)
+    if len(pressure) != len(loading):
+        raise ParameterError("The length of the pressure and loading arrays"
+                             " do not match")
+    n_points = len(pressure)
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        bet_points = bet_transform(pressure, loading)
+        finite = numpy.isfinite(bet_points)
+        if not finite.any():
+            raise CalculationError("No points can be used in the BET plot.")
+
+        # Centre the values to limit the rounding errors of the cumulative sums
+        x_mean = pressure[finite].mean()
+        y_mean = bet_points[finite].mean()
+        x = numpy.where(finite, pressure - x_mean, 0)
+        y = numpy.where(finite, bet_points - y_mean, 0)
+
+        def region_sums(values):
+            """Sum of the values of each region [row, column)."""
+            cumulative = numpy.concatenate([[0], numpy.cumsum(values)])
+            return cumulative[None, :n_points] - cumulative[:n_points, None]
+
+        start, end = numpy.ogrid[:n_points, :n_points]
+        last = numpy.maximum(end - 1, 0)
+        size = region_sums(numpy.ones(n_points))
+        sum_x, sum_y = region_sums(x), region_sums(y)
+        var_x = size * region_sums(x * x) - sum_x ** 2
+        var_y = size * region_sums(y * y) - sum_y ** 2
+        cov_xy = size * region_sums(x * y) - sum_x * sum_y
+
+        # Linear fit of every region, in the original coordinates
+        slope = cov_xy / var_x
+        intercept = (sum_y - slope * sum_x) / size + y_mean - slope * x_mean
+        corr_coef = cov_xy / numpy.sqrt(var_x * var_y)
+
+        # BET parameters of every region
+        c_const = slope / intercept + 1
+        n_monolayer = 1 / (slope + intercept)
+        p_monolayer = 1 / (numpy.sqrt(c_const) + 1)
+
+        # All points should be usable, and the fit linear enough
+        valid = (size >= min_points) & (region_sums(~finite) == 0)
+        valid &= corr_coef >= min_corr
+
+        # The C constant and monolayer loading should be positive
+        valid &= (c_const > 0) & (n_monolayer > 0)
+
+        # The Rouquerol transform should be increasing over the region
+        decreasing = numpy.concatenate(
+            [[0], numpy.cumsum(numpy.diff(roq_transform(pressure, loading)) <= 0)])
+        valid &= (decreasing[last] - decreasing[start]) == 0
+
+        # The monolayer loading should be within the region
+        valid &= (loading[start] <= n_monolayer) & (n_monolayer <= loading[last])
+
+        # The pressure at the monolayer should match the one from C
+        if p_tolerance is not None:
+            order = numpy.argsort(loading)
+            p_loading = numpy.interp(numpy.where(valid, n_monolayer, 0),
+                                     loading[order], pressure[order])
+            valid &= numpy.abs(p_loading - p_monolayer) <= p_tolerance * p_loading
+
+    if not valid.any():
+        raise CalculationError("No region of the isotherm satisfies the BET "
+                               "consistency criteria. Unable to calculate BET area.")
+
+    scores = numpy.where(valid, corr_coef, numpy.nan)
+
+    # Longest region, then best correlation
+    longest = valid & (size == size[valid].max())
+    minimum, maximum = numpy.unravel_index(
+        numpy.argmax(numpy.where(longest, corr_coef, -numpy.inf)), scores.shape)
+
+    return int(minimum), int(maximum), scores
 
 
 def roq_transform(pressure, loading):
@@ -6,7 +6,6 @@ import scipy.constants as const
 import scipy.stats as stats
 
 from ..core.adsorbate import Adsorbate
-from ..graphing.calcgraph import langmuir_plot
 from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
 
@@ -125,6 +124,7 @@ def area_langmuir(isotherm, limits=None, verbose=False):
               round(n_monolayer, 5), "mol/{}".format(isotherm.adsorbent_unit))
 
         # Generate plot of the langmuir points chosen
+        from ..graphing.calcgraph import langmuir_plot
         langmuir_plot(pressure,
                       langmuir_transform(pressure, loading),
                       minimum, maximum,
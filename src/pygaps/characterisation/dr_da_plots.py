@@ -6,7 +6,6 @@ import scipy.optimize as opt
 import scipy.stats as stats
 
 from ..core.adsorbate import Adsorbate
-from ..graphing.calcgraph import dra_plot
 from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
 
@@ -209,6 +208,7 @@ def da_plot(isotherm, exp=None, limits=None, verbose=False):
 
     if verbose:
 
+        from ..graphing.calcgraph import dra_plot
         dra_plot(logv, log_n_p0p, slope, intercept, exp)
 
         if find_exp:
@@ -5,8 +5,6 @@ import warnings
 import numpy
 import scipy.optimize
 
-from ..graphing.iastgraphs import plot_iast_svp
-from ..graphing.iastgraphs import plot_iast_vle
 from ..modelling import is_iast_model
 from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
@@ -63,14 +61,16 @@ def iast_binary_vle(isotherms, total_pressure,
     y2_data = 1 - y_data
     binary_fractions = numpy.array((y_data, y2_data)).transpose()
 
-    # Generate the array of loadings
-    component_loadings = numpy.zeros((len(binary_fractions), 2))
+    # Run IAST on all fractions at once
+    component_loadings, converged = iast_batch(
+        isotherms, binary_fractions, total_pressure, warningoff=warningoff,
+        adsorbed_mole_fraction_guess=adsorbed_mole_fraction_guess)
 
-    # Run IAST
-    for index, fraction in enumerate(binary_fractions):
-        component_loadings[index, :] = iast(
-            isotherms, fraction, total_pressure, warningoff=warningoff,
-            adsorbed_mole_fraction_guess=adsorbed_mole_fraction_guess)
+    if not converged.all():
+        raise CalculationError(
+            """Root finding for adsorbed phase mole fractions failed.
+        Try a different starting guess for the adsorbed phase mole fractions by
+        passing an array adsorbed_mole_fraction_guess to this function.""")
 
     x_data = [x[0] / (x[0] + x[1]) for x in component_loadings]
 
@@ -80,6 +80,7 @@ def iast_binary_vle(isotherms, total_pressure,
 
     # Generate the array of partial pressures
     if verbose:
+        from ..graphing.iastgraphs import plot_iast_vle
         plot_iast_vle(x_data, y_data,
                       isotherms[0], isotherms[1],
                       total_pressure, isotherms[0].pressure_unit,
@@ -144,18 +145,23 @@ def iast_binary_svp(isotherms, mole_fractions, pressures,
     pressures = numpy.asarray(pressures)
     mole_fractions = numpy.asarray(mole_fractions)
 
-    # Generate the array of partial pressures
-    component_loadings = numpy.zeros((len(pressures), 2))
+    # Run IAST on all pressures at once
+    component_loadings, converged = iast_batch(
+        isotherms, numpy.tile(mole_fractions, (len(pressures), 1)), pressures,
+        warningoff=warningoff,
+        adsorbed_mole_fraction_guess=adsorbed_mole_fraction_guess)
 
-    for index, pressure in enumerate(pressures):
-        component_loadings[index, :] = iast(
-            isotherms, mole_fractions, pressure, warningoff=warningoff,
-            adsorbed_mole_fraction_guess=adsorbed_mole_fraction_guess)
+    if not converged.all():
+        raise CalculationError(
+            """Root finding for adsorbed phase mole fractions failed.
+        Try a different starting guess for the adsorbed phase mole fractions by
+        passing an array adsorbed_mole_fraction_guess to this function.""")
 
     selectivities = [(x[0] / mole_fractions[0]) /
                      (x[1] / mole_fractions[1]) for x in component_loadings]
 
     if verbose:
+        from ..graphing.iastgraphs import plot_iast_svp
         plot_iast_svp(pressures, selectivities,
                       isotherms[0], isotherms[1],
                       mole_fractions[0], isotherms[0].pressure_unit,
@@ -346,6 +352,209 @@ def iast(isotherms, gas_mole_fraction, total_pressure,
     return loadings
 
 
+def iast_batch(isotherms, gas_mole_fractions, total_pressures,
+               warningoff=False, adsorbed_mole_fraction_guess=None,
+               tolerance=1e-9, max_iterations=100):
+    r"""
+    Perform IAST calculations for many gas compositions and total
+    pressures at once.
+
+    All systems are solved together: the spreading pressure and loading
+    of each component are evaluated on whole arrays and the unknown
+    fictitious pressures :math:`p_i^0` are refined by a batched Newton
+    iteration in :math:`\ln p_i^0`. As the derivative of the spreading
+    pressure is known exactly,
+
+    .. math::
+
+        \frac{d \Pi_i}{d \ln p_i^0} = n_i(p_i^0)
+
+    each step amounts to computing a common target spreading pressure
+    for the row and moving every component towards it.
+
+    Pass a list of pure-component adsorption isotherms `isotherms`.
+
+    Parameters
+    ----------
+    isotherms : list of ModelIsotherms or PointIsotherms
+        Model adsorption isotherms.
+        e.g. [methane_isotherm, ethane_isotherm]
+    gas_mole_fractions : array
+        Gas phase mole fractions of each system, of shape (N, k)
+        where k is the number of isotherms. Each row must add to 1.
+    total_pressures : array or float
+        Total gas phase pressure of each system, of shape (N,).
+        A single value is used for all systems.
+    warningoff: bool, optional
+        When False, warnings will print when the IAST
+        calculation result required extrapolation of the pure-component
+        adsorption isotherm beyond the highest pressure in the data.
+    adsorbed_mole_fraction_guess : array, optional
+        Starting guesses for adsorbed phase mole fractions, either
+        of shape (k,) to be used for all systems or of shape (N, k).
+    tolerance : float, optional
+        Convergence criterion on the relative change of the fictitious
+        pressures and on the closure of the adsorbed mole fractions.
+    max_iterations : int, optional
+        Maximum number of Newton iterations.
+
+    Returns
+    -------
+    loadings : array
+        Predicted uptakes of each component, of shape (N, k)
+        (mmol/g or equivalent in isotherm units). Rows which
+        did not converge are filled with NaN.
+    converged : array
+        Boolean array of shape (N,), marking the systems for which
+        the iteration converged.
+
+    """
+    for isotherm in isotherms:
+        if hasattr(isotherm, 'model'):
+            if not is_iast_model(isotherm.model.name):
+                raise ParameterError(
+                    "Model {} cannot be used with IAST.".format(isotherm.model.name))
+
+    n_components = len(isotherms)  # number of components in the mixture
+    if n_components == 1:
+        raise ParameterError("Pass list of pure component isotherms...")
+
+    gas_mole_fractions = numpy.atleast_2d(
+        numpy.asarray(gas_mole_fractions, dtype=float))
+    if gas_mole_fractions.ndim != 2 or gas_mole_fractions.shape[1] != n_components:
+        raise ParameterError("Gas mole fractions should be an array of shape"
+                             " (N, number of isotherms).")
+    n_systems = gas_mole_fractions.shape[0]
+
+    if numpy.any(gas_mole_fractions < 0) or \
+            not numpy.allclose(gas_mole_fractions.sum(axis=1), 1):
+        raise ParameterError(
+            "Gas mole fractions should be positive and add up to unity"
+        )
+
+    total_pressures = numpy.broadcast_to(
+        numpy.asarray(total_pressures, dtype=float), (n_systems,))
+    partial_pressures = gas_mole_fractions * total_pressures[:, None]
+
+    # Starting guess for the adsorbed phase mole fractions
+    if adsorbed_mole_fraction_guess is None:
+        # Default guess: pure-component loadings at these partial pressures.
+        adsorbed_mole_fraction_guess = numpy.column_stack([
+            _batch_evaluate(isotherms[i].loading_at, partial_pressures[:, i])
+            for i in range(n_components)
+        ])
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            adsorbed_mole_fraction_guess = adsorbed_mole_fraction_guess / \
+                adsorbed_mole_fraction_guess.sum(axis=1)[:, None]
+    else:
+        adsorbed_mole_fraction_guess = numpy.broadcast_to(
+            numpy.asarray(adsorbed_mole_fraction_guess, dtype=float),
+            (n_systems, n_components))
+        numpy.testing.assert_almost_equal(
+            numpy.ones(n_systems), adsorbed_mole_fraction_guess.sum(axis=1),
+            decimal=4)
+
+    # Fictitious pressures of each component, in logarithmic form.
+    # If the guess is unusable, the total pressure is a safe start.
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        log_pressure0 = numpy.log(
+            partial_pressures / adsorbed_mole_fraction_guess)
+    bad_guess = ~numpy.isfinite(log_pressure0)
+    log_pressure0[bad_guess] = numpy.log(
+        numpy.broadcast_to(total_pressures[:, None], log_pressure0.shape)[bad_guess])
+
+    converged = numpy.zeros(n_systems, dtype=bool)
+    failed = ~numpy.isfinite(log_pressure0).all(axis=1)
+    active = numpy.flatnonzero(~failed)
+    tiny = numpy.finfo(float).tiny
+
+    for _ in range(max_iterations):
+        if active.size == 0:
+            break
+
+        pressure0 = numpy.exp(log_pressure0[active])
+        spreading = numpy.empty_like(pressure0)
+        loading = numpy.empty_like(pressure0)
+        for i in range(n_components):
+            spreading[:, i] = _batch_evaluate(
+                isotherms[i].spreading_pressure_at, pressure0[:, i])
+            loading[:, i] = _batch_evaluate(
+                isotherms[i].loading_at, pressure0[:, i])
+
+        # Adsorbed mole fractions implied by the current iterate
+        adsorbed_fractions = partial_pressures[active] / pressure0
+
+        # Common spreading pressure which the linearised system satisfies
+        weight = adsorbed_fractions / numpy.maximum(loading, tiny)
+        target = (adsorbed_fractions.sum(axis=1) - 1 +
+                  (weight * spreading).sum(axis=1)) / weight.sum(axis=1)
+
+        step = (target[:, None] - spreading) / numpy.maximum(loading, tiny)
+        step = numpy.clip(step, -1, 1)
+        log_pressure0[active] += step
+
+        # Rows with invalid values cannot be recovered
+        invalid = ~numpy.isfinite(step).all(axis=1)
+        failed[active[invalid]] = True
+
+        done = (numpy.abs(step).max(axis=1) < tolerance) & \
+            (numpy.abs(adsorbed_fractions.sum(axis=1) - 1) < tolerance)
+        converged[active[done & ~invalid]] = True
+        active = active[~done & ~invalid]
+
+    # Solve for the total amount adsorbed
+    pressure0 = numpy.exp(log_pressure0)
+    adsorbed_fractions = partial_pressures / pressure0
+    inverse_loading = numpy.zeros(n_systems)
+    for i in range(n_components):
+        inverse_loading += adsorbed_fractions[:, i] / _batch_evaluate(
+            isotherms[i].loading_at, pressure0[:, i])
+
+    # get loading of each component by multiplying by mole fractions
+    loadings = adsorbed_fractions / inverse_loading[:, None]
+    loadings[~converged] = numpy.nan
+
+    # print warning if had to extrapolate isotherm in spreading pressure
+    if not warningoff:
+        for i in range(n_components):
+            max_pressure = isotherms[i].pressure(branch='ads').max()
+            n_extrapolated = numpy.sum(pressure0[converged, i] > max_pressure)
+            if n_extrapolated:
+                warnings.warn(
+                    """WARNING:
+                      Component %d: p0 > %f, the highest pressure
+                      exhibited in the pure-component isotherm data, in %d
+                      systems. Thus, pyGAPS had to extrapolate the isotherm
+                      data to achieve these IAST results.""" % (
+                          i, max_pressure, n_extrapolated))
+
+    return loadings, converged
+
+
+def _batch_evaluate(function, values):
+    """
+    Evaluate an isotherm function on an array of values.
+
+    The function is called on the whole array if it supports it,
+    otherwise each value is computed separately. Values for which
+    the calculation is not possible are returned as NaN.
+    """
+    try:
+        result = numpy.asarray(function(values), dtype=float)
+        if result.shape == values.shape:
+            return result
+    except (CalculationError, ValueError, TypeError):
+        pass
+
+    result = numpy.full(values.shape, numpy.nan)
+    for index, value in enumerate(values):
+        try:
+            result[index] = numpy.squeeze(function(value))
+        except (CalculationError, ValueError):
+            pass
+    return result
+
+
 def reverse_iast(isotherms, adsorbed_mole_fractions, total_pressure,
                  verbose=False, warningoff=False,
                  gas_mole_fraction_guess=None):
@@ -6,7 +6,6 @@ import numpy
 import scipy
 
 from ..core.adsorbate import Adsorbate
-from ..graphing.calcgraph import initial_enthalpy_plot
 from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
 
@@ -349,6 +348,7 @@ def initial_enthalpy_comp(isotherm, enthalpy_key, branch='ads', verbose=False, *
 
         title = '{0} {1} {2}'.format(
             isotherm.material, isotherm.material_batch, isotherm.adsorbate)
+        from ..graphing.calcgraph import initial_enthalpy_plot
         initial_enthalpy_plot(
             loading, enthalpy, enthalpy_approx(loading), title=title, extras=extras)
 
@@ -397,6 +397,7 @@ def initial_enthalpy_point(isotherm, enthalpy_key, branch='ads', verbose=False):
                                    loading_basis='molar')
         title = '{0} {1} {2}'.format(
             isotherm.material, isotherm.material_batch, isotherm.adsorbate)
+        from ..graphing.calcgraph import initial_enthalpy_plot
         initial_enthalpy_plot(
             loading, enthalpy, [initial_enthalpy for i in loading], title=title)
 
@@ -3,7 +3,6 @@
 import numpy
 
 from ..core.modelisotherm import ModelIsotherm
-from ..graphing.isothermgraphs import plot_iso
 from ..modelling import get_isotherm_model
 from ..utilities.exceptions import ParameterError
 
@@ -115,6 +114,7 @@ def initial_henry_slope(isotherm,
             model=henry,
             **iso_params,
         )
+        from ..graphing.isothermgraphs import plot_iso
         plot_iso([isotherm, model_isotherm], **params)
 
     # return the henry constant
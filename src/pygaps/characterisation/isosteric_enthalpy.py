@@ -4,7 +4,6 @@ import numpy
 import scipy.constants as const
 import scipy.stats as stats
 
-from ..graphing.calcgraph import isosteric_enthalpy_plot
 from ..utilities.exceptions import ParameterError
 
 
@@ -115,6 +114,7 @@ def isosteric_enthalpy(isotherms, loading_points=None, branch='ads', verbose=Fal
     iso_enthalpy, slopes, correlation = isosteric_enthalpy_raw(pressures, temperatures)
 
     if verbose:
+        from ..graphing.calcgraph import isosteric_enthalpy_plot
         isosteric_enthalpy_plot(loading, iso_enthalpy)
 
     return {
@@ -4,15 +4,21 @@ kernel. Please note that calculation of DFT/NLDFT/QSDFT kernels is outside the
 scope of this program.
 """
 
+import collections
+import concurrent.futures
+import hashlib
+import json
 import os
+import stat
+import tempfile
 
 import numpy
 import pandas
 import scipy
+import scipy.interpolate
+import scipy.optimize
 
 from ..core.adsorbate import Adsorbate
-from ..graphing.calcgraph import psd_plot
-from ..graphing.isothermgraphs import plot_iso
 from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
 from ..utilities.math_utilities import bspline
@@ -25,12 +31,36 @@ _KERNELS = {
 
 _LOADED = {}  # We will keep loaded kernels here
 
+_REGULARISATION_CRITERIA = ['gcv', 'lcurve']
+
+#: Directory where kernels read from CSV files are compiled,
+#: separate for each user and only writeable by its owner.
+KERNEL_CACHE = os.path.join(
+    tempfile.gettempdir(),
+    'pygaps-kernels-{0}'.format(os.getuid()) if hasattr(os, 'getuid') else 'pygaps-kernels')
+
+
+def register_kernel(name, path):
+    """
+    Register a kernel, so that it can be used by name.
+
+    Parameters
+    ----------
+    name : str
+        The name of the kernel, to pass to ``psd_dft``.
+    path : str
+        Path to the kernel, either in .csv form
+        or compiled with ``compile_kernel``.
+    """
+    _KERNELS[name] = path
+
 
 def psd_dft(isotherm,
             kernel='DFT-N2-77K-carbon-slit',
             branch='ads',
             bspline_order=2,
             kernel_units=None,
+            regularisation=0,
             verbose=False,
             ):
     """
@@ -42,6 +72,7 @@ def psd_dft(isotherm,
         The isotherm for which the pore size distribution will be calculated.
     kernel : str
         The name of the kernel, or the path where it can be found.
+        Other kernels can be added by name with ``register_kernel``.
     branch : {'ads', 'des'}, optional
         Branch of the isotherm to use. It defaults to adsorption.
     bspline_order : int
@@ -51,6 +82,11 @@ def psd_dft(isotherm,
         A dictionary of kernel basis and units, contains ``loading_basis``,
         ``loading_unit``, ``adsorbent_basis``, ``adsorbent_unit``, ``pressure_mode``
         and "pressure_unit". Defaults to mmol/g in relative pressure.
+    regularisation : float or str, optional
+        Strength of the Tikhonov regularisation of the fit.
+        If set to 0 (default), the fit is not regularised.
+        If set to ``'gcv'`` or ``'lcurve'``, the strength is chosen
+        by that criterion, see ``psd_dft_regularisation_scan``.
     verbose : bool
         Prints out extra information on the calculation and graphs the results.
 
@@ -101,7 +137,9 @@ def psd_dft(isotherm,
 
     The kernel should have sufficient points for a good interpolation as well as
     have a range of pressures that is wide enough to cover possible experimental
-    values.
+    values. CSV kernels are compiled to a binary form the first time they are
+    used, which is then shared between processes. Kernels can also be compiled
+    beforehand with ``compile_kernel``.
 
     *Limitations*
 
@@ -127,45 +165,19 @@ def psd_dft(isotherm,
 
     """
     # Check kernel
-    if kernel is None:
-        raise ParameterError(
-            "An existing kernel name or a path to a user kernel to be used must be specified.")
+    kernel_path = _kernel_path(kernel)
     if not isinstance(isotherm.adsorbate, Adsorbate):
         raise ParameterError("Isotherm adsorbate is not known, cannot calculate PSD.")
 
-    # Get an internal kernel, otherwise assume it is a path
-    if kernel in _KERNELS:
-        kernel_path = _KERNELS[kernel]
-    else:
-        kernel_path = kernel
-
-    # Get units
-    if kernel_units is None:
-        kernel_units = {}
-
-    loading_basis = kernel_units.get('loading_basis', 'molar')
-    loading_unit = kernel_units.get('loading_unit', 'mmol')
-    adsorbent_basis = kernel_units.get('adsorbate_basis', 'mass')
-    adsorbent_unit = kernel_units.get('adsorbate_unit', 'g')
-    pressure_mode = kernel_units.get('pressure_mode', 'relative')
-    pressure_unit = kernel_units.get('pressure_unit', None)
-
     # Read data in
-    loading = isotherm.loading(branch=branch,
-                               loading_basis=loading_basis,
-                               loading_unit=loading_unit,
-                               adsorbent_basis=adsorbent_basis,
-                               adsorbent_unit=adsorbent_unit)
-    pressure = isotherm.pressure(branch=branch,
-                                 pressure_mode=pressure_mode,
-                                 pressure_unit=pressure_unit)
+    units = _kernel_units(kernel_units)
+    pressure, loading = _kernel_data(isotherm, branch, units)
 
     # Call the DFT function
     pore_widths, pore_dist, pore_load_cum = psd_dft_kernel_fit(
-        pressure, loading, kernel_path, bspline_order)  # mmol/g
+        pressure, loading, kernel_path, bspline_order, regularisation)  # mmol/g
 
-    dpore_widths = numpy.ediff1d(pore_widths, to_begin=pore_widths[0])
-    pore_vol_cum = numpy.cumsum(pore_dist * dpore_widths)
+    pore_vol_cum = _cumulative_volume(pore_widths, pore_dist)
 
     if verbose:
         params = {
@@ -174,15 +186,12 @@ def psd_dft(isotherm,
             'fig_title': 'DFT Fit',
             'lgd_keys': ['material'],
             'y1_line_style': dict(markersize=5, linewidth=0),
-            'loading_basis': loading_basis,
-            'loading_unit': loading_unit,
-            'adsorbent_basis': adsorbent_basis,
-            'adsorbent_unit': adsorbent_unit,
-            'pressure_mode': pressure_mode,
-            'pressure_unit': pressure_unit,
         }
+        params.update(units)
+        from ..graphing.isothermgraphs import plot_iso
         ax = plot_iso(isotherm, **params)
         ax.plot(pressure, pore_load_cum, 'r-')
+        from ..graphing.calcgraph import psd_plot
         psd_plot(pore_widths, pore_dist,
                  pore_vol_cum=pore_vol_cum, method='DFT')
 
@@ -193,7 +202,138 @@ def psd_dft(isotherm,
     }
 
 
-def psd_dft_kernel_fit(pressure, loading, kernel_path, bspline_order=2):
+def psd_dft_batch(isotherms,
+                  kernel='DFT-N2-77K-carbon-slit',
+                  branch='ads',
+                  bspline_order=2,
+                  kernel_units=None,
+                  regularisation=0,
+                  pressure_grid=None,
+                  n_jobs=None,
+                  executor=None,
+                  ):
+    r"""
+    Calculate the DFT pore size distribution of many isotherms with the same kernel.
+
+    Isotherms measured at the same pressures are fitted together, reusing
+    the same kernel matrix, so that sets of isotherms recorded on
+    a fixed pressure grid are fitted much faster than one by one.
+
+    Parameters
+    ----------
+    isotherms : iterable of PointIsotherm
+        The isotherms for which the pore size distribution will be calculated.
+    kernel : str
+        The name of the kernel, or the path where it can be found.
+    branch : {'ads', 'des'}, optional
+        Branch of the isotherms to use. It defaults to adsorption.
+    bspline_order : int
+        The smoothing order of the b-splines fit to the data.
+        If set to 0, data will be returned as-is.
+    kernel_units : dict
+        A dictionary of kernel basis and units, as in ``psd_dft``.
+        Defaults to mmol/g in relative pressure.
+    regularisation : float or str, optional
+        Strength of the Tikhonov regularisation of the fit.
+        If set to 0 (default), the fit is not regularised.
+        If set to ``'gcv'`` or ``'lcurve'``, the strength is chosen
+        for each isotherm by that criterion, see ``psd_dft_regularisation_scan``.
+    pressure_grid : array, optional
+        Pressures to resample the loading of all isotherms at, so that
+        they can all be fitted together. The pressures should be within
+        the range of each isotherm. By default, the isotherm points are used.
+    n_jobs : int, optional
+        Number of processes to use to fit isotherms measured at different
+        pressures. If ``None``, the fits are done in the current process.
+    executor : concurrent.futures.Executor, optional
+        An executor to submit the fits to, instead
+        of creating a process pool with ``n_jobs``.
+
+    Returns
+    -------
+    dict
+        A dictionary with the pore widths and the pore distributions, of the form:
+
+            - ``pore_widths`` (array) : the widths of the pores
+            - ``pore_distribution`` (array) : contribution of each pore width to the
+              overall pore distribution, with a row for each isotherm
+            - ``pore_volume_cumulative`` (array) : cumulative pore volume,
+              with a row for each isotherm
+
+    Notes
+    -----
+    The isotherms are grouped by their pressure points. For each group, the kernel
+    is resampled at those pressures and the matrix :math:`K` is factorised as
+    :math:`K = QR`. As :math:`Q` has orthonormal columns, the fit of each
+    isotherm loading :math:`n` can be done on the small triangular system
+
+    .. math::
+
+        \min_{X \geq 0} \lVert R X - Q^T n \rVert^2
+
+    with the projections :math:`Q^T n` of all isotherms in the group calculated
+    together.
+
+    See Also
+    --------
+    pygaps.characterisation.psd_dft.psd_dft : DFT pore size distribution of a single isotherm
+
+    """
+    kernel_path = _kernel_path(kernel)
+    units = _kernel_units(kernel_units)
+    _check_regularisation(regularisation)
+
+    # Read data in, grouped by pressure points
+    groups = collections.OrderedDict()
+    for position, isotherm in enumerate(isotherms):
+        if not isinstance(isotherm.adsorbate, Adsorbate):
+            raise ParameterError("Isotherm adsorbate is not known, cannot calculate PSD.")
+
+        pressure, loading = _kernel_data(isotherm, branch, units)
+        if pressure_grid is not None:
+            loading = _resample(pressure, loading, pressure_grid)
+            pressure = numpy.asarray(pressure_grid, dtype=float)
+
+        pressure = numpy.asarray(pressure, dtype=float)
+        group = groups.setdefault(pressure.tobytes(), (pressure, [], []))
+        group[1].append(position)
+        group[2].append(loading)
+
+    tasks = [(kernel_path, pressure, numpy.asarray(loadings, dtype=float), regularisation)
+             for pressure, _, loadings in groups.values()]
+
+    # Fit each group
+    if n_jobs is None and executor is None:
+        fits = [_kernel_fit_group(*task) for task in tasks]
+    else:
+        pool = executor or concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs)
+        try:
+            fits = [future.result() for future in
+                    [pool.submit(_kernel_fit_group, *task) for task in tasks]]
+        finally:
+            if executor is None:
+                pool.shutdown(wait=True)
+
+    # Put the contributions back in the isotherm order
+    pore_widths = _load_kernel(kernel_path)['pore_widths']
+    contributions = numpy.zeros((sum(len(group[1]) for group in groups.values()), len(pore_widths)))
+    for (_, positions, _), fit in zip(groups.values(), fits):
+        contributions[positions] = fit
+
+    # convert from preponderance to distribution
+    distributions = [_distribution(pore_widths, row, bspline_order) for row in contributions]
+    if distributions:
+        pore_widths = distributions[0][0]
+    pore_dist = numpy.array([dist for _, dist in distributions]).reshape(len(contributions), len(pore_widths))
+
+    return {
+        'pore_widths': pore_widths,
+        'pore_distribution': pore_dist,
+        'pore_volume_cumulative': _cumulative_volume(pore_widths, pore_dist),
+    }
+
+
+def psd_dft_kernel_fit(pressure, loading, kernel_path, bspline_order=2, regularisation=0):
     r"""
     Fit a DFT kernel on experimental adsorption data.
 
@@ -208,6 +348,11 @@ def psd_dft_kernel_fit(pressure, loading, kernel_path, bspline_order=2):
     bspline_order : int
         The smoothing order of the b-splines fit to the data.
         If set to 0, data will be returned as-is.
+    regularisation : float or str, optional
+        Strength of the Tikhonov regularisation of the fit.
+        If set to 0 (default), the fit is not regularised.
+        If set to ``'gcv'`` or ``'lcurve'``, the strength is chosen
+        by that criterion, see ``psd_dft_regularisation_scan``.
 
     Returns
     -------
@@ -221,111 +366,514 @@ def psd_dft_kernel_fit(pressure, loading, kernel_path, bspline_order=2):
     Notes
     -----
     The function will take the data in the form of pressure and loading. It will
-    then load the kernel either from disk or from memory and define a minimsation
-    function as the sum of squared differences of the sum of all individual kernel
-    isotherm loadings multiplied by their contribution as per the following function:
+    then load the kernel either from disk or from memory and resample it at the
+    isotherm pressures as a matrix :math:`K` of kernel loadings, with a row for each
+    pressure and a column for each pore width. The contributions :math:`X_w`
+    of each kernel isotherm are those which minimise the sum of squared differences
+    to the isotherm loading:
 
     .. math::
 
         f(x) = \sum_{p=p_0}^{p=p_x} (n_{p,exp} - \sum_{w=w_0}^{w=w_y} n_{p, kernel} X_w )^2
+               + \lambda^2 \sum_{w=w_0}^{w=w_y} X_w^2
 
-    The function is then minimised using the `scipy.optimise.minimise` module, with the
-    constraint that the contribution of each kernel isotherm cannot be negative.
+    with the constraint that the contribution of each kernel isotherm cannot be
+    negative. This non-negative least squares problem is solved with the
+    active-set algorithm in `scipy.optimize.nnls`. The second term
+    is the Tikhonov regularisation, of strength :math:`\lambda`, which penalises
+    large contributions and smooths the distribution.
 
     """
     # Parameter checks
     if len(pressure) != len(loading):
         raise Exception("The length of the pressure and loading arrays"
                         " do not match")
+    _check_regularisation(regularisation)
+    loading = numpy.asarray(loading, dtype=float)
 
-    # get the interpolation kernel
+    # get the kernel matrix at the isotherm points
     kernel = _load_kernel(kernel_path)
+    kernel_points = _kernel_points(kernel, pressure)
+    pore_widths = kernel['pore_widths']
 
-    # generate the numpy arrays
-    try:
-        kernel_points = numpy.asarray([kernel[size](pressure) for size in kernel])
-    except ValueError:
+    # choose the regularisation strength
+    if isinstance(regularisation, str):
+        u_matrix, singular = _kernel_svd(kernel_points)
+        regularisations = _default_regularisations(singular)
+        scores = _regularisation_scores(u_matrix, singular, loading, regularisations)
+        regularisation = regularisations[_optimal_index(scores, regularisation)]
+
+    # run the optimisation algorithm
+    contributions = _kernel_nnls(kernel_points, loading, regularisation)
+
+    # convert from preponderance to distribution
+    final_loading = numpy.dot(kernel_points, contributions)
+    pore_widths, pore_dist = _distribution(pore_widths, contributions, bspline_order)
+
+    return pore_widths, pore_dist, final_loading
+
+
+def psd_dft_regularisation_scan(pressure, loading, kernel_path,
+                                regularisations=None,
+                                criterion='gcv',
+                                bspline_order=2):
+    r"""
+    Fit a DFT kernel for a range of regularisation strengths and choose the best.
+
+    Parameters
+    ----------
+    loading : array
+        Adsorbed amount in mmol/g.
+    pressure : array
+        Relative pressure.
+    kernel_path : str
+        The location of the kernel to use.
+    regularisations : array, optional
+        The regularisation strengths to score. By default, 61 strengths
+        logarithmically spaced between :math:`10^{-6}` and 1 times the
+        largest singular value of the kernel matrix.
+    criterion : {'gcv', 'lcurve'}
+        The criterion used to choose the regularisation, either the minimum of the
+        generalised cross validation function, or the corner of the L-curve.
+    bspline_order : int
+        The smoothing order of the b-splines fit to the data.
+        If set to 0, data will be returned as-is.
+
+    Returns
+    -------
+    dict
+        A dictionary of the form:
+
+            - ``regularisations`` (array) : the regularisation strengths scored
+            - ``residual_norm`` (array) : norm of the residual of each fit
+            - ``solution_norm`` (array) : norm of the contributions of each fit
+            - ``gcv`` (array) : the generalised cross validation function
+            - ``curvature`` (array) : the curvature of the L-curve
+            - ``regularisation`` (float) : the chosen regularisation strength
+            - ``pore_widths`` (array) : the widths of the pores
+            - ``pore_distribution`` (array) : the distribution (dV/dw) for the chosen strength
+            - ``pore_load_cum`` (array) : cumulative pore loading for the chosen strength
+
+    Notes
+    -----
+    The kernel matrix at the isotherm pressures is decomposed once as
+    :math:`K = U \Sigma V^T`. The regularised fit for a strength :math:`\lambda`
+    then only depends on the filter factors
+    :math:`f_i = \sigma_i^2 / (\sigma_i^2 + \lambda^2)`, so that the
+    norms of the residual and of the contributions, and the generalised cross
+    validation function
+
+    .. math::
+
+        G(\lambda) = \frac{\lVert K X_\lambda - n \rVert^2}{(m - \sum_i f_i)^2}
+
+    are calculated for all strengths at once. The L-curve is the plot of the
+    logarithm of the contributions norm against the logarithm of the
+    residual norm, and its corner is the point of maximum curvature.
+
+    The scores are those of the fit without the non-negativity constraint,
+    which is then only applied once, for the chosen strength.
+
+    """
+    # Parameter checks
+    if len(pressure) != len(loading):
+        raise Exception("The length of the pressure and loading arrays"
+                        " do not match")
+    if criterion not in _REGULARISATION_CRITERIA:
+        raise ParameterError(
+            "Criterion {0} not an option for regularisation. "
+            "Available criteria are {1}".format(criterion, _REGULARISATION_CRITERIA))
+    loading = numpy.asarray(loading, dtype=float)
+
+    # decompose the kernel matrix
+    kernel = _load_kernel(kernel_path)
+    kernel_points = _kernel_points(kernel, pressure)
+    u_matrix, singular = _kernel_svd(kernel_points)
+
+    if regularisations is None:
+        regularisations = _default_regularisations(singular)
+    regularisations = numpy.asarray(regularisations, dtype=float)
+    if numpy.any(regularisations <= 0):
+        raise ParameterError("Regularisation strengths should be positive.")
+
+    # score all strengths then fit the best one
+    scores = _regularisation_scores(u_matrix, singular, loading, regularisations)
+    regularisation = regularisations[_optimal_index(scores, criterion)]
+    contributions = _kernel_nnls(kernel_points, loading, regularisation)
+    pore_widths, pore_dist = _distribution(kernel['pore_widths'], contributions, bspline_order)
+
+    result = {
+        'regularisations': regularisations,
+        'regularisation': regularisation,
+        'pore_widths': pore_widths,
+        'pore_distribution': pore_dist,
+        'pore_load_cum': numpy.dot(kernel_points, contributions),
+    }
+    result.update(scores)
+
+    return result
+
+
+def _kernel_path(kernel):
+    """Get the path of a registered kernel, otherwise assume it is a path."""
+    if kernel is None:
+        raise ParameterError(
+            "An existing kernel name or a path to a user kernel to be used must be specified.")
+    return _KERNELS.get(kernel, kernel)
+
+
+def _kernel_units(kernel_units):
+    """Get the units of the kernel, with the defaults of mmol/g in relative pressure."""
+    if kernel_units is None:
+        kernel_units = {}
+
+    return {
+        'loading_basis': kernel_units.get('loading_basis', 'molar'),
+        'loading_unit': kernel_units.get('loading_unit', 'mmol'),
+        'adsorbent_basis': kernel_units.get('adsorbate_basis', 'mass'),
+        'adsorbent_unit': kernel_units.get('adsorbate_unit', 'g'),
+        'pressure_mode': kernel_units.get('pressure_mode', 'relative'),
+        'pressure_unit': kernel_units.get('pressure_unit', None),
+    }
+
+
+def _kernel_data(isotherm, branch, units):
+    """Read the pressure and loading of an isotherm in the kernel units."""
+    loading = isotherm.loading(branch=branch,
+                               loading_basis=units['loading_basis'],
+                               loading_unit=units['loading_unit'],
+                               adsorbent_basis=units['adsorbent_basis'],
+                               adsorbent_unit=units['adsorbent_unit'])
+    pressure = isotherm.pressure(branch=branch,
+                                 pressure_mode=units['pressure_mode'],
+                                 pressure_unit=units['pressure_unit'])
+    return pressure, loading
+
+
+def _distribution(pore_widths, contributions, bspline_order):
+    """Convert from the kernel contributions to a smoothed distribution."""
+    pore_dist = contributions / numpy.ediff1d(pore_widths, to_begin=pore_widths[0])
+    return bspline(pore_widths, pore_dist, degree=bspline_order)
+
+
+def _cumulative_volume(pore_widths, pore_dist):
+    """Integrate the pore distribution."""
+    dpore_widths = numpy.ediff1d(pore_widths, to_begin=pore_widths[0])
+    return numpy.cumsum(pore_dist * dpore_widths, axis=-1)
+
+
+def _kernel_fit_group(kernel_path, pressure, loadings, regularisation=0):
+    """
+    Fit the kernel on several isotherms measured at the same pressures.
+
+    Defined at module level so that it can be sent to other processes.
+    Returns the contributions, with a row for each isotherm.
+    """
+    kernel = _load_kernel(kernel_path)
+    kernel_points = _kernel_points(kernel, pressure)
+
+    # choose the regularisation strength of each isotherm
+    if isinstance(regularisation, str):
+        u_matrix, singular = _kernel_svd(kernel_points)
+        regularisations = _default_regularisations(singular)
+        strengths = [
+            regularisations[_optimal_index(
+                _regularisation_scores(u_matrix, singular, loading, regularisations),
+                regularisation)]
+            for loading in loadings
+        ]
+    else:
+        strengths = [regularisation] * len(loadings)
+
+    # the residual outside the range of Q does not depend on the contributions
+    q_matrix, r_matrix = numpy.linalg.qr(kernel_points)
+    projected = numpy.dot(loadings, q_matrix)
+
+    return numpy.array([
+        _kernel_nnls(r_matrix, loading, strength)
+        for loading, strength in zip(projected, strengths)
+    ]).reshape(len(loadings), kernel_points.shape[1])
+
+
+def _resample(pressure, loading, pressure_grid):
+    """Interpolate an isotherm loading at other pressures, within its range."""
+    order = numpy.argsort(pressure)
+    pressure = numpy.asarray(pressure)[order]
+    if numpy.min(pressure_grid) < pressure[0] or numpy.max(pressure_grid) > pressure[-1]:
+        raise CalculationError(
+            "The pressure grid is outside the range of the isotherm, "
+            "from {0} to {1}.".format(pressure[0], pressure[-1]))
+    return numpy.interp(pressure_grid, pressure, numpy.asarray(loading)[order])
+
+
+def _kernel_points(kernel, pressure):
+    """Resample the kernel at some pressures, as a pressure x width matrix."""
+    pressure = numpy.asarray(pressure, dtype=float)
+    if numpy.any(pressure < kernel['pressure'][0]) or numpy.any(pressure > kernel['pressure'][-1]):
         raise CalculationError(
             "Could not get kernel values at isotherm points. "
             "Does your kernel pressure range apply to this isotherm?"
         )
-    pore_widths = numpy.asarray(list(kernel.keys()), dtype='float64')
-
-    # define the minimization function
-    def kernel_loading(pore_dist):
-        return numpy.multiply(
-            kernel_points, pore_dist[:, numpy.newaxis]      # -> multiply each loading with its contribution
-        ).sum(axis=0)                                       # -> add the contributions together at each pressure
-
-    def sum_squares(pore_dist):
-        return numpy.square(                                                  # -> square the difference
-            numpy.subtract(                                                   # -> between calculated and isotherm
-                kernel_loading(pore_dist), loading)).sum(axis=0)              # -> then sum the squares together
-
-    # define the constraints (x>0)
-    cons = [{
-        'type': 'ineq',
-        'fun': lambda x: x,
-    }]
-
-    # # run the optimisation algorithm
-    guess = numpy.array([0 for pore in pore_widths])
-    bounds = [(0, None) for pore in pore_widths]
-    result = scipy.optimize.minimize(
-        sum_squares, guess, method='SLSQP',
-        bounds=bounds, constraints=cons, options={'ftol': 1e-04})
-
-    if not result.success:
+    return kernel['interpolator'](pressure)
+
+
+def _check_regularisation(regularisation):
+    """Check the regularisation is a positive strength or a criterion."""
+    if isinstance(regularisation, str):
+        if regularisation not in _REGULARISATION_CRITERIA:
+            raise ParameterError(
+                "Criterion {0} not an option for regularisation. "
+                "Available criteria are {1}".format(regularisation, _REGULARISATION_CRITERIA))
+    elif regularisation < 0:
+        raise ParameterError("The regularisation strength cannot be negative.")
+
+
+def _kernel_svd(kernel_points):
+    """Return the left singular vectors and the singular values of the kernel matrix."""
+    u_matrix, singular, _ = numpy.linalg.svd(kernel_points, full_matrices=False)
+    return u_matrix, singular
+
+
+def _default_regularisations(singular):
+    """Regularisation strengths spanning the singular values of the kernel matrix."""
+    return singular[0] * numpy.logspace(-6, 0, 61)
+
+
+def _regularisation_scores(u_matrix, singular, loading, regularisations):
+    """
+    Score the regularised fits of the loading, without the non-negativity constraint.
+
+    All strengths are scored together from the singular value decomposition.
+    """
+    projected = numpy.dot(loading, u_matrix)
+    outside = max(numpy.dot(loading, loading) - numpy.dot(projected, projected), 0)
+    coefficients = numpy.divide(projected, singular,
+                                out=numpy.zeros_like(projected), where=singular > 0)
+
+    # filter factors, with a row for each strength
+    filters = singular**2 / (singular**2 + regularisations[:, numpy.newaxis]**2)
+
+    residual_norm = numpy.sqrt(numpy.sum(((1 - filters) * projected)**2, axis=1) + outside)
+    solution_norm = numpy.sqrt(numpy.sum((filters * coefficients)**2, axis=1))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        gcv = residual_norm**2 / (len(loading) - filters.sum(axis=1))**2
+
+    return {
+        'residual_norm': residual_norm,
+        'solution_norm': solution_norm,
+        'gcv': gcv,
+        'curvature': _lcurve_curvature(regularisations, residual_norm, solution_norm),
+    }
+
+
+def _lcurve_curvature(regularisations, residual_norm, solution_norm):
+    """Curvature of the log-log L-curve, parametrised by the strength."""
+    tiny = numpy.finfo(float).tiny
+    param = numpy.log(regularisations)
+    x_curve = numpy.log(numpy.maximum(residual_norm, tiny))
+    y_curve = numpy.log(numpy.maximum(solution_norm, tiny))
+
+    dx = numpy.gradient(x_curve, param)
+    dy = numpy.gradient(y_curve, param)
+    ddx = numpy.gradient(dx, param)
+    ddy = numpy.gradient(dy, param)
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return (dx * ddy - ddx * dy) / (dx**2 + dy**2)**1.5
+
+
+def _optimal_index(scores, criterion):
+    """Position of the best regularisation strength for a criterion."""
+    if criterion == 'gcv':
+        values = numpy.where(numpy.isfinite(scores['gcv']), scores['gcv'], numpy.inf)
+        return int(numpy.argmin(values))
+    values = numpy.where(numpy.isfinite(scores['curvature']), scores['curvature'], -numpy.inf)
+    return int(numpy.argmax(values))
+
+
+def _kernel_nnls(kernel_points, loading, regularisation=0):
+    """
+    Find the non-negative kernel contributions which best fit the loading.
+
+    The Tikhonov regularisation is added by extending the problem
+    with a diagonal block, to be solved by the same algorithm.
+    """
+    if regularisation:
+        size = kernel_points.shape[1]
+        kernel_points = numpy.vstack([kernel_points, regularisation * numpy.identity(size)])
+        loading = numpy.concatenate([loading, numpy.zeros(size)])
+
+    try:
+        contributions, _ = scipy.optimize.nnls(kernel_points, loading)
+    except RuntimeError as err:
         raise CalculationError(
-            "Minimization of DFT failed with error: {}".format(result.message)
+            "Minimization of DFT failed with error: {}".format(err)
         )
 
-    # convert from preponderance to distribution
-    final_loading = kernel_loading(result.x)
-    pore_dist = result.x / numpy.ediff1d(pore_widths, to_begin=pore_widths[0])
-    pore_widths, pore_dist = bspline(pore_widths, pore_dist, degree=bspline_order)
+    return contributions
 
-    return pore_widths, pore_dist, final_loading
+
+def compile_kernel(path, output=None, adsorbate=None, temperature=None, pore_geometry=None):
+    """
+    Compile a CSV kernel to a binary form.
+
+    The kernel loadings and the coefficients of their interpolating
+    splines are saved as a .npy file, which is memory-mapped when loaded,
+    so that processes using the same kernel share its memory.
+    The pressures, pore widths and other properties of the kernel
+    are saved in a .json file with the same name.
+
+    Parameters
+    ----------
+    path : str
+        Path to the kernel to compile, in .csv form.
+    output : str, optional
+        Path of the compiled .npy file. Defaults to the path
+        of the CSV kernel with a .npy extension.
+    adsorbate : str, optional
+        The adsorbate the kernel was calculated for.
+    temperature : float, optional
+        The temperature the kernel was calculated at, in K.
+    pore_geometry : str, optional
+        The geometry of the pores in the kernel.
+
+    Returns
+    -------
+    str
+        Path of the compiled kernel.
+    """
+    if output is None:
+        output = os.path.splitext(path)[0] + '.npy'
+
+    metadata, arrays = _parse_kernel(path)
+    metadata.update({
+        'adsorbate': adsorbate,
+        'temperature': temperature,
+        'pore_geometry': pore_geometry,
+    })
+
+    # write to temporary files first, so that other processes
+    # never read a partially written kernel
+    base = os.path.splitext(output)[0]
+    temp = '{0}.{1}.tmp'.format(base, os.getpid())
+    with open(temp + '.json', 'w') as file:
+        json.dump(metadata, file)
+    with open(temp + '.npy', 'wb') as file:
+        numpy.save(file, arrays)
+    os.replace(temp + '.json', base + '.json')
+    os.replace(temp + '.npy', output)
+
+    return output
 
 
 def _load_kernel(path):
     """
     Load a kernel from disk or from memory.
 
-    Essentially takes a kernel stored as a pressure-loading
-    table, creates an interpolator for each
-    isotherm, then stores them as a dictionary of
-    pore-size keys to interpolator values.
+    A compiled kernel is memory-mapped. A kernel in .csv form
+    is first compiled to the kernel cache directory, unless already
+    there, or loaded in memory if the directory cannot be written
+    or could be written by other users.
+    The kernel is held as a dense matrix, with a row for each
+    pressure and a column for each pore width, together with
+    a cubic interpolator of all the columns at once.
 
     Parameters
     ----------
     path : str
-        Path to the kernel to load in .csv form.
+        Path to the kernel to load, in .csv or compiled form.
 
     Returns
     -------
     dict
-        The kernel with its pore size components as keys.
+        The kernel ``pressure``, ``pore_widths``, ``loading`` matrix,
+        its ``interpolator`` and any other stored properties.
     """
     if path in _LOADED:
         return _LOADED[path]
 
+    if os.path.splitext(path)[1] == '.npy':
+        compiled = path
+    else:
+        compiled = _compiled_path(path) if _private_cache() else None
+        if compiled is not None and not os.path.exists(compiled):
+            try:
+                compile_kernel(path, compiled)
+            except OSError:
+                compiled = None
+
+    if compiled is None:
+        kernel = _build_kernel(*_parse_kernel(path))
+    else:
+        kernel = _read_kernel(compiled)
+
+    # Save the kernel in memory
+    _LOADED[path] = kernel
+
+    return kernel
+
+
+def _private_cache():
+    """Create the kernel cache, and check that only the current user can write to it."""
+    try:
+        os.makedirs(KERNEL_CACHE, mode=0o700, exist_ok=True)
+        info = os.lstat(KERNEL_CACHE)
+    except OSError:
+        return False
+
+    if not stat.S_ISDIR(info.st_mode):
+        return False
+    if hasattr(os, 'getuid'):
+        return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    return True
+
+
+def _compiled_path(path):
+    """Path of a CSV kernel in the cache, unique to its location and version."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = '{0}:{1}:{2}'.format(path, stat.st_mtime_ns, stat.st_size)
+    name = '{0}-{1}.npy'.format(
+        os.path.splitext(os.path.basename(path))[0],
+        hashlib.md5(key.encode('utf-8')).hexdigest())
+    return os.path.join(KERNEL_CACHE, name)
+
+
+def _parse_kernel(path):
+    """Read a CSV kernel and fit the interpolating splines."""
     raw_kernel = pandas.read_csv(path, index_col=0)
 
-    # add a 0 in the dataframe for interpolation between lowest values
-    raw_kernel = raw_kernel.append(pandas.DataFrame(
-        [0 for col in raw_kernel.columns], index=raw_kernel.columns, columns=[0]).transpose())
+    # add a 0 in the kernel for interpolation between lowest values
+    pressure = numpy.concatenate([[0], raw_kernel.index.values.astype(float)])
+    loading = numpy.vstack([numpy.zeros(raw_kernel.shape[1]), raw_kernel.values.astype(float)])
+    spline = scipy.interpolate.make_interp_spline(pressure, loading, k=3, axis=0)
+
+    metadata = {
+        'pressure': pressure.tolist(),
+        'pore_widths': raw_kernel.columns.values.astype(float).tolist(),
+        'knots': spline.t.tolist(),
+    }
 
-    kernel = {}
-    for pore_size in raw_kernel:
-        interpolator = scipy.interpolate.interp1d(
-            raw_kernel[pore_size].index,
-            raw_kernel[pore_size].values,
-            kind='cubic')
+    return metadata, numpy.stack([loading, spline.c])
 
-        kernel.update({pore_size: interpolator})
 
-    # Save the kernel in memory
-    _LOADED[path] = kernel
+def _read_kernel(path):
+    """Read a compiled kernel, memory-mapping its arrays."""
+    with open(os.path.splitext(path)[0] + '.json') as file:
+        metadata = json.load(file)
+
+    # copy-on-write mapping, as the spline evaluation needs writeable buffers,
+    # although the pages are never written and stay shared
+    return _build_kernel(metadata, numpy.load(path, mmap_mode='c'))
+
+
+def _build_kernel(metadata, arrays):
+    """Assemble the kernel from its properties and arrays."""
+    kernel = dict(metadata)
+    for key in ['pressure', 'pore_widths', 'knots']:
+        kernel[key] = numpy.asarray(kernel[key], dtype=float)
+    kernel['loading'] = arrays[0]
+    kernel['interpolator'] = scipy.interpolate.BSpline(
+        kernel.pop('knots'), arrays[1], 3, extrapolate=False, axis=0)
 
     return kernel
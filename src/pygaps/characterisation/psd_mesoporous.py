@@ -7,7 +7,7 @@ based on the Kelvin equation and pore condensation/evaporation.
 import numpy
 
 from ..core.adsorbate import Adsorbate
-from ..graphing.calcgraph import psd_plot
+from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
 from .models_kelvin import get_kelvin_model
 from .models_kelvin import get_meniscus_geometry
@@ -107,19 +107,7 @@ def psd_mesoporous(isotherm,
 
     """
     # Function parameter checks
-    if psd_model is None:
-        raise ParameterError("Specify a model to generate the pore size"
-                             " distribution e.g. psd_model=\"BJH\"")
-    if psd_model not in _MESO_PSD_MODELS:
-        raise ParameterError("Model {} not an option for psd.".format(psd_model),
-                             "Available models are {}".format(_MESO_PSD_MODELS))
-    if pore_geometry not in _PORE_GEOMETRIES:
-        raise ParameterError("Geometry {} not an option for pore size"
-                             "distribution.".format(pore_geometry),
-                             "Available geometries are {}".format(_PORE_GEOMETRIES))
-    if branch not in ['ads', 'des']:
-        raise ParameterError("Branch {} not an option for psd.".format(branch),
-                             "Select either 'ads' or 'des'")
+    _check_parameters(psd_model, pore_geometry, branch)
     if not isinstance(isotherm.adsorbate, Adsorbate):
         raise ParameterError("Isotherm adsorbate is not known, cannot calculate PSD.")
 
@@ -174,6 +162,7 @@ def psd_mesoporous(isotherm,
 
     # Plot if verbose
     if verbose:
+        from ..graphing.calcgraph import psd_plot
         psd_plot(pore_widths, pore_dist,
                  pore_vol_cum=pore_vol_cum, method=psd_model, left=1.5)
 
@@ -184,6 +173,140 @@ def psd_mesoporous(isotherm,
     }
 
 
+def psd_mesoporous_batch(isotherms,
+                         pressure_grid=None,
+                         psd_model='pygaps-DH',
+                         pore_geometry='cylinder',
+                         branch='des',
+                         thickness_model='Harkins/Jura',
+                         kelvin_model='Kelvin'):
+    """
+    Calculate the mesopore size distribution of many isotherms at once.
+
+    The isotherms are resampled on a common relative pressure grid,
+    then the distributions of all isotherms are calculated together.
+
+    Parameters
+    ----------
+    isotherms : iterable of PointIsotherm
+        Isotherms for which the pore size distribution will be calculated.
+    pressure_grid : array, optional
+        The relative pressures to resample the isotherms at. They should be
+        within the range of the branch of each isotherm. If not given, all
+        the isotherms should be measured at the same pressures.
+    psd_model : str
+        The pore size distribution model to use.
+    pore_geometry : str
+        The geometry of the adsorbent pores.
+    branch : {'ads', 'des'}, optional
+        Branch of the isotherm to use. It defaults to desorption.
+    thickness_model : str or callable, optional
+        The thickness model to use for PSD, It defaults to Harkins and Jura.
+    kelvin_model : str or callable, optional
+        The Kelvin model to use for PSD, It defaults to the Kelvin equation.
+
+    Returns
+    -------
+    dict
+        A dictionary with the pore widths and the pore distributions, with
+        a row for each isotherm, of the form:
+
+            - ``pore_widths`` (array) : the widths of the pores
+            - ``pore_distribution`` (array) : contribution of each pore width to the
+              overall pore distribution
+            - ``pore_volume_cumulative`` (array) : cumulative pore volume
+
+    Notes
+    -----
+    The calculation is the same as ``psd_mesoporous``, on the resampled isotherms.
+    The pore widths only depend on the pressure grid and on the adsorbate
+    and temperature of each isotherm, so they are the same for all the
+    isotherms of one adsorbate at the same temperature.
+
+    The pressure grid is used from the highest pressure down, as
+    for the desorption branch.
+
+    See Also
+    --------
+    pygaps.characterisation.psd_mesoporous.psd_mesoporous : the distribution of a single isotherm
+
+    """
+    # Function parameter checks
+    _check_parameters(psd_model, pore_geometry, branch)
+    c_length = 2
+    if psd_model == 'pygaps-DH':
+        c_length = _PORE_GEOMETRIES.index(pore_geometry) + 1
+    elif pore_geometry in ('slit', 'sphere'):
+        raise ParameterError(
+            "The {} method is provided for compatibility and only applicable"
+            " to cylindrical pores. Use the pyGAPS-DH method for other options.".format(psd_model)
+        )
+
+    # Read data in and resample on the grid
+    pressures, loadings, conditions = [], [], []
+    for isotherm in isotherms:
+        if not isinstance(isotherm.adsorbate, Adsorbate):
+            raise ParameterError("Isotherm adsorbate is not known, cannot calculate PSD.")
+        loading = isotherm.loading(branch=branch,
+                                   loading_basis='molar',
+                                   loading_unit='mmol')
+        pressure = isotherm.pressure(branch=branch,
+                                     pressure_mode='relative')
+        if loading is None:
+            raise ParameterError("The isotherm does not have the required branch for"
+                                 " this calculation")
+        pressures.append(pressure)
+        loadings.append(loading)
+        conditions.append((isotherm.adsorbate, isotherm.temperature))
+
+    if pressure_grid is None:
+        if any(not numpy.array_equal(pressure, pressures[0]) for pressure in pressures):
+            raise ParameterError("The isotherms are not measured at the same pressures,"
+                                 " pass a pressure grid to resample them.")
+        pressure_grid = pressures[0] if pressures else []
+    pressure_grid = numpy.sort(numpy.asarray(pressure_grid, dtype=float))[::-1]
+
+    loadings = numpy.array([
+        _resample(pressure, loading, pressure_grid)
+        for pressure, loading in zip(pressures, loadings)
+    ]).reshape(len(loadings), len(pressure_grid))
+
+    # Adsorbate properties and Kelvin radii, once for each adsorbate and temperature
+    t_model = get_thickness_model(thickness_model)
+    thickness = t_model(pressure_grid)
+
+    molar_volume = numpy.empty((len(conditions), 1))
+    kelvin_radius = numpy.empty_like(loadings)
+    calculated = {}
+    for position, (adsorbate, temperature) in enumerate(conditions):
+        key = (adsorbate.name, temperature)
+        if key not in calculated:
+            molar_mass = adsorbate.molar_mass()
+            liquid_density = adsorbate.liquid_density(temperature)
+            k_model = get_kelvin_model(
+                kelvin_model,
+                meniscus_geometry=get_meniscus_geometry(branch, pore_geometry),
+                temperature=temperature,
+                liquid_density=liquid_density,
+                adsorbate_molar_mass=molar_mass,
+                adsorbate_surface_tension=adsorbate.surface_tension(temperature))
+            calculated[key] = (molar_mass / liquid_density / 1000, k_model(pressure_grid))
+        molar_volume[position], kelvin_radius[position] = calculated[key]
+
+    # calculated volume adsorbed
+    volume_adsorbed = loadings * molar_volume
+
+    # Calculate the distributions of all isotherms together
+    pore_widths, pore_dist, pore_vol_cum = _psd_recurrence(
+        psd_model, volume_adsorbed, thickness, kelvin_radius, c_length)
+
+    return {
+        'pore_widths': pore_widths,
+        'pore_distribution': pore_dist,
+        'pore_volume_cumulative': pore_vol_cum,
+    }
+
+
 def psd_pygapsdh(volume_adsorbed, relative_pressure, pore_geometry,
                  thickness_model, condensation_model):
     r"""
@@ -296,47 +419,11 @@ def psd_pygapsdh(volume_adsorbed, relative_pressure, pore_geometry,
     elif pore_geometry == 'sphere':
         c_length = 3
 
-    # Calculate the adsorbed volume of liquid and diff
-    d_volume = numpy.negative(numpy.diff(volume_adsorbed))
-
-    # Generate the thickness curve, average and diff
+    # Generate the thickness curve and the Kelvin pore radii
     thickness = thickness_model(relative_pressure)
-    avg_thickness = numpy.add(thickness[:-1], thickness[1:]) / 2
-    d_thickness = numpy.negative(numpy.diff(thickness))
-
-    # Generate the Kelvin pore radii and average
     kelvin_radius = condensation_model(relative_pressure)
 
-    # Critical pore radii as a combination of the adsorbed
-    # layer thickness and kelvin pore radius, with average and diff
-    pore_widths = 2 * numpy.add(thickness, kelvin_radius)
-    avg_pore_widths = numpy.add(pore_widths[:-1], pore_widths[1:]) / 2
-    d_pore_widths = numpy.negative(numpy.diff(pore_widths))
-
-    # Now we can iteratively calculate the pore size distribution
-    sum_area_factor = 0
-    pore_volumes = []
-
-    for i in range(len(avg_pore_widths)):
-
-        # Calculate the ratio of the pore to the evaporated capillary "core"
-        ratio_factor = (avg_pore_widths[i] / (avg_pore_widths[i] - 2 * thickness[i])) ** c_length
-
-        # Calculate the volume desorbed from thinning of all pores previously emptied
-        thickness_factor = - d_thickness[i] * sum_area_factor
-
-        # Equation for pore volume, then add to the array
-        pore_volume = (d_volume[i] + thickness_factor) * ratio_factor
-        pore_volumes.append(pore_volume)
-
-        # Calculate the area of the newly emptied pore then add it to the total pore area
-        pore_area_correction = ((avg_pore_widths[i] - 2 * avg_thickness[i]) / avg_pore_widths[i]) ** (c_length - 1)
-        pore_avg_area = 2 * c_length * pore_volume / avg_pore_widths[i]
-        sum_area_factor += pore_area_correction * pore_avg_area
-
-    pore_dist = pore_volumes / d_pore_widths
-
-    return pore_widths[:0:-1], pore_dist[::-1], numpy.cumsum(pore_volumes[::-1])
+    return _psd_recurrence('pygaps-DH', volume_adsorbed, thickness, kelvin_radius, c_length)
 
 
 def psd_bjh(volume_adsorbed, relative_pressure, pore_geometry,
@@ -430,48 +517,11 @@ def psd_bjh(volume_adsorbed, relative_pressure, pore_geometry,
             " to cylindrical pores. Use the pyGAPS-DH method for other options."
         )
 
-    # Calculate the adsorbed volume of liquid and diff
-    d_volume = numpy.negative(numpy.diff(volume_adsorbed))
-
-    # Generate the thickness curve, average and diff
+    # Generate the thickness curve and the Kelvin pore radii
     thickness = thickness_model(relative_pressure)
-    avg_thickness = numpy.add(thickness[:-1], thickness[1:]) / 2
-    d_thickness = numpy.negative(numpy.diff(thickness))
-
-    # Generate the Kelvin pore radii and average
     kelvin_radius = condensation_model(relative_pressure)
-    avg_k_radius = numpy.add(kelvin_radius[:-1], kelvin_radius[1:]) / 2
 
-    # Critical pore radii as a combination of the adsorbed
-    # layer thickness and kelvin pore radius, with average and diff
-    pore_widths = 2 * numpy.add(thickness, kelvin_radius)
-    avg_pore_widths = 2 * numpy.add(avg_thickness, avg_k_radius)
-    d_pore_widths = numpy.negative(numpy.diff(pore_widths))
-
-    # Now we can iteratively calculate the pore size distribution
-    sum_area_factor = 0
-    pore_volumes = []
-
-    for i in range(len(avg_pore_widths)):
-
-        # Calculate the ratio of the pore to the evaporated capillary "core"
-        ratio_factor = (avg_pore_widths[i] / (2 * (avg_k_radius[i] + d_thickness[i])))**2
-
-        # Calculate the volume desorbed from thinning of all pores previously emptied
-        thickness_factor = - d_thickness[i] * sum_area_factor
-
-        # Equation for pore volume, then add to the array
-        pore_volume = (d_volume[i] + thickness_factor) * ratio_factor
-        pore_volumes.append(pore_volume)
-
-        # Calculate the area of the newly emptied pore then add it to the total pore area
-        pore_area_correction = (avg_pore_widths[i] - 2 * avg_thickness[i]) / avg_pore_widths[i]
-        pore_avg_area = (4 * pore_volume / avg_pore_widths[i])
-        sum_area_factor += pore_area_correction * pore_avg_area
-
-    pore_dist = pore_volumes / d_pore_widths
-
-    return pore_widths[:0:-1], pore_dist[::-1], numpy.cumsum(pore_volumes[::-1])
+    return _psd_recurrence('BJH', volume_adsorbed, thickness, kelvin_radius)
 
 
 def psd_dollimore_heal(volume_adsorbed, relative_pressure, pore_geometry,
@@ -564,48 +614,113 @@ def psd_dollimore_heal(volume_adsorbed, relative_pressure, pore_geometry,
             " to cylindrical pores. Use the pyGAPS-DH method for other options."
         )
 
-    # Calculate the first differential of volume adsorbed
-    d_volume = numpy.negative(numpy.diff(volume_adsorbed))
-
-    # Generate the thickness curve, average and diff
+    # Generate the thickness curve and the Kelvin pore radii
     thickness = thickness_model(relative_pressure)
-    avg_thickness = numpy.add(thickness[:-1], thickness[1:]) / 2
-    d_thickness = numpy.negative(numpy.diff(thickness))
-
-    # Generate the Kelvin pore radii and average
     kelvin_radius = condensation_model(relative_pressure)
-    avg_k_radius = numpy.add(kelvin_radius[:-1], kelvin_radius[1:]) / 2
+
+    return _psd_recurrence('DH', volume_adsorbed, thickness, kelvin_radius)
+
+
+def _check_parameters(psd_model, pore_geometry, branch):
+    """Check the model, geometry and branch of a mesoporous PSD."""
+    if psd_model is None:
+        raise ParameterError("Specify a model to generate the pore size"
+                             " distribution e.g. psd_model=\"BJH\"")
+    if psd_model not in _MESO_PSD_MODELS:
+        raise ParameterError("Model {} not an option for psd.".format(psd_model),
+                             "Available models are {}".format(_MESO_PSD_MODELS))
+    if pore_geometry not in _PORE_GEOMETRIES:
+        raise ParameterError("Geometry {} not an option for pore size"
+                             "distribution.".format(pore_geometry),
+                             "Available geometries are {}".format(_PORE_GEOMETRIES))
+    if branch not in ['ads', 'des']:
+        raise ParameterError("Branch {} not an option for psd.".format(branch),
+                             "Select either 'ads' or 'des'")
+
+
+def _resample(pressure, loading, pressure_grid):
+    """Interpolate an isotherm loading at other pressures, within its range."""
+    order = numpy.argsort(pressure)
+    pressure = numpy.asarray(pressure)[order]
+    if len(pressure_grid) and (pressure_grid.min() < pressure[0] or pressure_grid.max() > pressure[-1]):
+        raise CalculationError(
+            "The pressure grid is outside the range of the isotherm, "
+            "from {0} to {1}.".format(pressure[0], pressure[-1]))
+    return numpy.interp(pressure_grid, pressure, numpy.asarray(loading)[order])
+
+
+def _psd_recurrence(psd_model, volume_adsorbed, thickness, kelvin_radius, c_length=2):
+    """
+    Calculate the pore volumes emptied at each step of a pore size distribution method.
+
+    All arrays hold points along the last axis, from the highest pressure.
+    Any leading axes, such as one for each isotherm, are calculated together,
+    with the thickness and Kelvin radii broadcast against the volume adsorbed.
+
+    Each step depends on the area of the pores emptied in the previous
+    steps, so the points are calculated in sequence, but all the terms
+    which only depend on the thickness and Kelvin radii are
+    calculated beforehand.
+    """
+    volume_adsorbed = numpy.asarray(volume_adsorbed, dtype=float)
+    thickness = numpy.broadcast_to(thickness, volume_adsorbed.shape)
+    kelvin_radius = numpy.broadcast_to(kelvin_radius, volume_adsorbed.shape)
+
+    # Calculate the adsorbed volume of liquid and diff
+    d_volume = numpy.negative(numpy.diff(volume_adsorbed, axis=-1))
+
+    # Thickness average and diff
+    avg_thickness = numpy.add(thickness[..., :-1], thickness[..., 1:]) / 2
+    d_thickness = numpy.negative(numpy.diff(thickness, axis=-1))
 
     # Critical pore radii as a combination of the adsorbed
     # layer thickness and kelvin pore radius, with average and diff
     pore_widths = 2 * numpy.add(thickness, kelvin_radius)
-    avg_pore_widths = 2 * numpy.add(avg_thickness, avg_k_radius)
-    d_pore_widths = numpy.negative(numpy.diff(pore_widths))
+    d_pore_widths = numpy.negative(numpy.diff(pore_widths, axis=-1))
 
-    # Now we can iteratively calculate the pore size distribution
-    sum_area_factor = 0
-    sum_length_factor = 0
-    pore_volumes = []
+    # Factors of each step: the ratio of the pore to the evaporated capillary "core",
+    # and the area and length of the newly emptied pores per unit volume
+    length_factor = numpy.zeros_like(d_volume)
+    if psd_model == 'pygaps-DH':
+        avg_pore_widths = numpy.add(pore_widths[..., :-1], pore_widths[..., 1:]) / 2
+        ratio_factor = (avg_pore_widths / (avg_pore_widths - 2 * thickness[..., :-1])) ** c_length
+        area_factor = ((avg_pore_widths - 2 * avg_thickness) / avg_pore_widths) ** (c_length - 1) * \
+            2 * c_length / avg_pore_widths
+
+    elif psd_model == 'BJH':
+        avg_k_radius = numpy.add(kelvin_radius[..., :-1], kelvin_radius[..., 1:]) / 2
+        avg_pore_widths = 2 * numpy.add(avg_thickness, avg_k_radius)
+        ratio_factor = (avg_pore_widths / (2 * (avg_k_radius + d_thickness)))**2
+        area_factor = (avg_pore_widths - 2 * avg_thickness) / avg_pore_widths * \
+            4 / avg_pore_widths
+
+    elif psd_model == 'DH':
+        avg_k_radius = numpy.add(kelvin_radius[..., :-1], kelvin_radius[..., 1:]) / 2
+        avg_pore_widths = 2 * numpy.add(avg_thickness, avg_k_radius)
+        ratio_factor = (avg_pore_widths / (avg_pore_widths - 2 * thickness[..., :-1]))**2
+        area_factor = 4 / avg_pore_widths
+        length_factor = 8 / avg_pore_widths ** 2
 
-    for i in range(len(d_pore_widths)):
+    # Now we can iteratively calculate the pore size distribution
+    sum_area_factor = numpy.zeros(d_volume.shape[:-1])
+    sum_length_factor = numpy.zeros(d_volume.shape[:-1])
+    pore_volumes = numpy.empty_like(d_volume)
 
-        # Calculate the ratio of the pore to the evaporated capillary "core"
-        ratio_factor = (avg_pore_widths[i] / (avg_pore_widths[i] - 2 * thickness[i]))**2
+    for i in range(d_volume.shape[-1]):
 
         # Calculate the volume desorbed from thinning of all pores previously emptied
-        thickness_factor = - d_thickness[i] * sum_area_factor + \
-            d_thickness[i] * avg_thickness[i] * sum_length_factor
+        thickness_factor = - d_thickness[..., i] * sum_area_factor + \
+            d_thickness[..., i] * avg_thickness[..., i] * sum_length_factor
 
-        # Equation for pore volume, then add to the array
-        pore_volume = (d_volume[i] + thickness_factor) * ratio_factor
-        pore_volumes.append(pore_volume)
+        # Equation for pore volume
+        pore_volume = (d_volume[..., i] + thickness_factor) * ratio_factor[..., i]
+        pore_volumes[..., i] = pore_volume
 
-        # Calculate the two factors in the DH method, for area and length
-        pore_avg_area = (4 * pore_volume / avg_pore_widths[i])
-        pore_avg_length = (8 * pore_volume / avg_pore_widths[i] ** 2)
-        sum_area_factor += pore_avg_area
-        sum_length_factor += pore_avg_length
+        # Add the newly emptied pores to the total pore area and length
+        sum_area_factor = sum_area_factor + area_factor[..., i] * pore_volume
+        sum_length_factor = sum_length_factor + length_factor[..., i] * pore_volume
 
     pore_dist = pore_volumes / d_pore_widths
 
-    return pore_widths[:0:-1], pore_dist[::-1], numpy.cumsum(pore_volumes[::-1])
+    return (pore_widths[..., :0:-1], pore_dist[..., ::-1],
+            numpy.cumsum(pore_volumes[..., ::-1], axis=-1))
@@ -6,16 +6,18 @@ the micropore range (<2 nm).
 
 import numpy
 import scipy.constants as const
-import scipy.optimize as opt
 
 from ..core.adsorbate import Adsorbate
-from ..graphing.calcgraph import psd_plot
 from ..utilities.exceptions import ParameterError
 from .models_hk import get_hk_model
 
 _MICRO_PSD_MODELS = ['HK']
 _PORE_GEOMETRIES = ['slit', 'cylinder', 'sphere']
 
+_HK_TABLES = {}  # We will keep tabulated HK pressures here
+_HK_GRID = numpy.logspace(-4, 3, 2000)  # nm, pore size above the effective diameter
+_HK_NEWTON_STEPS = 3
+
 
 def psd_microporous(isotherm,
                     psd_model='HK',
@@ -116,6 +118,7 @@ def psd_microporous(isotherm,
             adsorbate_model, adsorbent_properties)
 
     if verbose:
+        from ..graphing.calcgraph import psd_plot
         psd_plot(pore_widths, pore_dist,
                  pore_vol_cum=pore_vol_cum, log=False, right=2.5, method=psd_model)
 
@@ -307,6 +310,32 @@ def psd_horvath_kawazoe(loading, pressure, temperature, pore_geometry,
     liquid_density = adsorbate_properties.get('liquid_density')
     adsorbate_molar_mass = adsorbate_properties.get('adsorbate_molar_mass')
 
+    # pore sizes from the tabulated model
+    table = _hk_slit_table(d_gas, d_mat, p_gas, p_mat, m_gas, m_mat,
+                           n_gas, n_mat, temperature)
+    pore_widths = _hk_slit_invert(pressure, table) - d_mat
+
+    # finally calculate pore distribution
+    avg_pore_widths = numpy.add(pore_widths[:-1], pore_widths[1:]) / 2          # nm
+    volume_adsorbed = loading * adsorbate_molar_mass / liquid_density / 1000    # cm3/g
+    pore_dist = numpy.diff(volume_adsorbed) / numpy.diff(pore_widths)
+
+    return avg_pore_widths, pore_dist, volume_adsorbed[1:]
+
+
+def _hk_slit_table(d_gas, d_mat, p_gas, p_mat, m_gas, m_mat,
+                   n_gas, n_mat, temperature):
+    """
+    Tabulate the HK slit pore model on a grid of pore sizes.
+
+    The table only depends on the adsorbate and adsorbent properties
+    and on the temperature, and is kept for all isotherms which
+    share them.
+    """
+    key = (d_gas, d_mat, p_gas, p_mat, m_gas, m_mat, n_gas, n_mat, temperature)
+    if key in _HK_TABLES:
+        return _HK_TABLES[key]
+
     # calculation of constants and terms
     e_m = const.electron_mass
     c_l = const.speed_of_light
@@ -323,27 +352,62 @@ def psd_horvath_kawazoe(loading, pressure, temperature, pore_geometry,
     constant_interaction_term = - ((sigma**4) / (3 * (effective_diameter / 2)**3) -
                                    (sigma**10) / (9 * (effective_diameter / 2)**9))
 
-    def h_k_pressure(l_pore):
-        pressure = numpy.exp(constant_coefficient / (l_pore - effective_diameter) *
-                             ((sigma**4) / (3 * (l_pore - effective_diameter / 2)**3) -
-                              (sigma**10) / (9 * (l_pore - effective_diameter / 2)**9) +
-                              constant_interaction_term))
+    table = {
+        'coefficient': constant_coefficient,
+        'interaction': constant_interaction_term,
+        'diameter': effective_diameter,
+        'sigma': sigma,
+        'l_pore': effective_diameter + _HK_GRID,
+    }
+    table['ln_pressure'] = _hk_slit_pressure(table['l_pore'], table)[0]
+
+    _HK_TABLES[key] = table
+    return table
 
-        return pressure
 
-    p_w = []
+def _hk_slit_pressure(l_pore, table):
+    """
+    Return the logarithm of the HK slit pore pressure
+    and its derivative with respect to the pore size.
+    """
+    coefficient = table['coefficient']
+    diameter = table['diameter']
+    sigma = table['sigma']
 
-    for p_point in pressure:
-        # minimise to find pore length
-        def h_k_minimization(l_pore):
-            return numpy.abs(h_k_pressure(l_pore) - p_point)
-        res = opt.minimize_scalar(h_k_minimization)
-        p_w.append(res.x - d_mat)
+    width = l_pore - diameter
+    r_pore = l_pore - diameter / 2
+    potential = (sigma**4) / (3 * r_pore**3) - (sigma**10) / (9 * r_pore**9) + table['interaction']
+    potential_der = - (sigma**4) / r_pore**4 + (sigma**10) / r_pore**10
 
-    # finally calculate pore distribution
-    pore_widths = numpy.array(p_w)
-    avg_pore_widths = numpy.add(pore_widths[:-1], pore_widths[1:]) / 2          # nm
-    volume_adsorbed = loading * adsorbate_molar_mass / liquid_density / 1000    # cm3/g
-    pore_dist = numpy.diff(volume_adsorbed) / numpy.diff(pore_widths)
+    ln_pressure = coefficient * potential / width
+    ln_pressure_der = coefficient * (potential_der * width - potential) / width**2
 
-    return avg_pore_widths, pore_dist, volume_adsorbed[1:]
+    return ln_pressure, ln_pressure_der
+
+
+def _hk_slit_invert(pressure, table):
+    """
+    Find the HK slit pore size for each pressure.
+
+    As the pressure increases monotonically with the pore size, the
+    tabulated model is inverted by interpolation, then refined with
+    a few Newton steps. Pressures outside the tabulated range are
+    assigned the smallest or largest pore size of the table.
+    """
+    l_table = table['l_pore']
+    ln_table = table['ln_pressure']
+
+    with numpy.errstate(divide='ignore'):
+        ln_pressure = numpy.log(numpy.asarray(pressure, dtype=float))
+    ln_pressure = numpy.clip(ln_pressure, ln_table[0], ln_table[-1])
+
+    # interpolation is done on the logarithm of the size above the diameter
+    diameter = table['diameter']
+    l_pore = diameter + numpy.exp(numpy.interp(ln_pressure, ln_table, numpy.log(l_table - diameter)))
+
+    for _ in range(_HK_NEWTON_STEPS):
+        ln_guess, ln_der = _hk_slit_pressure(l_pore, table)
+        l_pore = numpy.clip(l_pore - (ln_guess - ln_pressure) / ln_der,
+                            l_table[0], l_table[-1])
+
+    return l_pore
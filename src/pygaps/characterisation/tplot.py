@@ -5,7 +5,6 @@ import warnings
 import scipy
 
 from ..core.adsorbate import Adsorbate
-from ..graphing.calcgraph import plot_tp
 from ..utilities.exceptions import ParameterError
 from ..utilities.math_utilities import find_linear_sections
 from .models_thickness import get_thickness_model
@@ -152,6 +151,7 @@ def t_plot(isotherm, thickness_model='Harkins/Jura', limits=None, verbose=False)
                     isotherm.adsorbent_unit,
                 ))
 
+            from ..graphing.calcgraph import plot_tp
             plot_tp(t_curve, loading, results)
 
     return {
@@ -1,8 +1,9 @@
 """Contains the adsorbate class."""
 
+import collections
 import warnings
 
-import CoolProp
+import numpy
 
 import pygaps
 
@@ -11,6 +12,53 @@ from ..utilities.exceptions import ParameterError
 from ..utilities.unit_converter import _PRESSURE_UNITS
 from ..utilities.unit_converter import c_unit
 
+#: Statistics of the property cache of an adsorbate.
+PropertyCacheInfo = collections.namedtuple(
+    'PropertyCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def _update_qt(state, quality, temp):
+    """Update the CoolProp state to a vapour quality and temperature."""
+    import CoolProp
+    state.update(CoolProp.QT_INPUTS, quality, temp)
+
+
+def _saturation_pressure(state, temp):
+    _update_qt(state, 0.0, temp)
+    return state.p()
+
+
+def _surface_tension(state, temp):
+    _update_qt(state, 0.0, temp)
+    return state.surface_tension() * 1000
+
+
+def _liquid_density(state, temp):
+    _update_qt(state, 0.0, temp)
+    return state.rhomass() / 1000
+
+
+def _gas_density(state, temp):
+    _update_qt(state, 1.0, temp)
+    return state.rhomass() / 1000
+
+
+def _enthalpy_liquefaction(state, temp):
+    _update_qt(state, 0.0, temp)
+    h_liq = state.hmolar()
+    _update_qt(state, 1.0, temp)
+    h_vap = state.hmolar()
+    return (h_vap - h_liq) / 1000
+
+
+_PROPERTY_FUNCTIONS = {
+    'saturation_pressure': _saturation_pressure,
+    'surface_tension': _surface_tension,
+    'liquid_density': _liquid_density,
+    'gas_density': _gas_density,
+    'enthalpy_liquefaction': _enthalpy_liquefaction,
+}
+
 
 class Adsorbate():
     """
@@ -81,8 +129,18 @@ class Adsorbate():
 
         adsorbate.backend.p_critical()
 
+    Properties calculated through CoolProp are kept in a
+    least-recently-used cache, keyed by property and temperature,
+    which is emptied when the CoolProp backend is switched.
+    The temperature can also be passed as an array, in which case
+    an array of values is returned. Cache statistics are available
+    through ``cache_info()``.
+
     """
 
+    #: Maximum number of calculated properties kept in the cache.
+    cache_size = 512
+
     def __init__(self, name=None, **properties):
         """Instantiate by passing a dictionary with the parameters."""
         # Adsorbate name
@@ -109,6 +167,11 @@ class Adsorbate():
         self._state = None
         self._backend_mode = None
 
+        # Cache of calculated properties
+        self._cache = collections.OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     def __repr__(self):
         """Print adsorbate standard name."""
         return self.name
@@ -173,9 +236,9 @@ class Adsorbate():
             return adsorbate_name
 
         # See if adsorbate exists in master list
-        for ads in pygaps.ADSORBATE_LIST:
-            if ads == adsorbate_name:
-                return ads
+        ads = pygaps.ADSORBATE_LIST.get(adsorbate_name.lower())
+        if ads is not None:
+            return ads
 
         # Otherwise raise error
         raise ParameterError(
@@ -186,6 +249,9 @@ class Adsorbate():
     @property
     def backend(self):
         """Return the CoolProp state associated with the fluid."""
+        # CoolProp is slow to import, so it is only imported on first use
+        import CoolProp
+
         if not self._backend_mode or self._backend_mode != pygaps.COOLPROP_BACKEND:
             self._backend_mode = pygaps.COOLPROP_BACKEND
             self._state = CoolProp.AbstractState(
@@ -193,6 +259,56 @@ class Adsorbate():
 
         return self._state
 
+    def _calculate(self, prop, temp):
+        """Calculate a property at a temperature (or array), through the cache."""
+        if numpy.ndim(temp) > 0:
+            temp = numpy.asarray(temp, dtype=float)
+            return numpy.reshape(
+                [self._calculate(prop, t) for t in temp.ravel()], temp.shape)
+
+        if self._backend_mode != pygaps.COOLPROP_BACKEND:
+            self._cache.clear()
+
+        key = (prop, float(temp))
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache_hits += 1
+            self._cache.move_to_end(key)
+            return value
+
+        self._cache_misses += 1
+        value = _PROPERTY_FUNCTIONS[prop](self.backend, key[1])
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def cache_info(self):
+        """
+        Return the statistics of the calculated property cache.
+
+        Returns
+        -------
+        PropertyCacheInfo
+            Named tuple of hits, misses, maximum and current size.
+        """
+        return PropertyCacheInfo(
+            self._cache_hits, self._cache_misses, self.cache_size, len(self._cache))
+
+    def cache_clear(self):
+        """Empty the calculated property cache and reset its statistics."""
+        self._cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def __getstate__(self):
+        """Pickle the adsorbate without the CoolProp state, which is created again on use."""
+        state = self.__dict__.copy()
+        state['_state'] = None
+        state['_backend_mode'] = None
+        state['_cache'] = collections.OrderedDict()
+        return state
+
     @property
     def formula(self):
         """Return the adsorbent formula."""
@@ -322,7 +438,7 @@ class Adsorbate():
 
         Parameters
         ----------
-        temp : float
+        temp : float or array
             Temperature at which the pressure is desired in K.
         unit : str
             Unit in which to return the saturation pressure.
@@ -333,7 +449,7 @@ class Adsorbate():
 
         Returns
         -------
-        float
+        float or array
             Pressure in unit requested.
 
         Raises
@@ -347,9 +463,7 @@ class Adsorbate():
         """
         if calculate:
             try:
-                state = self.backend
-                state.update(CoolProp.QT_INPUTS, 0.0, temp)
-                sat_p = state.p()
+                sat_p = self._calculate('saturation_pressure', temp)
 
             except Exception as e_info:
                 warnings.warn(str(e_info))
@@ -377,7 +491,7 @@ class Adsorbate():
 
         Parameters
         ----------
-        temp : float
+        temp : float or array
             Temperature at which the surface_tension is desired in K.
         calculate : bool, optional
             Whether to calculate the property or look it up in the properties
@@ -385,7 +499,7 @@ class Adsorbate():
 
         Returns
         -------
-        float
+        float or array
             Surface tension in mN/m.
 
         Raises
@@ -399,9 +513,7 @@ class Adsorbate():
         """
         if calculate:
             try:
-                state = self.backend
-                state.update(CoolProp.QT_INPUTS, 0.0, temp)
-                surf_t = state.surface_tension() * 1000
+                surf_t = self._calculate('surface_tension', temp)
 
             except Exception as e_info:
                 warnings.warn(str(e_info))
@@ -426,7 +538,7 @@ class Adsorbate():
 
         Parameters
         ----------
-        temp : float
+        temp : float or array
             Temperature at which the liquid density is desired in K.
         calculate : bool, optional.
             Whether to calculate the property or look it up in the properties
@@ -434,7 +546,7 @@ class Adsorbate():
 
         Returns
         -------
-        float
+        float or array
             Liquid density in g/cm3.
 
         Raises
@@ -448,9 +560,7 @@ class Adsorbate():
         """
         if calculate:
             try:
-                state = self.backend
-                state.update(CoolProp.QT_INPUTS, 0.0, temp)
-                liq_d = state.rhomass() / 1000
+                liq_d = self._calculate('liquid_density', temp)
 
             except Exception as e_info:
                 warnings.warn(str(e_info))
@@ -475,7 +585,7 @@ class Adsorbate():
 
         Parameters
         ----------
-        temp : float
+        temp : float or array
             Temperature at which the gas density is desired in K.
         calculate : bool, optional.
             Whether to calculate the property or look it up in the properties
@@ -483,7 +593,7 @@ class Adsorbate():
 
         Returns
         -------
-        float
+        float or array
             Gas density in g/cm3.
 
         Raises
@@ -497,9 +607,7 @@ class Adsorbate():
         """
         if calculate:
             try:
-                state = self.backend
-                state.update(CoolProp.QT_INPUTS, 1.0, temp)
-                gas_d = state.rhomass() / 1000
+                gas_d = self._calculate('gas_density', temp)
 
             except Exception as e_info:
                 warnings.warn(str(e_info))
@@ -524,7 +632,7 @@ class Adsorbate():
 
         Parameters
         ----------
-        temp : float
+        temp : float or array
             Temperature at which the enthalpy of liquefaction is desired, in K.
         calculate : bool, optional
             Whether to calculate the property or look it up in the properties
@@ -532,7 +640,7 @@ class Adsorbate():
 
         Returns
         -------
-        float
+        float or array
             Enthalpy of liquefaction in kJ/mol.
 
         Raises
@@ -546,15 +654,7 @@ class Adsorbate():
         """
         if calculate:
             try:
-                state = self.backend
-
-                state.update(CoolProp.QT_INPUTS, 0.0, temp)
-                h_liq = state.hmolar()
-
-                state.update(CoolProp.QT_INPUTS, 1.0, temp)
-                h_vap = state.hmolar()
-
-                enth_liq = (h_vap - h_liq) / 1000
+                enth_liq = self._calculate('enthalpy_liquefaction', temp)
 
             except Exception as e_info:
                 warnings.warn(str(e_info))
@@ -0,0 +1,184 @@
+"""Contains a compact storage for the points of an isotherm."""
+
+import numpy
+import pandas
+
+
+class ColumnarData():
+    """
+    Compact, columnar storage of isotherm points.
+
+    All columns are held in a single contiguous float64 array,
+    one row per column. The points are ordered by branch, with
+    the adsorption branch first, so that each branch is a slice
+    delimited by a split index instead of a boolean mask.
+    The original order and index of the points is kept,
+    so that the DataFrame can be rebuilt on demand.
+
+    Parameters
+    ----------
+    frame : DataFrame
+        The isotherm data, with a boolean column marking
+        the desorption branch.
+    branch_key : str, optional
+        The name of the branch column.
+
+    """
+
+    __slots__ = ('keys', 'values', 'split', 'order', 'index')
+
+    def __init__(self, frame, branch_key='branch'):
+        """Copy the data from a DataFrame."""
+        keys = tuple(key for key in frame.columns if key != branch_key)
+        index = None
+        if not frame.index.equals(pandas.RangeIndex(len(frame))):
+            index = frame.index.values
+        self._store(keys, frame.loc[:, list(keys)].values.T,
+                    frame[branch_key].values, index)
+
+    @classmethod
+    def from_arrays(cls, keys, values, branch):
+        """
+        Create the storage directly from arrays, without a DataFrame.
+
+        Parameters
+        ----------
+        keys : iterable
+            Names of the columns.
+        values : array
+            Values of the points, one row for each column.
+        branch : array
+            Boolean array marking the desorption points.
+
+        Returns
+        -------
+        ColumnarData
+            The stored points, with a range index.
+        """
+        data = cls.__new__(cls)
+        data._store(tuple(keys), numpy.asarray(values), numpy.asarray(branch), None)
+        return data
+
+    def _store(self, keys, values, branch, index):
+        """Order the values by branch and store them."""
+        branch = branch.astype(bool)
+        order = numpy.argsort(branch, kind='mergesort')
+
+        #: Names of the stored columns.
+        self.keys = keys
+        #: Array of the values, one row for each column.
+        self.values = numpy.ascontiguousarray(values[:, order], dtype=float)
+        #: Number of points in the adsorption branch.
+        self.split = int(len(branch) - numpy.count_nonzero(branch))
+        #: Original position of each point, if the points were reordered.
+        self.order = None if numpy.all(order[1:] > order[:-1]) else order
+        #: Original index labels, if not a range.
+        self.index = index
+
+    def __len__(self):
+        """Return the number of points."""
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self):
+        """Return the memory used by the arrays."""
+        total = self.values.nbytes
+        if self.order is not None:
+            total += self.order.nbytes
+        if self.index is not None:
+            total += self.index.nbytes
+        return total
+
+    def _positions(self, branch):
+        """Return the slice of a branch in the stored order."""
+        if branch == 'ads':
+            return slice(0, self.split)
+        elif branch == 'des':
+            return slice(self.split, None)
+        return slice(None)
+
+    def column(self, key, branch=None):
+        """
+        Return a column as an array.
+
+        Parameters
+        ----------
+        key : str
+            Name of the column.
+        branch : {None, 'ads', 'des'}
+            The branch to return. If ``None``, returns all
+            points in their original order.
+
+        Returns
+        -------
+        array
+            A view of the stored data for a branch, or a copy for
+            all the points if they were reordered.
+        """
+        row = self.values[self.keys.index(key)]
+        if branch is None and self.order is not None:
+            return row[numpy.argsort(self.order)]
+        return row[self._positions(branch)]
+
+    def apply(self, key, function):
+        """
+        Replace a column with a function of its values.
+
+        Parameters
+        ----------
+        key : str
+            Name of the column.
+        function : callable
+            Function of the column array which returns the new values.
+        """
+        row = self.values[self.keys.index(key)]
+        row[:] = function(row)
+
+    def has_branch(self, branch):
+        """Check if there are points in a branch."""
+        if branch == 'ads':
+            return self.split > 0
+        elif branch == 'des':
+            return len(self) > self.split
+        return len(self) > 0
+
+    def frame(self, branch=None, raw=False):
+        """
+        Build a DataFrame of the points.
+
+        Parameters
+        ----------
+        branch : {None, 'ads', 'des'}
+            The branch of the data to return. If ``None``, returns entire
+            dataset.
+        raw : bool
+            Whether to return all the points, with the branch column.
+
+        Returns
+        -------
+        DataFrame
+            The data, in the original order and with the original index.
+        """
+        if raw:
+            branch = None
+
+        stored = numpy.arange(len(self))[self._positions(branch)]
+        positions = stored
+        if self.order is not None:
+            positions = self.order[stored]
+            if branch is None:
+                restore = numpy.argsort(positions)
+                stored = stored[restore]
+                positions = positions[restore]
+
+        if self.index is not None:
+            index = self.index[positions]
+        elif branch is None:
+            index = pandas.RangeIndex(len(self))
+        else:
+            index = positions
+        frame = pandas.DataFrame(dict(zip(self.keys, self.values[:, stored])),
+                                 index=index, columns=list(self.keys))
+        if raw:
+            frame['branch'] = stored >= self.split
+        return frame
@@ -2,12 +2,14 @@
 
 import warnings
 
+import numpy
 import pandas
 
 import pygaps
 
 from ..utilities.exceptions import ParameterError
 from ..utilities.hashgen import isotherm_to_hash
+from ..utilities.unit_converter import ConversionPlan
 from ..utilities.unit_converter import _MATERIAL_MODE
 from ..utilities.unit_converter import _PRESSURE_MODE
 from ..utilities.unit_converter import _PRESSURE_UNITS
@@ -186,15 +188,18 @@ class Isotherm():
         #: Isotherm adsorbate used.
         self.adsorbate = str(properties.pop('adsorbate'))
 
-        if self.adsorbate.lower() not in pygaps.ADSORBATE_NAME_LIST:
-            if not properties.pop('no_warn', False):
+        # Resolved by its name or any of its aliases
+        adsorbate = pygaps.ADSORBATE_LIST.get(self.adsorbate.lower())
+        no_warn = properties.pop('no_warn', False)
+        if adsorbate is None:
+            if not no_warn:
                 warnings.warn(
                     ("Specified adsorbent is not in internal list "
                      "(or name cannot be resolved to an existing one). "
                      "CoolProp backend disabled for this adsorbent.")
                 )
         else:
-            self.adsorbate = pygaps.Adsorbate.find(self.adsorbate)
+            self.adsorbate = adsorbate
 
         # Named properties of the isotherm
 
@@ -292,26 +297,108 @@ class Isotherm():
 
         return parameter_dict
 
+    def _pressure_plan(self, pressure_mode=None, pressure_unit=None):
+        """
+        Return the plan converting the isotherm pressure to a mode and unit.
+
+        If neither is specified, the plan leaves values unchanged.
+        """
+        if not (pressure_mode or pressure_unit):
+            return ConversionPlan()
+
+        return ConversionPlan.pressure(
+            mode_from=self.pressure_mode,
+            mode_to=pressure_mode or self.pressure_mode,
+            unit_from=self.pressure_unit,
+            unit_to=pressure_unit or self.pressure_unit,
+            adsorbate_name=self.adsorbate,
+            temp=self.temperature)
+
+    def _loading_plan(self,
+                      loading_unit=None, loading_basis=None,
+                      adsorbent_unit=None, adsorbent_basis=None):
+        """
+        Return the plan converting the isotherm loading to a unit and basis.
+
+        The adsorbent and loading conversions are combined in a single plan.
+        """
+        plan = ConversionPlan()
+
+        if adsorbent_basis or adsorbent_unit:
+            plan = ConversionPlan.adsorbent(
+                basis_from=self.adsorbent_basis,
+                basis_to=adsorbent_basis or self.adsorbent_basis,
+                unit_from=self.adsorbent_unit,
+                unit_to=adsorbent_unit,
+                material=self.material,
+                material_batch=self.material_batch)
+
+        if loading_basis or loading_unit:
+            plan = plan * ConversionPlan.loading(
+                basis_from=self.loading_basis,
+                basis_to=loading_basis or self.loading_basis,
+                unit_from=self.loading_unit,
+                unit_to=loading_unit,
+                adsorbate_name=self.adsorbate,
+                temp=self.temperature)
+
+        return plan
+
     # Figure out the adsorption and desorption branches
-    def _splitdata(self, _data, pressure_key):
+    @staticmethod
+    def _splitdata(_data, pressure_key):
         """
         Splits isotherm data into an adsorption and desorption part and
         adds a column to mark the transition between the two.
         """
-        # Get a column where all increasing are False and all decreasing are True
-        increasing = _data.loc[:, pressure_key].diff().fillna(0) < 0
-        # Get the first inflexion point (assume where des starts)
-        inflexion = increasing.idxmax()
+        branch = Isotherm._split_branches(_data[pressure_key].values, [len(_data)])
 
-        # If there is an inflexion point
-        if inflexion != _data.index[0]:
-            # If the first point is where the isotherm starts decreasing
-            # Then it is a complete desorption curve
-            if inflexion == _data.index[1]:
-                inflexion = 0
+        # Return the new array with the branch column
+        return pandas.concat(
+            [_data, pandas.Series(branch, index=_data.index, name='branch')], axis=1)
 
-            # Set all instances after the inflexion point to True
-            increasing[inflexion:] = True
+    @staticmethod
+    def _split_branches(pressure, lengths):
+        """
+        Find the desorption points of one or more isotherms at once.
 
-        # Return the new array with the branch column
-        return pandas.concat([_data, increasing.rename('branch')], axis=1)
+        All points from the first decrease in pressure (the inflexion point)
+        are considered part of the desorption branch. If the pressure
+        decreases from the first point, the whole isotherm is a desorption curve.
+
+        Parameters
+        ----------
+        pressure : array
+            The pressure points of all isotherms, concatenated.
+        lengths : array
+            The number of points of each isotherm.
+
+        Returns
+        -------
+        array
+            A boolean array, True for the desorption points.
+        """
+        pressure = numpy.asarray(pressure, dtype=float)
+        lengths = numpy.asarray(lengths, dtype=int)
+        starts = numpy.cumsum(lengths) - lengths
+
+        # Position of each point in its own isotherm
+        position = numpy.arange(len(pressure)) - numpy.repeat(starts, lengths)
+
+        # Points where the pressure decreases, not counting the first of each isotherm
+        decreasing = numpy.zeros(len(pressure), dtype=bool)
+        decreasing[1:] = pressure[1:] < pressure[:-1]
+        decreasing &= position > 0
+
+        # First inflexion point of each isotherm, past the end if there is none
+        inflexion = numpy.full(len(lengths), len(pressure), dtype=int)
+        filled = lengths > 0
+        if numpy.any(filled):
+            inflexion[filled] = numpy.minimum.reduceat(
+                numpy.where(decreasing, position, len(pressure)), starts[filled])
+
+        # If the first point is where the isotherm starts decreasing
+        # Then it is a complete desorption curve
+        inflexion[inflexion == 1] = 0
+
+        return position >= numpy.repeat(inflexion, lengths)
@@ -94,11 +94,7 @@ class Material():
             If it does not exist or cannot be calculated.
         """
         # Checks to see if material exists in master list
-        material = next(
-            (material for material in pygaps.MATERIAL_LIST
-             if material_name == material.name
-             and material_batch == material.batch),
-            None)
+        material = pygaps.MATERIAL_LIST.get((material_name, material_batch))
 
         if material is None:
             raise ParameterError(
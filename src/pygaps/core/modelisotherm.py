@@ -1,12 +1,10 @@
 """Class representing a model of and isotherm."""
 
+import concurrent.futures
 
-import matplotlib.pyplot as plt
 import numpy
 import pandas
 
-from ..graphing.isothermgraphs import plot_iso
-from ..graphing.isothermgraphs import plot_iso_raw
 from ..modelling import _GUESS_MODELS
 from ..modelling import _MODELS
 from ..modelling import get_isotherm_model
@@ -122,29 +120,8 @@ class ModelIsotherm(Isotherm):
                                  " isotherm data. e.g. model=\"Langmuir\"")
 
         if isotherm_data is not None:
-            if None in [pressure_key, loading_key]:
-                raise ParameterError(
-                    "Pass loading_key and pressure_key, the names of the loading and"
-                    " pressure columns in the DataFrame, to the constructor.")
-
-            # If branch column is already set
-            if 'branch' in isotherm_data.columns:
-                data = isotherm_data
-            else:
-                data = self._splitdata(isotherm_data, pressure_key)
-
-            if branch == 'ads':
-                data = data.loc[~data['branch']]
-            elif branch == 'des':
-                data = data.loc[data['branch']]
-
-            if data.empty:
-                raise ParameterError(
-                    "The isotherm branch does not contain enough points")
-
-            # Get just the pressure and loading columns
-            pressure = isotherm_data[pressure_key].values
-            loading = isotherm_data[loading_key].values
+            pressure, loading = self._branch_arrays(
+                isotherm_data, pressure_key, loading_key, branch)
 
             process = True
 
@@ -224,6 +201,7 @@ class ModelIsotherm(Isotherm):
             else:
                 p_c = pressure
                 l_c = self.loading_at(p_c)
+            from ..graphing.isothermgraphs import plot_iso_raw
             ax = plot_iso_raw(
                 p_c, pressure_key,
                 l_c, loading_key,
@@ -233,6 +211,32 @@ class ModelIsotherm(Isotherm):
             ax.plot(pressure, loading, 'ko', **opts)
             ax.legend([self.model.name])
 
+    @classmethod
+    def _branch_arrays(cls, isotherm_data, pressure_key, loading_key, branch):
+        """Extract the pressure and loading of a branch from a DataFrame."""
+        if None in [pressure_key, loading_key]:
+            raise ParameterError(
+                "Pass loading_key and pressure_key, the names of the loading and"
+                " pressure columns in the DataFrame, to the constructor.")
+
+        # If branch column is already set
+        if 'branch' in isotherm_data.columns:
+            data = isotherm_data
+        else:
+            data = cls._splitdata(isotherm_data, pressure_key)
+
+        if branch == 'ads':
+            data = data.loc[~data['branch']]
+        elif branch == 'des':
+            data = data.loc[data['branch']]
+
+        if data.empty:
+            raise ParameterError(
+                "The isotherm branch does not contain enough points")
+
+        # Get just the pressure and loading columns
+        return data[pressure_key].values, data[loading_key].values
+
     @classmethod
     def from_isotherm(cls, isotherm,
                       pressure=None,
@@ -368,6 +372,10 @@ class ModelIsotherm(Isotherm):
               optimization_params=None,
               branch='ads',
               verbose=False,
+              n_jobs=None,
+              executor=None,
+              rmse_threshold=None,
+              return_attempts=False,
 
               **isotherm_parameters):
         """
@@ -375,6 +383,8 @@ class ModelIsotherm(Isotherm):
         then return the one with the best rms fit.
 
         May take a long time depending on the number of datapoints.
+        The models can be fitted in parallel, by passing the number
+        of processes to use as ``n_jobs``, or an existing executor.
 
         Parameters
         ----------
@@ -406,10 +416,28 @@ class ModelIsotherm(Isotherm):
             set to desorption as well.
         verbose : bool, optional
             Prints out extra information about steps taken.
+        n_jobs : int, optional
+            Number of processes to use for fitting the models. If ``None``,
+            the models are fitted one after another.
+        executor : concurrent.futures.Executor, optional
+            An executor to submit the model fits to, instead
+            of creating a process pool with ``n_jobs``.
+        rmse_threshold : float, optional
+            If a model fits with an RMSE below this value, it is
+            returned without waiting for the remaining models. The models
+            are checked in the order given, also when fitted in parallel.
+        return_attempts : bool, optional
+            Whether to also return a DataFrame of all attempts, ranked by RMSE,
+            with the model name, RMSE, the ModelIsotherm or the fitting error.
         isotherm_parameters:
             Any other parameters of the isotherm which should be stored internally.
+
+        Returns
+        -------
+        ModelIsotherm or (ModelIsotherm, DataFrame)
+            The best fitting model isotherm, and the table of attempts
+            if requested.
         """
-        attempts = []
         if models == 'all':
             guess_models = [md.name for md in _GUESS_MODELS]
         else:
@@ -417,37 +445,65 @@ class ModelIsotherm(Isotherm):
             if len(guess_models) != len(models):
                 raise ParameterError('Not all models provided correspond to internal models.')
 
-        for model in guess_models:
+        # Extract the data once, to be shared by all the fits
+        if isotherm_data is not None:
+            pressure, loading = cls._branch_arrays(
+                isotherm_data, pressure_key, loading_key, branch)
+
+        fit_params = dict(
+            pressure_key=pressure_key,
+            loading_key=loading_key,
+            optimization_params=optimization_params,
+            branch=branch,
+            verbose=verbose,
+            plot_fit=False,    # we only want one plot
+            **isotherm_parameters
+        )
+
+        results = []
+        if n_jobs is None and executor is None:
+            for model in guess_models:
+                results.append(_guess_fit(model, pressure, loading, fit_params))
+                if rmse_threshold is not None and results[-1][1] is not None \
+                        and results[-1][1].model.rmse < rmse_threshold:
+                    break
+        else:
+            # plotting is not possible from other processes
+            fit_params['verbose'] = False
+            pool = executor or concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs)
             try:
-                isotherm = ModelIsotherm(pressure=pressure,
-                                         loading=loading,
-                                         isotherm_data=isotherm_data,
-                                         pressure_key=pressure_key,
-                                         loading_key=loading_key,
-                                         model=model,
-                                         param_guess=None,
-                                         optimization_params=optimization_params,
-                                         branch=branch,
-                                         verbose=verbose,
-                                         plot_fit=False,    # we only want one plot
-
-                                         **isotherm_parameters)
-
-                attempts.append(isotherm)
-
-            except CalculationError as e:
-                if verbose:
+                futures = [pool.submit(_guess_fit, model, pressure, loading, fit_params)
+                           for model in guess_models]
+                # results are collected in the order of the models, as when
+                # fitting serially, cancelling the ones not started yet
+                for future in futures:
+                    results.append(future.result())
+                    if rmse_threshold is not None and results[-1][1] is not None \
+                            and results[-1][1].model.rmse < rmse_threshold:
+                        for other in futures:
+                            other.cancel()
+                        break
+            finally:
+                if executor is None:
+                    pool.shutdown(wait=True)
+
+        if verbose:
+            for model, _, error in results:
+                if error is not None:
                     print("Modelling using {0} failed. Fitting routine outputs:".format(model))
-                    print(e)
+                    print(error)
+
+        attempts = sorted([isotherm for _, isotherm, _ in results if isotherm is not None],
+                          key=lambda x: x.model.rmse)
 
         if not attempts:
             raise CalculationError(
                 "No model could be reliably fit on the isotherm")
 
-        errors = [x.model.rmse for x in attempts]
-        best_fit = attempts[errors.index(min(errors))]
+        best_fit = attempts[0]
 
         if verbose:
+            from ..graphing.isothermgraphs import plot_iso
             ax = plot_iso(
                 attempts,
                 color=len(attempts),
@@ -456,13 +512,18 @@ class ModelIsotherm(Isotherm):
                 y1_line_style=dict(markersize=0)
             )
             opts = {'mfc': 'none', 'markersize': 8, 'markeredgewidth': 1.5}
-            if loading is not None:
-                ax.plot(pressure, loading, 'ko', **opts)
-            else:
-                ax.plot(isotherm_data[pressure_key], isotherm_data[loading_key], 'ko', **opts)
+            ax.plot(pressure, loading, 'ko', **opts)
             ax.legend([m.model.name for m in attempts])
             print("Best model fit is {0}".format(best_fit.model.name))
 
+        if return_attempts:
+            table = pandas.DataFrame(
+                [(model, isotherm.model.rmse if isotherm is not None else numpy.nan, isotherm, error)
+                 for model, isotherm, error in results],
+                columns=['model', 'rmse', 'isotherm', 'error'],
+            ).sort_values('rmse', na_position='last').reset_index(drop=True)
+            return best_fit, table
+
         return best_fit
 
 ###########################################################
@@ -525,9 +586,11 @@ class ModelIsotherm(Isotherm):
         )
         plot_dict.update(plot_iso_args)
 
+        from ..graphing.isothermgraphs import plot_iso
         axes = plot_iso(self, **plot_dict)
 
         if show:
+            import matplotlib.pyplot as plt
             plt.show()
             return None
 
@@ -555,6 +618,30 @@ class ModelIsotherm(Isotherm):
             return True
         return False
 
+    def tabulate(self, pressure_range=None, tolerance=1e-6):
+        """
+        Precompute a spline representation of the internal model.
+
+        Afterwards, ``loading_at``, ``pressure_at`` and ``spreading_pressure_at``
+        use the table for values inside its range, which avoids numerical
+        integration and root finding for models which require them.
+        The table is discarded automatically if the model parameters change.
+
+        Parameters
+        ----------
+        pressure_range : [float, float], optional
+            Pressure range to tabulate, in internal isotherm units.
+            If ``None``, it defaults to the range of the model.
+        tolerance : float, optional
+            Maximum error of the tabulated values, relative to the
+            largest value in the table.
+
+        """
+        if pressure_range is None:
+            pressure_range = self.model.pressure_range
+
+        self.model.tabulate(pressure_range, tolerance=tolerance)
+
     def pressure(self, points=40, branch=None,
                  pressure_unit=None, pressure_mode=None,
                  min_range=None, max_range=None, indexed=False):
@@ -602,20 +689,7 @@ class ModelIsotherm(Isotherm):
                                  points)
 
             # Convert if needed
-            if pressure_mode or pressure_unit:
-                if not pressure_mode:
-                    pressure_mode = self.pressure_mode
-                if not pressure_unit:
-                    pressure_unit = self.pressure_unit
-
-                ret = c_pressure(ret,
-                                 mode_from=self.pressure_mode,
-                                 mode_to=pressure_mode,
-                                 unit_from=self.pressure_unit,
-                                 unit_to=pressure_unit,
-                                 adsorbate_name=self.adsorbate,
-                                 temp=self.temperature
-                                 )
+            ret = self._pressure_plan(pressure_mode, pressure_unit)(ret)
         else:
             ret = self.pressure_at(
                 self.loading(points),
@@ -687,31 +761,8 @@ class ModelIsotherm(Isotherm):
                                  self.model.loading_range[1],
                                  points)
 
-            if adsorbent_basis or adsorbent_unit:
-                if not adsorbent_basis:
-                    adsorbent_basis = self.adsorbent_basis
-
-                ret = c_adsorbent(ret,
-                                  basis_from=self.adsorbent_basis,
-                                  basis_to=adsorbent_basis,
-                                  unit_from=self.adsorbent_unit,
-                                  unit_to=adsorbent_unit,
-                                  material=self.material,
-                                  material_batch=self.material_batch
-                                  )
-
-            if loading_basis or loading_unit:
-                if not loading_basis:
-                    loading_basis = self.loading_basis
-
-                ret = c_loading(ret,
-                                basis_from=self.loading_basis,
-                                basis_to=loading_basis,
-                                unit_from=self.loading_unit,
-                                unit_to=loading_unit,
-                                adsorbate_name=self.adsorbate,
-                                temp=self.temperature
-                                )
+            ret = self._loading_plan(
+                loading_unit, loading_basis, adsorbent_unit, adsorbent_basis)(ret)
         else:
             ret = self.loading_at(
                 self.pressure(points),
@@ -808,35 +859,14 @@ class ModelIsotherm(Isotherm):
                                   adsorbate_name=self.adsorbate,
                                   temp=self.temperature)
 
-        # Calculate loading using internal model
-        loading = self.model.loading(pressure)
+        # Calculate loading using internal model, tabulated if available
+        loading = self.model.tabulated('loading', pressure)
+        if loading is None:
+            loading = self.model.loading(pressure)
 
         # Ensure loading is in correct units and basis requested
-        if adsorbent_basis or adsorbent_unit:
-            if not adsorbent_basis:
-                adsorbent_basis = self.adsorbent_basis
-
-            loading = c_adsorbent(loading,
-                                  basis_from=self.adsorbent_basis,
-                                  basis_to=adsorbent_basis,
-                                  unit_from=self.adsorbent_unit,
-                                  unit_to=adsorbent_unit,
-                                  material=self.material,
-                                  material_batch=self.material_batch
-                                  )
-
-        if loading_basis or loading_unit:
-            if not loading_basis:
-                loading_basis = self.loading_basis
-
-            loading = c_loading(loading,
-                                basis_from=self.loading_basis,
-                                basis_to=loading_basis,
-                                unit_from=self.loading_unit,
-                                unit_to=loading_unit,
-                                adsorbate_name=self.adsorbate,
-                                temp=self.temperature
-                                )
+        loading = self._loading_plan(
+            loading_unit, loading_basis, adsorbent_unit, adsorbent_basis)(loading)
 
         return loading
 
@@ -927,23 +957,13 @@ class ModelIsotherm(Isotherm):
                                 temp=self.temperature
                                 )
 
-        # Calculate pressure using internal model
-        pressure = self.model.pressure(loading)
+        # Calculate pressure using internal model, tabulated if available
+        pressure = self.model.tabulated('pressure', loading)
+        if pressure is None:
+            pressure = self.model.pressure(loading)
 
         # Ensure pressure is in correct units and mode requested
-        if pressure_mode or pressure_unit:
-            if not pressure_mode:
-                pressure_mode = self.pressure_mode
-            if not pressure_unit:
-                pressure_unit = self.pressure_unit
-
-            pressure = c_pressure(pressure,
-                                  mode_from=self.pressure_mode,
-                                  mode_to=pressure_mode,
-                                  unit_from=self.pressure_unit,
-                                  unit_to=pressure_unit,
-                                  adsorbate_name=self.adsorbate,
-                                  temp=self.temperature)
+        pressure = self._pressure_plan(pressure_mode, pressure_unit)(pressure)
 
         return pressure
 
@@ -1009,7 +1029,29 @@ class ModelIsotherm(Isotherm):
                                   adsorbate_name=self.adsorbate,
                                   temp=self.temperature)
 
-        # based on model
-        spreading_p = self.model.spreading_pressure(pressure)
+        # based on model, tabulated if available
+        spreading_p = self.model.tabulated('spreading_pressure', pressure)
+        if spreading_p is None:
+            spreading_p = self.model.spreading_pressure(pressure)
 
         return spreading_p
+
+
+def _guess_fit(model, pressure, loading, fit_params):
+    """
+    Fit a single model for ``ModelIsotherm.guess``.
+
+    Defined at module level so that it can be sent to other processes.
+    Returns the model name, the ModelIsotherm and the fitting error,
+    one of which is ``None``.
+    """
+    try:
+        isotherm = ModelIsotherm(pressure=pressure,
+                                 loading=loading,
+                                 model=model,
+                                 param_guess=None,
+                                 **fit_params)
+    except CalculationError as e:
+        return model, None, e
+
+    return model, isotherm, None
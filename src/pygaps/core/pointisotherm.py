@@ -2,18 +2,19 @@
 This module contains the main class that describes an isotherm through discrete points.
 """
 
+import collections
 
-import matplotlib.pyplot as plt
 import numpy
 import pandas
 
-from ..graphing.isothermgraphs import plot_iso
 from ..utilities.exceptions import CalculationError
 from ..utilities.exceptions import ParameterError
 from ..utilities.isotherm_interpolator import isotherm_interpolator
+from ..utilities.unit_converter import ConversionPlan
 from ..utilities.unit_converter import c_adsorbent
 from ..utilities.unit_converter import c_loading
 from ..utilities.unit_converter import c_pressure
+from .columnar_data import ColumnarData
 from .isotherm import Isotherm
 
 
@@ -55,6 +56,12 @@ class PointIsotherm(Isotherm):
         Alternatively, an iterable can be passed which contains
         detailed info for each data point if adsorption points ('False')
         or desorption points ('True'). eg: [False, False, True, True...]
+    storage : {'pandas', 'numpy'}, optional
+        How the points are stored. By default, in a pandas DataFrame.
+        With 'numpy', the points are kept in a compact
+        :class:`~pygaps.core.columnar_data.ColumnarData` of float64 arrays,
+        which uses less memory and is faster to slice by branch.
+        The DataFrame is then built on demand.
     material : str
         Name of the material on which the isotherm is measured.
     material_batch : str
@@ -89,15 +96,26 @@ class PointIsotherm(Isotherm):
     Detection of adsorption/desorption branches will not work if
     data is noisy.
 
+    The arrays returned by :meth:`pressure`, :meth:`loading` and
+    :meth:`other_data` are cached for each branch and set of units,
+    and are read-only. The cache is discarded when the isotherm
+    is converted. Copy the arrays before modifying them.
+
     """
 
+    #: Maximum number of interpolators kept for an isotherm.
+    _max_interpolators = 8
+
     _reserved_params = [
         'raw_data',
-        'l_interpolator',
-        'p_interpolator',
+        '_raw_data',
+        '_points',
+        '_interpolators',
         'loading_key',
         'pressure_key',
         'other_keys',
+        '_spreading_tables',
+        '_columns',
     ]
 
 ##########################################################
@@ -111,12 +129,18 @@ class PointIsotherm(Isotherm):
                  loading_key=None,
                  other_keys=None,
                  branch='guess',
+                 storage='pandas',
                  **isotherm_parameters):
         """
         Instantiation is done by passing the discrete data as a pandas
         DataFrame, the column keys as string  as well as the parameters
         required by parent class.
         """
+        if storage not in ('pandas', 'numpy'):
+            raise ParameterError(
+                "Storage must be either 'pandas' or 'numpy'.")
+        self._points = None
+
         # Checks
         if isotherm_data is not None:
             if None in [pressure_key, loading_key]:
@@ -189,13 +213,54 @@ class PointIsotherm(Isotherm):
             except Exception as e_info:
                 raise ParameterError(e_info)
 
-        #: The internal interpolator for loading given pressure.
-        self.l_interpolator = isotherm_interpolator('loading', None, None,
-                                                    interp_branch=None)
+        # Move the points to columnar arrays
+        if storage == 'numpy':
+            self._points = ColumnarData(self._raw_data)
+            self._raw_data = None
+
+        self._init_caches()
+
+    def _init_caches(self):
+        """Create the empty internal caches."""
+        # Internal interpolators, per branch and configuration.
+        self._interpolators = collections.OrderedDict()
+
+        # Cumulative spreading pressure tables, per branch and units.
+        self._spreading_tables = {}
+
+        # Converted data columns, per column, branch and units.
+        self._columns = {}
+
+    @property
+    def raw_data(self):
+        """Pandas DataFrame that stores the data, with a branch column."""
+        if self._points is not None:
+            return self._points.frame(raw=True)
+        return self._raw_data
+
+    @raw_data.setter
+    def raw_data(self, data):
+        if self._points is not None:
+            self._points = ColumnarData(data)
+        else:
+            self._raw_data = data
+
+    @property
+    def storage(self):
+        """How the points of the isotherm are stored, 'pandas' or 'numpy'."""
+        return 'pandas' if self._points is None else 'numpy'
+
+    def __getstate__(self):
+        """Pickle the isotherm without its internal caches."""
+        state = self.__dict__.copy()
+        for cache in ('_interpolators', '_spreading_tables', '_columns'):
+            state.pop(cache, None)
+        return state
 
-        #: The internal interpolator for pressure given loading.
-        self.p_interpolator = isotherm_interpolator('pressure', None, None,
-                                                    interp_branch=None)
+    def __setstate__(self, state):
+        """Restore a pickled isotherm, with empty caches."""
+        self.__dict__.update(state)
+        self._init_caches()
 
     @classmethod
     def from_isotherm(cls, isotherm,
@@ -238,6 +303,144 @@ class PointIsotherm(Isotherm):
 
         return cls(**iso_params)
 
+    @classmethod
+    def from_arrays_batch(cls, pressure, loading,
+                          other_data=None,
+                          branch='guess',
+                          storage='pandas',
+                          parameters=None,
+                          **isotherm_parameters):
+        """
+        Construct many point isotherms at once from arrays.
+
+        The branches of all isotherms are found in a single vectorized
+        pass over the concatenated data. The isotherm parameters are
+        validated once for each distinct set, and then shared by all the
+        isotherms which use it, instead of once for each isotherm.
+
+        Parameters
+        ----------
+        pressure : array or list of arrays
+            The pressure points of each isotherm. Either a two-dimensional
+            array with one row for each isotherm, or a list of arrays
+            which can have different lengths.
+        loading : array or list of arrays
+            The loading points of each isotherm, with the same shape
+            as the pressure.
+        other_data : dict, optional
+            Other data to be stored, as a dictionary of column names
+            and arrays with the same shape as the pressure.
+        branch : ['guess', ads', 'des', iterable], optional
+            The branch of the isotherms. Either a string, applied to
+            all isotherms, or boolean arrays with the same shape as the
+            pressure, True for the desorption points.
+        storage : {'pandas', 'numpy'}, optional
+            How the points of each isotherm are stored.
+        parameters : list of dict, optional
+            Parameters for each isotherm, which update the shared ones.
+        isotherm_parameters :
+            Parameters shared by all isotherms, as
+            passed to the PointIsotherm constructor.
+
+        Returns
+        -------
+        list[PointIsotherm]
+            The isotherms, in the order of the arrays.
+
+        Notes
+        -----
+        Isotherms created from the same set of parameters share
+        any mutable parameter values (such as lists), as well as the adsorbate.
+        """
+        if storage not in ('pandas', 'numpy'):
+            raise ParameterError(
+                "Storage must be either 'pandas' or 'numpy'.")
+
+        pressure, lengths = _flatten_batch(pressure)
+        loading, loading_lengths = _flatten_batch(loading)
+        if not numpy.array_equal(lengths, loading_lengths):
+            raise ParameterError(
+                "Pressure and loading arrays are not equal!")
+
+        # Columns of all isotherms, concatenated
+        columns = {'pressure': pressure, 'loading': loading}
+        other_keys = []
+        for key, values in (other_data or {}).items():
+            if key in columns or key == 'branch':
+                raise ParameterError(
+                    "Column name '{}' is reserved.".format(key))
+            columns[key], other_lengths = _flatten_batch(values)
+            if not numpy.array_equal(lengths, other_lengths):
+                raise ParameterError(
+                    "Data in column '{}' is not the same size as "
+                    "the pressure.".format(key))
+            other_keys.append(key)
+
+        # Same column order as the constructor
+        if other_keys:
+            keys = sorted(columns)
+        else:
+            keys = list(pandas.DataFrame({'pressure': [], 'loading': []}).columns)
+
+        # Branches of all isotherms
+        if isinstance(branch, str):
+            if branch == 'guess':
+                branches = cls._split_branches(pressure, lengths)
+            elif branch in ('ads', 'des'):
+                branches = numpy.full(len(pressure), branch == 'des')
+            else:
+                raise ParameterError(
+                    "Branch must be 'guess', 'ads', 'des' or an iterable.")
+        else:
+            branches, branch_lengths = _flatten_batch(branch, dtype=bool)
+            if not numpy.array_equal(lengths, branch_lengths):
+                raise ParameterError(
+                    "Branch arrays are not the same size as the pressure.")
+
+        if parameters is None:
+            parameters = [{}] * len(lengths)
+        elif len(parameters) != len(lengths):
+            raise ParameterError(
+                "Pass one dictionary of parameters for each isotherm.")
+
+        bounds = numpy.cumsum(lengths)[:-1]
+        values = numpy.split(numpy.vstack([columns[key] for key in keys]), bounds, axis=1)
+        branches = numpy.split(branches, bounds)
+
+        templates = {}
+        isotherms = []
+
+        for params, iso_values, iso_branch in zip(parameters, values, branches):
+
+            # Validate each distinct set of parameters once
+            params = dict(isotherm_parameters, **params)
+            signature = repr(sorted(params.items(), key=lambda item: item[0]))
+            template = templates.get(signature)
+            if template is None:
+                template = cls.__new__(cls)
+                template._points = None
+                template.pressure_key = 'pressure'
+                template.loading_key = 'loading'
+                template.other_keys = other_keys
+                Isotherm.__init__(template, **params)
+                templates[signature] = template
+
+            isotherm = cls.__new__(cls)
+            isotherm.__dict__.update(template.__dict__)
+            isotherm.other_keys = list(other_keys)
+
+            if storage == 'numpy':
+                isotherm._points = ColumnarData.from_arrays(keys, iso_values, iso_branch)
+            else:
+                data = pandas.DataFrame(dict(zip(keys, iso_values)), columns=keys)
+                data['branch'] = iso_branch
+                isotherm._raw_data = data
+
+            isotherm._init_caches()
+            isotherms.append(isotherm)
+
+        return isotherms
+
     @classmethod
     def from_modelisotherm(cls, modelisotherm, pressure_points=None):
         """
@@ -305,14 +508,13 @@ class PointIsotherm(Isotherm):
             if not mode_to:
                 mode_to = self.pressure_mode
 
-            self.raw_data[self.pressure_key] = c_pressure(
-                self.raw_data[self.pressure_key],
+            self._convert_column(self.pressure_key, ConversionPlan.pressure(
                 mode_from=self.pressure_mode,
                 mode_to=mode_to,
                 unit_from=self.pressure_unit,
                 unit_to=unit_to,
                 adsorbate_name=self.adsorbate,
-                temp=self.temperature)
+                temp=self.temperature))
 
             if unit_to != self.pressure_unit and mode_to == 'absolute':
                 self.pressure_unit = unit_to
@@ -321,14 +523,10 @@ class PointIsotherm(Isotherm):
             if mode_to != self.pressure_mode:
                 self.pressure_mode = mode_to
 
-            # Re-process interpolator
-            interp_branch = self.p_interpolator.interp_branch
-            self.p_interpolator = isotherm_interpolator('pressure',
-                                                        self.loading(
-                                                            branch=interp_branch),
-                                                        self.pressure(
-                                                            branch=interp_branch),
-                                                        interp_branch=interp_branch)
+            # Discard interpolators, cached columns and tables
+            self._interpolators.clear()
+            self._spreading_tables = {}
+            self._columns = {}
 
             if verbose:
                 print("Changed pressure to mode {0}, unit {1}".format(
@@ -359,28 +557,23 @@ class PointIsotherm(Isotherm):
             if not basis_to:
                 basis_to = self.loading_basis
 
-            self.raw_data[self.loading_key] = c_loading(
-                self.raw_data[self.loading_key],
+            self._convert_column(self.loading_key, ConversionPlan.loading(
                 basis_from=self.loading_basis,
                 basis_to=basis_to,
                 unit_from=self.loading_unit,
                 unit_to=unit_to,
                 adsorbate_name=self.adsorbate,
-                temp=self.temperature)
+                temp=self.temperature))
 
             if unit_to != self.loading_unit:
                 self.loading_unit = unit_to
             if basis_to != self.loading_basis:
                 self.loading_basis = basis_to
 
-            # Re-process interpolator
-            interp_branch = self.p_interpolator.interp_branch
-            self.p_interpolator = isotherm_interpolator('pressure',
-                                                        self.loading(
-                                                            branch=interp_branch),
-                                                        self.pressure(
-                                                            branch=interp_branch),
-                                                        interp_branch=interp_branch)
+            # Discard interpolators, cached columns and tables
+            self._interpolators.clear()
+            self._spreading_tables = {}
+            self._columns = {}
 
             if verbose:
                 print("Changed loading to basis {0}, unit {1}".format(
@@ -414,28 +607,23 @@ class PointIsotherm(Isotherm):
             if not basis_to:
                 basis_to = self.adsorbent_basis
 
-            self.raw_data[self.loading_key] = c_adsorbent(
-                self.raw_data[self.loading_key],
+            self._convert_column(self.loading_key, ConversionPlan.adsorbent(
                 basis_from=self.adsorbent_basis,
                 basis_to=basis_to,
                 unit_from=self.adsorbent_unit,
                 unit_to=unit_to,
                 material=self.material,
-                material_batch=self.material_batch)
+                material_batch=self.material_batch))
 
             if unit_to != self.adsorbent_unit:
                 self.adsorbent_unit = unit_to
             if basis_to != self.adsorbent_basis:
                 self.adsorbent_basis = basis_to
 
-            # Re-process interpolator
-            interp_branch = self.p_interpolator.interp_branch
-            self.p_interpolator = isotherm_interpolator('pressure',
-                                                        self.loading(
-                                                            branch=interp_branch),
-                                                        self.pressure(
-                                                            branch=interp_branch),
-                                                        interp_branch=interp_branch)
+            # Discard interpolators, cached columns and tables
+            self._interpolators.clear()
+            self._spreading_tables = {}
+            self._columns = {}
 
             if verbose:
                 print("Changed loading to basis {0}, unit {1}".format(
@@ -498,9 +686,11 @@ class PointIsotherm(Isotherm):
         )
         plot_dict.update(plot_iso_args)
 
+        from ..graphing.isothermgraphs import plot_iso
         axes = plot_iso(self, **plot_dict)
 
         if show:
+            import matplotlib.pyplot as plt
             plt.show()
             return None
 
@@ -527,6 +717,11 @@ class PointIsotherm(Isotherm):
             The pandas DataFrame containing all isotherm data.
 
         """
+        if self._points is not None:
+            if branch not in (None, 'ads', 'des'):
+                return None
+            return self._points.frame(branch=branch, raw=raw)
+
         if raw:
             return self.raw_data
         elif branch is None:
@@ -567,41 +762,30 @@ class PointIsotherm(Isotherm):
         -------
         array or Series
             The pressure slice corresponding to the parameters passed.
+            Unless indexed or limited to a range, the array is cached
+            by the isotherm and read-only: copy it before modifying it.
 
         """
-        ret = self.data(branch=branch).loc[:, self.pressure_key]
+        if indexed:
+            ret = self._converted_pressure(branch, pressure_unit, pressure_mode, indexed)
+        else:
+            key = (self.pressure_key, branch, pressure_unit, pressure_mode)
+            ret = self._columns.get(key)
+            if ret is None:
+                ret = self._cache_column(
+                    key, self._converted_pressure(branch, pressure_unit, pressure_mode))
+
+        return self._select_range(ret, min_range, max_range)
+
+    def _converted_pressure(self, branch, pressure_unit, pressure_mode, indexed=False):
+        """Return the pressure of a branch as an array or Series, converted if needed."""
+        ret = self._column(self.pressure_key, branch, indexed)
 
-        if not ret.empty:
+        if len(ret):
             # Convert if needed
-            if pressure_mode or pressure_unit:
-                if not pressure_mode:
-                    pressure_mode = self.pressure_mode
-                if not pressure_unit:
-                    pressure_unit = self.pressure_unit
-
-                ret = c_pressure(ret,
-                                 mode_from=self.pressure_mode,
-                                 mode_to=pressure_mode,
-                                 unit_from=self.pressure_unit,
-                                 unit_to=pressure_unit,
-                                 adsorbate_name=self.adsorbate,
-                                 temp=self.temperature
-                                 )
-
-            # Select required points
-            if max_range is not None or min_range is not None:
-                if min_range is None:
-                    min_range = min(ret)
-                if max_range is None:
-                    max_range = max(ret)
-
-                ret = ret.loc[lambda x: x >=
-                              min_range].loc[lambda x: x <= max_range]
+            ret = self._pressure_plan(pressure_mode, pressure_unit)(ret)
 
-        if indexed:
-            return ret
-        else:
-            return ret.values
+        return ret
 
     def loading(self, branch=None,
                 loading_unit=None, loading_basis=None,
@@ -639,51 +823,35 @@ class PointIsotherm(Isotherm):
         -------
         Array or Series
             The loading slice corresponding to the parameters passed.
+            Unless indexed or limited to a range, the array is cached
+            by the isotherm and read-only: copy it before modifying it.
 
         """
-        ret = self.data(branch=branch).loc[:, self.loading_key]
+        units = (loading_unit, loading_basis, adsorbent_unit, adsorbent_basis)
 
-        if not ret.empty:
-            # Convert if needed
-            if adsorbent_basis or adsorbent_unit:
-                if not adsorbent_basis:
-                    adsorbent_basis = self.adsorbent_basis
-
-                ret = c_adsorbent(ret,
-                                  basis_from=self.adsorbent_basis,
-                                  basis_to=adsorbent_basis,
-                                  unit_from=self.adsorbent_unit,
-                                  unit_to=adsorbent_unit,
-                                  material=self.material,
-                                  material_batch=self.material_batch
-                                  )
+        if indexed:
+            ret = self._converted_loading(branch, *units, indexed=indexed)
+        else:
+            key = (self.loading_key, branch) + units
+            ret = self._columns.get(key)
+            if ret is None:
+                ret = self._cache_column(key, self._converted_loading(branch, *units))
 
-            if loading_basis or loading_unit:
-                if not loading_basis:
-                    loading_basis = self.loading_basis
+        return self._select_range(ret, min_range, max_range)
 
-                ret = c_loading(ret,
-                                basis_from=self.loading_basis,
-                                basis_to=loading_basis,
-                                unit_from=self.loading_unit,
-                                unit_to=loading_unit,
-                                adsorbate_name=self.adsorbate,
-                                temp=self.temperature
-                                )
+    def _converted_loading(self, branch,
+                           loading_unit, loading_basis,
+                           adsorbent_unit, adsorbent_basis,
+                           indexed=False):
+        """Return the loading of a branch as an array or Series, converted if needed."""
+        ret = self._column(self.loading_key, branch, indexed)
 
-            # Select required points
-            if max_range is not None or min_range is not None:
-                if min_range is None:
-                    min_range = min(ret)
-                if max_range is None:
-                    max_range = max(ret)
-                ret = ret.loc[lambda x: x >=
-                              min_range].loc[lambda x: x <= max_range]
+        if len(ret):
+            # Convert if needed
+            ret = self._loading_plan(
+                loading_unit, loading_basis, adsorbent_unit, adsorbent_basis)(ret)
 
-        if indexed:
-            return ret
-        else:
-            return ret.values
+        return ret
 
     def other_data(self, key, branch=None,
                    min_range=None, max_range=None, indexed=False):
@@ -709,29 +877,64 @@ class PointIsotherm(Isotherm):
         -------
         array or Series
             The data slice corresponding to the parameters passed.
+            Unless indexed or limited to a range, the array is cached
+            by the isotherm and read-only: copy it before modifying it.
 
         """
         if key in self.other_keys:
-            ret = self.data(branch=branch).loc[:, key]
-
-            if not ret.empty:
-                # Select required points
-                if max_range is not None or min_range is not None:
-                    if min_range is None:
-                        min_range = min(ret)
-                    if max_range is None:
-                        max_range = max(ret)
-                    ret = ret.loc[lambda x: x >=
-                                  min_range].loc[lambda x: x <= max_range]
-
             if indexed:
-                return ret
+                ret = self._column(key, branch, indexed)
             else:
-                return ret.values
+                cache_key = (key, branch)
+                ret = self._columns.get(cache_key)
+                if ret is None:
+                    ret = self._cache_column(cache_key, self._column(key, branch))
+
+            return self._select_range(ret, min_range, max_range)
 
         else:
             return None
 
+    def _column(self, key, branch, indexed=False):
+        """Return a column of a branch, as an array or an indexed Series."""
+        if indexed:
+            return self.data(branch=branch).loc[:, key]
+        if self._points is not None:
+            return self._points.column(key, branch)
+
+        column = self._raw_data[key].values
+        if branch == 'ads':
+            return column[~self._raw_data['branch'].values]
+        elif branch == 'des':
+            return column[self._raw_data['branch'].values]
+        return column
+
+    def _convert_column(self, key, function):
+        """Replace the stored values of a column with a function of them."""
+        if self._points is not None:
+            self._points.apply(key, function)
+        else:
+            self._raw_data[key] = function(self._raw_data[key])
+
+    def _cache_column(self, key, values):
+        """Store a read-only copy of a column in the cache and return it."""
+        values = numpy.array(values)
+        values.flags.writeable = False
+        self._columns[key] = values
+        return values
+
+    @staticmethod
+    def _select_range(ret, min_range, max_range):
+        """Select the points of an array or Series within a range."""
+        if len(ret) and (max_range is not None or min_range is not None):
+            if min_range is None:
+                min_range = min(ret)
+            if max_range is None:
+                max_range = max(ret)
+            ret = ret[(ret >= min_range) & (ret <= max_range)]
+
+        return ret
+
     def has_branch(self, branch):
         """
         Check if the isotherm has an specific branch.
@@ -747,6 +950,8 @@ class PointIsotherm(Isotherm):
             Whether the data exists or not.
 
         """
+        if self._points is not None:
+            return self._points.has_branch(branch)
         if self.data(branch=branch).empty:
             return False
         else:
@@ -810,19 +1015,8 @@ class PointIsotherm(Isotherm):
         # Convert to a numpy array just in case
         pressure = numpy.asarray(pressure)
 
-        # Check if interpolator is good
-        if branch != self.l_interpolator.interp_branch or \
-                interpolation_type != self.l_interpolator.interp_kind or \
-                interp_fill != self.l_interpolator.interp_fill:
-
-            self.l_interpolator = isotherm_interpolator('loading',
-                                                        self.pressure(
-                                                            branch=branch),
-                                                        self.loading(
-                                                            branch=branch),
-                                                        interp_branch=branch,
-                                                        interp_kind=interpolation_type,
-                                                        interp_fill=interp_fill)
+        # Get the interpolator for this configuration
+        interpolator = self._interpolator('loading', branch, interpolation_type, interp_fill)
 
         # Ensure pressure is in correct units and mode for the internal model
         if pressure_mode or pressure_unit:
@@ -841,34 +1035,11 @@ class PointIsotherm(Isotherm):
                                   temp=self.temperature)
 
         # Interpolate using the internal interpolator
-        loading = self.l_interpolator(pressure)
+        loading = interpolator(pressure)
 
         # Ensure loading is in correct units and basis requested
-        if adsorbent_basis or adsorbent_unit:
-            if not adsorbent_basis:
-                adsorbent_basis = self.adsorbent_basis
-
-            loading = c_adsorbent(loading,
-                                  basis_from=self.adsorbent_basis,
-                                  basis_to=adsorbent_basis,
-                                  unit_from=self.adsorbent_unit,
-                                  unit_to=adsorbent_unit,
-                                  material=self.material,
-                                  material_batch=self.material_batch
-                                  )
-
-        if loading_basis or loading_unit:
-            if not loading_basis:
-                loading_basis = self.loading_basis
-
-            loading = c_loading(loading,
-                                basis_from=self.loading_basis,
-                                basis_to=loading_basis,
-                                unit_from=self.loading_unit,
-                                unit_to=loading_unit,
-                                adsorbate_name=self.adsorbate,
-                                temp=self.temperature
-                                )
+        loading = self._loading_plan(
+            loading_unit, loading_basis, adsorbent_unit, adsorbent_basis)(loading)
 
         return loading
 
@@ -927,19 +1098,8 @@ class PointIsotherm(Isotherm):
         # Convert to numpy array just in case
         loading = numpy.asarray(loading)
 
-        # Check if interpolator branch is good
-        if branch != self.p_interpolator.interp_branch or \
-                interpolation_type != self.p_interpolator.interp_kind or \
-                interp_fill != self.p_interpolator.interp_fill:
-
-            self.p_interpolator = isotherm_interpolator('pressure',
-                                                        self.loading(
-                                                            branch=branch),
-                                                        self.pressure(
-                                                            branch=branch),
-                                                        interp_branch=branch,
-                                                        interp_kind=interpolation_type,
-                                                        interp_fill=interp_fill)
+        # Get the interpolator for this configuration
+        interpolator = self._interpolator('pressure', branch, interpolation_type, interp_fill)
 
         # Ensure loading is in correct units and basis for the internal model
         if adsorbent_basis or adsorbent_unit:
@@ -975,25 +1135,45 @@ class PointIsotherm(Isotherm):
                                 )
 
         # Interpolate using the internal interpolator
-        pressure = self.p_interpolator(loading)
+        pressure = interpolator(loading)
 
         # Ensure pressure is in correct units and mode requested
-        if pressure_mode or pressure_unit:
-            if not pressure_mode:
-                pressure_mode = self.pressure_mode
-            if not pressure_unit:
-                pressure_unit = self.pressure_unit
-
-            pressure = c_pressure(pressure,
-                                  mode_from=self.pressure_mode,
-                                  mode_to=pressure_mode,
-                                  unit_from=self.pressure_unit,
-                                  unit_to=pressure_unit,
-                                  adsorbate_name=self.adsorbate,
-                                  temp=self.temperature)
+        pressure = self._pressure_plan(pressure_mode, pressure_unit)(pressure)
 
         return pressure
 
+    def _interpolator(self, output, branch, interpolation_type, interp_fill):
+        """
+        Return the interpolator of loading or pressure for a configuration.
+
+        A few of the last used interpolators are kept, so that
+        alternating between branches or kinds does not rebuild them.
+        """
+        if interp_fill is None or isinstance(interp_fill, str):
+            fill_key = interp_fill
+        else:
+            fill_key = tuple(numpy.ravel(interp_fill).tolist())
+        key = (output, branch, interpolation_type, fill_key)
+
+        interpolator = self._interpolators.pop(key, None)
+        if interpolator is None:
+            pressure = self.pressure(branch=branch)
+            loading = self.loading(branch=branch)
+            if output == 'loading':
+                known_data, interp_data = pressure, loading
+            else:
+                known_data, interp_data = loading, pressure
+            interpolator = isotherm_interpolator(output, known_data, interp_data,
+                                                 interp_branch=branch,
+                                                 interp_kind=interpolation_type,
+                                                 interp_fill=interp_fill)
+
+        self._interpolators[key] = interpolator
+        if len(self._interpolators) > self._max_interpolators:
+            self._interpolators.popitem(last=False)
+
+        return interpolator
+
     def spreading_pressure_at(self, pressure,
                               branch='ads',
 
@@ -1017,11 +1197,15 @@ class PointIsotherm(Isotherm):
         In this integral, the isotherm :math:`q(\hat{p})` is represented by a
         linear interpolation of the data.
 
+        The integral up to each data point is tabulated the first time it is
+        needed, so that each evaluation only requires a binary search and the
+        area of the last segment.
+
         For in-detail explanations, check reference [#]_.
 
         Parameters
         ----------
-        pressure : float
+        pressure : float or array
             Pressure (in corresponding units as data in instantiation).
         branch : {'ads', 'des'}
             The branch of the use for calculation. Defaults to adsorption.
@@ -1044,7 +1228,7 @@ class PointIsotherm(Isotherm):
 
         Returns
         -------
-        float
+        float or array
             Spreading pressure, :math:`\Pi`.
 
         References
@@ -1053,18 +1237,22 @@ class PointIsotherm(Isotherm):
            Theory (IAST) Python Package. Computer Physics Communications.
 
         """
-        # Get all data points
-        pressures = self.pressure(branch=branch,
-                                  pressure_unit=pressure_unit,
-                                  pressure_mode=pressure_mode)
-        loadings = self.loading(branch=branch,
-                                loading_unit=loading_unit,
-                                loading_basis=loading_basis,
-                                adsorbent_unit=adsorbent_unit,
-                                adsorbent_basis=adsorbent_basis)
+        units = dict(pressure_unit=pressure_unit,
+                     pressure_mode=pressure_mode,
+                     loading_unit=loading_unit,
+                     loading_basis=loading_basis,
+                     adsorbent_unit=adsorbent_unit,
+                     adsorbent_basis=adsorbent_basis)
+
+        # Get the tabulated integral over the data points
+        pressures, loadings, areas = self._spreading_pressure_table(branch, **units)
+
+        pressure = numpy.asarray(pressure, dtype=float)
+        pressure_arr = numpy.atleast_1d(pressure)
 
         # throw exception if interpolating outside the range.
-        if (self.l_interpolator.interp_fill is None) & (pressure > pressures.max() or pressure < pressures.min()):
+        if interp_fill is None and \
+                (numpy.any(pressure_arr > pressures[-1]) or numpy.any(pressure_arr < pressures[0])):
             raise CalculationError(
                 """
             To compute the spreading pressure at this bulk
@@ -1084,51 +1272,241 @@ class PointIsotherm(Isotherm):
                 a plateau at the highest pressures.
             Option 3: Go back to the lab or computer to collect isotherm data
                 at higher pressures. (Extrapolation can be dangerous!)
-                """.format(pressures.max())
+                """.format(pressures[-1])
             )
 
-        # approximate loading up to first pressure point with Henry's law
-        # loading = henry_const * P
+        # get how many of the points are less than pressure P
+        n_points = numpy.searchsorted(pressures, pressure_arr, side='left')
+        previous = numpy.maximum(n_points - 1, 0)
+
+        # loading at P, from the data or from the fill outside it
+        loading = numpy.interp(pressure_arr, pressures, loadings)
+        outside = n_points == len(pressures)
+        if numpy.any(outside):
+            loading[outside] = self.loading_at(pressure_arr[outside],
+                                               branch=branch,
+                                               interp_fill=interp_fill,
+                                               **units)
+
+        # area of last segment, between P_k < P and P
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            slope = (loading - loadings[previous]) / (pressure_arr - pressures[previous])
+            intercept = loadings[previous] - slope * pressures[previous]
+            last_area = slope * (pressure_arr - pressures[previous]) + \
+                intercept * numpy.log(pressure_arr / pressures[previous])
+
+        # if this pressure is between 0 and first pressure point...
+        # \int_0^P henry_const P /P dP = henry_const * P ...
         # henry_const is the initial slope in the adsorption isotherm
         henry_const = loadings[0] / pressures[0]
 
-        # get how many of the points are less than pressure P
-        n_points = numpy.sum(pressures < pressure)
-
-        if n_points == 0:
-            # if this pressure is between 0 and first pressure point...
-            # \int_0^P henry_const P /P dP = henry_const * P ...
-            return henry_const * pressure
-
-        # P > first pressure point
-        area = loadings[0]  # area of first segment \int_0^P_1 n(P)/P dP
-
-        # get area between P_1 and P_k, where P_k < P < P_{k+1}
-        for i in range(n_points - 1):
-            # linear interpolation of isotherm data
-            slope = (loadings[i + 1] - loadings[i]) / (pressures[i + 1] -
-                                                       pressures[i])
-            intercept = loadings[i] - slope * pressures[i]
-            # add area of this segment
-            area += slope * (pressures[i + 1] - pressures[i]) + intercept * \
-                numpy.log(pressures[i + 1] / pressures[i])
-
-        # finally, area of last segment
-        slope = (
-            self.loading_at(pressure,
-                            branch=branch,
-                            pressure_unit=pressure_unit,
-                            pressure_mode=pressure_mode,
-
-                            loading_unit=loading_unit,
-                            loading_basis=loading_basis,
-                            adsorbent_unit=adsorbent_unit,
-                            adsorbent_basis=adsorbent_basis,
-                            interp_fill=interp_fill) - loadings[n_points - 1]) / (
-            pressure - pressures[n_points - 1])
-        intercept = loadings[n_points - 1] - \
-            slope * pressures[n_points - 1]
-        area += slope * (pressure - pressures[n_points - 1]) + intercept * \
-            numpy.log(pressure / pressures[n_points - 1])
+        area = numpy.where(n_points == 0,
+                           henry_const * pressure_arr,
+                           areas[previous] + last_area)
 
+        if pressure.ndim == 0:
+            return area[0]
         return area
+
+    def pressure_at_spreading_pressure(self, spreading_pressure,
+                                       branch='ads',
+
+                                       pressure_unit=None,
+                                       pressure_mode=None,
+                                       loading_unit=None,
+                                       loading_basis=None,
+                                       adsorbent_unit=None,
+                                       adsorbent_basis=None,
+                                       interp_fill=None):
+        r"""
+        Calculate the bulk adsorbate pressure P at a reduced spreading pressure.
+
+        This is the inverse of :meth:`spreading_pressure_at`. Since the
+        isotherm is represented by a linear interpolation of the data,
+        the spreading pressure is a monotonic, piecewise function of
+        pressure. The segment containing the requested value is found
+        by a binary search of the tabulated integral, then inverted:
+
+            - between zero and the first point, Henry's law gives
+              :math:`p = \Pi p_1 / n_1` directly
+            - on a data segment, the equation
+              :math:`s (p - p_k) + c \ln(p/p_k) = \Pi - \Pi_k`
+              is solved with a few Newton iterations, bracketed
+              by the segment ends
+            - beyond the last point, the ``interp_fill`` is used and the
+              value is found by bisection.
+
+        Parameters
+        ----------
+        spreading_pressure : float or array
+            Reduced spreading pressure, :math:`\Pi`.
+        branch : {'ads', 'des'}
+            The branch of the use for calculation. Defaults to adsorption.
+        pressure_unit : str
+            Unit the pressure is returned in. If ``None``, it defaults to
+            internal isotherm units.
+        pressure_mode : str
+            The mode the pressure is returned in. If ``None``, it defaults to
+            internal isotherm mode.
+        loading_unit : str
+            Unit the loading is specified in. If ``None``, it defaults to
+            internal isotherm units.
+        loading_basis : {None, 'mass', 'volume'}
+            The basis the loading is specified in. If ``None``,
+            assumes the basis the isotherm is currently in.
+        adsorbent_unit : str, optional
+            Unit in which the adsorbent is passed in. If ``None``
+            it defaults to which loading unit the isotherm is currently in
+        adsorbent_basis : str
+            The basis the loading is passed in. If ``None``, it defaults to
+            internal isotherm basis.
+        interp_fill : array-like or (array-like, array_like) or “extrapolate”, optional
+            Parameter to determine what to do outside data bounds.
+            Passed to the scipy.interpolate.interp1d function as ``fill_value``.
+            If blank, interpolation will not predict outside the bounds of data.
+
+        Returns
+        -------
+        float or array
+            Pressure at which the spreading pressure is reached.
+
+        """
+        units = dict(pressure_unit=pressure_unit,
+                     pressure_mode=pressure_mode,
+                     loading_unit=loading_unit,
+                     loading_basis=loading_basis,
+                     adsorbent_unit=adsorbent_unit,
+                     adsorbent_basis=adsorbent_basis)
+
+        # Get the tabulated integral over the data points
+        pressures, loadings, areas = self._spreading_pressure_table(branch, **units)
+
+        spreading_pressure = numpy.asarray(spreading_pressure, dtype=float)
+        target = numpy.atleast_1d(spreading_pressure)
+
+        if interp_fill is None and \
+                (numpy.any(target > areas[-1]) or numpy.any(target < areas[0])):
+            raise CalculationError(
+                "The spreading pressure requested is outside the range of the isotherm"
+                " data ({0} - {1}). Pass an `interp_fill` to extrapolate the isotherm"
+                " beyond the data.".format(areas[0], areas[-1]))
+
+        pressure = numpy.full(target.shape, numpy.nan)
+
+        # Henry's law region
+        henry = target <= areas[0]
+        pressure[henry] = target[henry] * pressures[0] / loadings[0]
+
+        # Data segments
+        inside = ~henry & (target <= areas[-1])
+        if numpy.any(inside):
+            seg = numpy.searchsorted(areas, target[inside], side='left') - 1
+            p_start = pressures[seg]
+            p_end = pressures[seg + 1]
+            slope = (loadings[seg + 1] - loadings[seg]) / (p_end - p_start)
+            intercept = loadings[seg] - slope * p_start
+            remainder = target[inside] - areas[seg]
+
+            # start from a linear guess inside the segment
+            low, high = p_start, p_end
+            guess = p_start + (p_end - p_start) * remainder / (areas[seg + 1] - areas[seg])
+            for _ in range(50):
+                with numpy.errstate(divide='ignore', invalid='ignore'):
+                    residual = slope * (guess - p_start) + \
+                        intercept * numpy.log(guess / p_start) - remainder
+                    step = residual * guess / (slope * guess + intercept)
+                low = numpy.where(residual < 0, guess, low)
+                high = numpy.where(residual > 0, guess, high)
+                new_guess = guess - step
+                # bisect if Newton leaves the bracket
+                out = ~((new_guess > low) & (new_guess < high))
+                new_guess[out] = (low[out] + high[out]) / 2
+                converged = numpy.all(numpy.abs(new_guess - guess) <= 1e-14 * guess)
+                guess = new_guess
+                if converged:
+                    break
+            pressure[inside] = guess
+
+        # Beyond the data, using the fill value
+        beyond = target > areas[-1]
+        if numpy.any(beyond):
+            low = numpy.full(numpy.sum(beyond), pressures[-1])
+            high = 2 * low
+            for _ in range(100):
+                reached = self.spreading_pressure_at(
+                    high, branch=branch, interp_fill=interp_fill, **units) >= target[beyond]
+                if numpy.all(reached):
+                    break
+                low = numpy.where(reached, low, high)
+                high = numpy.where(reached, high, 2 * high)
+            else:
+                raise CalculationError(
+                    "The spreading pressure requested cannot be reached"
+                    " with the `interp_fill` specified.")
+            for _ in range(100):
+                middle = numpy.sqrt(low * high)
+                below = self.spreading_pressure_at(
+                    middle, branch=branch, interp_fill=interp_fill, **units) < target[beyond]
+                low = numpy.where(below, middle, low)
+                high = numpy.where(below, high, middle)
+                if numpy.all(high - low <= 1e-14 * high):
+                    break
+            pressure[beyond] = numpy.sqrt(low * high)
+
+        if spreading_pressure.ndim == 0:
+            return pressure[0]
+        return pressure
+
+    def _spreading_pressure_table(self, branch, **units):
+        """
+        Return the isotherm points and the cumulative spreading pressure
+        at each point, in the units requested.
+
+        The table is computed once for each branch and set of units,
+        and stored until the isotherm is converted.
+        """
+        key = (branch,) + tuple(units[unit] for unit in sorted(units))
+        table = self._spreading_tables.get(key)
+
+        if table is None:
+            pressures = self.pressure(branch=branch,
+                                      pressure_unit=units['pressure_unit'],
+                                      pressure_mode=units['pressure_mode'])
+            loadings = self.loading(branch=branch,
+                                    loading_unit=units['loading_unit'],
+                                    loading_basis=units['loading_basis'],
+                                    adsorbent_unit=units['adsorbent_unit'],
+                                    adsorbent_basis=units['adsorbent_basis'])
+
+            order = numpy.argsort(pressures, kind='mergesort')
+            pressures = numpy.asarray(pressures[order], dtype=float)
+            loadings = numpy.asarray(loadings[order], dtype=float)
+
+            # area of first segment \int_0^P_1 n(P)/P dP, then
+            # linear interpolation of isotherm data between points
+            slopes = numpy.diff(loadings) / numpy.diff(pressures)
+            intercepts = loadings[:-1] - slopes * pressures[:-1]
+            segments = slopes * numpy.diff(pressures) + \
+                intercepts * numpy.log(pressures[1:] / pressures[:-1])
+            areas = numpy.concatenate([loadings[:1], loadings[0] + numpy.cumsum(segments)])
+
+            table = (pressures, loadings, areas)
+            self._spreading_tables[key] = table
+
+        return table
+
+
+def _flatten_batch(arrays, dtype=float):
+    """Concatenate the arrays of several isotherms, returning their lengths."""
+    if isinstance(arrays, numpy.ndarray) and arrays.ndim == 2:
+        return (arrays.astype(dtype).ravel(),
+                numpy.full(arrays.shape[0], arrays.shape[1], dtype=int))
+
+    arrays = [numpy.asarray(array, dtype=dtype) for array in arrays]
+    if any(array.ndim != 1 for array in arrays):
+        raise ParameterError(
+            "Pass the data of each isotherm as a one-dimensional array.")
+    lengths = numpy.array([len(array) for array in arrays], dtype=int)
+    if not arrays:
+        return numpy.empty(0, dtype=dtype), lengths
+    return numpy.concatenate(arrays), lengths
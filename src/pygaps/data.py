@@ -1,19 +1,212 @@
 """
-Loading some data at import-time.
+Loading some data on first use.
 
 Here is where objects such as adsorbates or materials
 are imported to be available for pyGAPS.
-These are populated at import-time.
+The lists are only populated from the internal database
+the first time they are accessed, which keeps the package import fast.
 Also defines the internal database location.
 """
+import collections
 import os
 
-from .parsing.sqliteinterface import db_get_adsorbate_names
-from .parsing.sqliteinterface import db_get_adsorbates
-from .parsing.sqliteinterface import db_get_materials
-
 DATABASE = os.path.join(os.path.dirname(__file__), 'database', 'local.db')
 
-MATERIAL_LIST = db_get_materials(DATABASE, verbose=False)
-ADSORBATE_NAME_LIST = [a['name'].lower() for a in db_get_adsorbate_names(DATABASE)]
-ADSORBATE_LIST = db_get_adsorbates(DATABASE, verbose=False)
+
+class LazyList(collections.UserList):
+    """
+    A list which is populated by a loader function on first access.
+
+    Parameters
+    ----------
+    initlist : iterable, optional
+        Initial contents, if the list should not be lazy.
+    loader : callable, optional
+        A function without arguments which returns the contents of
+        the list. It is called only once, the first time the list is used.
+    """
+
+    def __init__(self, initlist=None, loader=None):
+        """Store the loader, deferring any reading."""
+        self._loader = loader
+        self._data = None
+        if loader is None:
+            super().__init__(initlist)
+
+    @property
+    def data(self):
+        """The underlying list, loaded if needed."""
+        if self._data is None:
+            self._data = list(self._loader())
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def loaded(self):
+        """Whether the contents have been loaded."""
+        return self._data is not None
+
+
+class LazyRegistry(LazyList):
+    """
+    A lazy list which also keeps a hash index of its items.
+
+    The index maps each key of an item to the item itself, for
+    constant time lookups. It is updated when items are appended
+    or extended, and rebuilt on first use after any other change to the list.
+    If several items share a key, the first one in the list is returned,
+    as a linear search would.
+
+    Parameters
+    ----------
+    initlist : iterable, optional
+        Initial contents, if the list should not be lazy.
+    loader : callable, optional
+        A function without arguments which returns the contents of the list.
+    keys : callable, optional
+        A function which returns the lookup keys of an item.
+    """
+
+    def __init__(self, initlist=None, loader=None, keys=None):
+        """Store the key function, deferring indexing."""
+        self._keys = keys
+        self._index = None
+        super().__init__(initlist, loader)
+
+    def get(self, key, default=None):
+        """
+        Return the first item indexed under a key.
+
+        Parameters
+        ----------
+        key : hashable
+            The key to search for.
+        default : optional
+            What to return if the key is not in the index.
+        """
+        if self._index is None:
+            self._index = {}
+            for item in self.data:
+                self._index_item(item)
+        return self._index.get(key, default)
+
+    def _index_item(self, item):
+        for key in self._keys(item):
+            self._index.setdefault(key, item)
+
+    def _invalidate(self):
+        self._index = None
+
+    def _derived(self, data):
+        return self.__class__(data, keys=self._keys)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._derived(self.data[i])
+        return self.data[i]
+
+    def __add__(self, other):
+        return self._derived(self.data + list(other))
+
+    def __radd__(self, other):
+        return self._derived(list(other) + self.data)
+
+    def __mul__(self, n):
+        return self._derived(self.data * n)
+
+    __rmul__ = __mul__
+
+    def copy(self):
+        """Return a shallow copy, indexed with the same keys."""
+        return self._derived(self.data)
+
+    def append(self, item):
+        """Append an item and add its keys to the index."""
+        super().append(item)
+        if self._index is not None:
+            self._index_item(item)
+
+    def extend(self, other):
+        """Extend the list and add the new keys to the index."""
+        other = list(other)
+        super().extend(other)
+        if self._index is not None:
+            for item in other:
+                self._index_item(item)
+
+    def __setitem__(self, i, item):
+        super().__setitem__(i, item)
+        self._invalidate()
+
+    def __delitem__(self, i):
+        super().__delitem__(i)
+        self._invalidate()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, n):
+        self._invalidate()
+        return super().__imul__(n)
+
+    def insert(self, i, item):
+        """Insert an item, rebuilding the index on next use."""
+        super().insert(i, item)
+        self._invalidate()
+
+    def pop(self, i=-1):
+        """Remove an item, rebuilding the index on next use."""
+        self._invalidate()
+        return super().pop(i)
+
+    def remove(self, item):
+        """Remove an item, rebuilding the index on next use."""
+        super().remove(item)
+        self._invalidate()
+
+    def clear(self):
+        """Empty the list and the index."""
+        super().clear()
+        self._invalidate()
+
+    def reverse(self):
+        """Reverse the list, rebuilding the index on next use."""
+        super().reverse()
+        self._invalidate()
+
+    def sort(self, *args, **kwds):
+        """Sort the list, rebuilding the index on next use."""
+        super().sort(*args, **kwds)
+        self._invalidate()
+
+
+def _material_keys(material):
+    return [(material.name, material.batch)]
+
+
+def _adsorbate_keys(adsorbate):
+    return [adsorbate.name.lower()] + adsorbate.alias
+
+
+def _load_materials():
+    from .parsing.sqliteinterface import db_get_materials
+    return db_get_materials(DATABASE, verbose=False)
+
+
+def _load_adsorbate_names():
+    from .parsing.sqliteinterface import db_get_adsorbate_names
+    return [a['name'].lower() for a in db_get_adsorbate_names(DATABASE)]
+
+
+def _load_adsorbates():
+    from .parsing.sqliteinterface import db_get_adsorbates
+    return db_get_adsorbates(DATABASE, verbose=False)
+
+
+MATERIAL_LIST = LazyRegistry(loader=_load_materials, keys=_material_keys)
+ADSORBATE_NAME_LIST = LazyList(loader=_load_adsorbate_names)
+ADSORBATE_LIST = LazyRegistry(loader=_load_adsorbates, keys=_adsorbate_keys)
@@ -3,9 +3,12 @@
 import abc
 
 import numpy
+import scipy.integrate as integ
+import scipy.interpolate as interp
 import scipy.optimize as opt
 
 from ..utilities.exceptions import CalculationError
+from ..utilities.exceptions import ParameterError
 
 
 class IsothermBaseModel():
@@ -20,6 +23,7 @@ class IsothermBaseModel():
     rmse = numpy.nan
     pressure_range = [numpy.nan, numpy.nan]
     loading_range = [numpy.nan, numpy.nan]
+    _table = None
 
     def __init__(self):
         """Instantiate parameters."""
@@ -112,6 +116,178 @@ class IsothermBaseModel():
         """
         return
 
+    def tabulate(self, pressure_range, tolerance=1e-6, max_points=4097):
+        r"""
+        Precompute an interpolated representation of the model.
+
+        Loading, pressure and spreading pressure are calculated exactly
+        on a logarithmic grid spanning the pressure range, and
+        then represented by splines in :math:`\ln p`. The spreading
+        pressure uses cubic Hermite segments with the exact derivative
+        :math:`d\Pi / d\ln p = n`.
+
+        The grid is doubled until the splines built on every other
+        node reproduce the remaining nodes to within the tolerance,
+        relative to the largest value of the loading and spreading
+        pressure. The pressure error is measured by the change in
+        loading it causes, as the inverse is ill-conditioned where
+        the isotherm is flat.
+        The table is discarded automatically if the parameters change.
+
+        Parameters
+        ----------
+        pressure_range : [float, float]
+            The pressure range over which to tabulate the model.
+        tolerance : float, optional
+            Maximum error allowed for the tabulated values.
+        max_points : int, optional
+            Maximum number of nodes to use before giving up.
+
+        Raises
+        ------
+        ParameterError
+            If the pressure range is not valid.
+        CalculationError
+            If the tolerance cannot be reached with ``max_points`` nodes.
+        """
+        p_min, p_max = map(float, pressure_range)
+        if not 0 < p_min < p_max:
+            raise ParameterError(
+                "The pressure range to tabulate must be positive and increasing.")
+
+        # Models calculating pressure are tabulated on a loading grid,
+        # to avoid root finding at every node.
+        if self.calculates == 'pressure':
+            bounds = numpy.log([numpy.squeeze(self.loading(p_min)),
+                                numpy.squeeze(self.loading(p_max))])
+        else:
+            bounds = numpy.log([p_min, p_max])
+
+        points = 33
+        while True:
+            grid = numpy.linspace(bounds[0], bounds[1], points)
+            ln_p, loading, spreading = self._table_nodes(grid)
+
+            if not numpy.all(numpy.diff(ln_p) > 0):
+                raise CalculationError(
+                    "Model {0} is not monotonic over the range requested "
+                    "and cannot be tabulated.".format(self.name))
+
+            # Check the splines on even nodes against the odd nodes
+            table = self._table_splines(ln_p[::2], loading[::2], spreading[::2], self.calculates)
+            error = max(
+                numpy.max(numpy.abs(table['loading'](ln_p[1::2]) - loading[1::2])) /
+                numpy.max(numpy.abs(loading)),
+                numpy.max(numpy.abs(table['spreading_pressure'](ln_p[1::2]) - spreading[1::2])) /
+                numpy.max(numpy.abs(spreading)),
+                numpy.max(numpy.abs((table['pressure'](loading[1::2]) - ln_p[1::2]) *
+                                    table['loading'](ln_p[1::2], 1))) /
+                numpy.max(numpy.abs(loading))
+                if table['pressure'] is not None else 0,
+            )
+            if error <= tolerance:
+                break
+
+            points = 2 * points - 1
+            if points > max_points:
+                raise CalculationError(
+                    "Could not tabulate model {0} to a tolerance of {1} "
+                    "with {2} points.".format(self.name, tolerance, max_points))
+
+        table = self._table_splines(ln_p, loading, spreading, self.calculates)
+        table['params'] = dict(self.params)
+        table['pressure_range'] = [p_min, p_max]
+        table['loading_range'] = [loading.min(), loading.max()]
+        self._table = table
+
+    def untabulate(self):
+        """Discard the tabulated representation of the model."""
+        self._table = None
+
+    def tabulated(self, quantity, value):
+        """
+        Evaluate the tabulated representation of the model.
+
+        Parameters
+        ----------
+        quantity : {'loading', 'pressure', 'spreading_pressure'}
+            The quantity to calculate.
+        value : float or array
+            The loading for the pressure, else the pressure.
+
+        Returns
+        -------
+        float or array or None
+            The tabulated value, or ``None`` if the model is not tabulated,
+            its parameters have changed or the value is outside the table.
+        """
+        table = self._table
+        if table is None:
+            return None
+
+        if table['params'] != self.params:
+            self._table = None
+            return None
+
+        value = numpy.asarray(value, dtype=float)
+        if quantity == 'pressure':
+            bounds = table['loading_range']
+        else:
+            bounds = table['pressure_range']
+        if value.size == 0 or numpy.any(value < bounds[0]) or numpy.any(value > bounds[1]):
+            return None
+
+        if quantity == 'pressure':
+            if table['pressure'] is None:
+                return None
+            return numpy.exp(table['pressure'](value))
+        return table[quantity](numpy.log(value))
+
+    def _table_nodes(self, grid):
+        """Calculate exact log-pressure, loading and spreading pressure at each grid node."""
+        if self.calculates == 'pressure':
+            loading = numpy.exp(grid)
+            ln_p = numpy.log(numpy.asarray(self.pressure(loading), dtype=float))
+
+            # Integrating by parts, \Pi(n) = n \ln p(n) - \int_0^n \ln p(n) dn
+            def ln_pressure(n):
+                with numpy.errstate(divide='ignore'):
+                    return numpy.log(self.pressure(n))
+
+            segments = [integ.quad(ln_pressure, start, end)[0]
+                        for start, end in zip(loading[:-1], loading[1:])]
+            integral = integ.quad(ln_pressure, 0, loading[0])[0] + \
+                numpy.concatenate([[0], numpy.cumsum(segments)])
+            spreading = loading * ln_p - integral
+
+        else:
+            ln_p = grid
+            loading = numpy.asarray(self.loading(numpy.exp(ln_p)), dtype=float)
+
+            # \Pi(p) = \int n(p) d\ln p, accumulated between nodes
+            segments = [integ.quad(lambda x: self.loading(numpy.exp(x)), start, end)[0]
+                        for start, end in zip(ln_p[:-1], ln_p[1:])]
+            spreading = self.spreading_pressure(numpy.exp(ln_p[0])) + \
+                numpy.concatenate([[0], numpy.cumsum(segments)])
+
+        return ln_p, loading, spreading
+
+    @staticmethod
+    def _table_splines(ln_p, loading, spreading, calculates):
+        """
+        Build the interpolating splines from the node values.
+
+        Models which calculate pressure directly do not need
+        a pressure spline.
+        """
+        return {
+            'loading': interp.CubicSpline(ln_p, loading),
+            'spreading_pressure': interp.BPoly.from_derivatives(
+                ln_p, numpy.column_stack([spreading, loading])),
+            'pressure': interp.CubicSpline(loading, ln_p)
+            if calculates == 'loading' and numpy.all(numpy.diff(loading) > 0) else None,
+        }
+
     def initial_guess(self, pressure, loading):
         """
         Return initial guess for fitting.
@@ -2,11 +2,11 @@
 
 import warnings
 
-import matplotlib.pyplot as plt
 import numpy
 import scipy.optimize as opt
 
 from ..utilities.exceptions import CalculationError
+from ..utilities.math_utilities import bracketed_root
 from .base_model import IsothermBaseModel
 
 
@@ -58,29 +58,34 @@ class Virial(IsothermBaseModel):
 
         Careful!
         For the Virial model, the loading has to
-        be computed numerically.
+        be computed numerically. All pressures are solved at once
+        with a bracketing solver, the upper end of the bracket
+        being found by doubling the Henry's law loading.
 
         Parameters
         ----------
-        pressure : float
+        pressure : float or array
             The pressure at which to calculate the loading.
 
         Returns
         -------
-        float
+        float or array
             Loading at specified pressure.
         """
-        def fun(x):
-            return (self.pressure(x) - pressure)**2
-
-        opt_res = opt.minimize(fun, pressure, method='Nelder-Mead')
-
-        if not opt_res.success:
-            raise CalculationError("""
-            Root finding for failed. Error: \n\t{}
-            """.format(opt_res.message))
+        pressure = numpy.asarray(pressure, dtype=float)
+
+        upper = numpy.maximum(self.params['K'] * pressure, 1e-6)
+        for _ in range(100):
+            with numpy.errstate(over='ignore'):
+                short = self.pressure(upper) < pressure
+            if not numpy.any(short):
+                break
+            upper = numpy.where(short, 2 * upper, upper)
+        else:
+            raise CalculationError(
+                "Could not bracket the loading for the pressures {0}.".format(pressure))
 
-        return opt_res.x
+        return bracketed_root(self.pressure, pressure, 0, upper)
 
     def pressure(self, loading):
         """
@@ -255,6 +260,7 @@ class Virial(IsothermBaseModel):
             print("Model {0} success, rmse is {1}".format(
                 self.name, self.rmse))
             n_load = numpy.linspace(1e-2, numpy.amax(loading), 100)
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots()
             ax.plot(loading, ln_p_over_n, '.')
             ax.plot(n_load, numpy.log(numpy.divide(self.pressure(n_load), n_load)), '-')
@@ -4,6 +4,7 @@ import numpy
 import scipy.optimize as opt
 
 from ..utilities.exceptions import CalculationError
+from ..utilities.math_utilities import bracketed_root
 from .base_model import IsothermBaseModel
 
 
@@ -83,30 +84,21 @@ class WVST(IsothermBaseModel):
 
         Careful!
         For the W-VST model, the loading has to
-        be computed numerically.
+        be computed numerically. All pressures are solved at once
+        with a bracketing solver, between zero and the
+        monolayer capacity.
 
         Parameters
         ----------
-        pressure : float
+        pressure : float or array
             The pressure at which to calculate the loading.
 
         Returns
         -------
-        float
+        float or array
             Loading at specified pressure.
-
         """
-        def fun(x):
-            return self.pressure(x) - pressure
-
-        opt_res = opt.root(fun, 0, method='hybr')
-
-        if not opt_res.success:
-            raise CalculationError("""
-            Root finding for value {0} failed.
-            """.format(pressure))
-
-        return opt_res.x
+        return bracketed_root(self.pressure, pressure, 0, self.params["n_m"])
 
     def pressure(self, loading):
         """
@@ -3,6 +3,8 @@
 # isort:skip_file
 
 
+from .sqliteinterface import Database
+
 from .sqliteinterface import db_get_adsorbates
 from .sqliteinterface import db_upload_adsorbate
 from .sqliteinterface import db_delete_adsorbate
@@ -18,7 +20,9 @@ from .sqliteinterface import db_get_material_property_types
 from .sqliteinterface import db_delete_material_property_type
 
 from .sqliteinterface import db_upload_isotherm
+from .sqliteinterface import db_upload_isotherms
 from .sqliteinterface import db_get_isotherms
+from .sqliteinterface import db_iter_isotherms
 from .sqliteinterface import db_delete_isotherm
 from .sqliteinterface import db_upload_isotherm_type
 from .sqliteinterface import db_get_isotherm_types
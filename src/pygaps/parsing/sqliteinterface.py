@@ -2,10 +2,11 @@
 This module contains the sql interface for data manipulation.
 """
 
-import array
 import functools
 import sqlite3
+import threading
 
+import numpy
 import pandas
 
 from ..core.adsorbate import Adsorbate
@@ -13,18 +14,152 @@ from ..core.material import Material
 from ..core.pointisotherm import Isotherm
 from ..core.pointisotherm import PointIsotherm
 from ..utilities.exceptions import ParsingError
-from ..utilities.python_utilities import grouped
+from ..utilities.sqlite_utilities import build_condition
 from ..utilities.sqlite_utilities import build_delete
 from ..utilities.sqlite_utilities import build_insert
 from ..utilities.sqlite_utilities import build_select
 from ..utilities.sqlite_utilities import build_update
 
 
+class Database():
+    """
+    A reusable session on an sqlite database.
+
+    It can be passed to any of the ``db_*`` functions instead of
+    the database path. Connections are kept open between calls, one
+    for each thread, so that the connection setup is done only once
+    and the prepared statements are cached by sqlite.
+
+    Outside of a ``with`` block each call is committed, as when passing
+    a path. Inside, the calls are committed together at the end of the
+    block, or rolled back if an exception is raised. A call which fails
+    is rolled back on its own, without affecting the rest of the block.
+
+    Parameters
+    ----------
+    path : str
+        Path to the database. Use pygaps.DATABASE for internal access.
+    cached_statements : int, optional
+        Number of prepared statements to keep for each connection.
+
+    Examples
+    --------
+    ::
+
+        db = pygaps.Database(pygaps.DATABASE)
+        with db:
+            for isotherm in isotherms:
+                pygaps.db_upload_isotherm(db, isotherm)
+        db.close()
+
+    """
+
+    def __init__(self, path, cached_statements=256):
+        """Store database path, connections are opened on first use."""
+        self.path = path
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Print database path."""
+        return "pyGAPS Database, path {}".format(self.path)
+
+    def __enter__(self):
+        """Start a batch of calls in the current thread."""
+        if not self._depth() and not self.connection.in_transaction:
+            self.connection.execute('BEGIN')
+        self._local.depth = self._depth() + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Commit the calls in the current thread, or roll back on error."""
+        self._local.depth = self._depth() - 1
+        if self._local.depth == 0:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+
+    def _depth(self):
+        return getattr(self._local, 'depth', 0)
+
+    @property
+    def connection(self):
+        """The connection of the current thread."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path,
+                                   cached_statements=self.cached_statements,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA foreign_keys = ON')
+            self._local.connection = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Commit and close the connections of all threads."""
+        with self._lock:
+            for conn in self._connections:
+                conn.commit()
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def run(self, func, *args, **kwargs):
+        """Run a database function with a cursor of the current thread connection."""
+        cursor = self.connection.cursor()
+
+        if not self._depth():
+            return _run_committed(self.connection, func, *args, cursor=cursor, **kwargs)
+
+        cursor.execute('SAVEPOINT db_call')
+        try:
+            ret = func(*args, cursor=cursor, **kwargs)
+        except Exception as e:
+            cursor.execute('ROLLBACK TO db_call')
+            cursor.execute('RELEASE db_call')
+            if not isinstance(e, sqlite3.IntegrityError):
+                raise
+            if kwargs.get('verbose', False):
+                print("Error")
+            raise ParsingError from e
+        else:
+            cursor.execute('RELEASE db_call')
+
+        return ret
+
+
+def _run_committed(conn, func, *args, **kwargs):
+    """Run a database function, then commit or roll back."""
+    try:
+        ret = func(*args, **kwargs)
+
+    except Exception as e:
+        # Nothing written by a failed call is kept
+        conn.rollback()
+        if not isinstance(e, sqlite3.IntegrityError):
+            raise
+        if kwargs.get('verbose', False):
+            print("Error")
+        raise ParsingError from e
+    else:
+        conn.commit()
+
+    return ret
+
+
 def with_connection(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
 
         path = args[0]
+        if isinstance(path, Database):
+            return path.run(func, *args, **kwargs)
+
         conn = sqlite3.connect(path)
         conn.row_factory = sqlite3.Row
 
@@ -33,15 +168,8 @@ def with_connection(func):
             cursor = conn.cursor()
             cursor.execute('PRAGMA foreign_keys = ON')
 
-            ret = func(*args, **kwargs, cursor=cursor)
+            ret = _run_committed(conn, func, *args, cursor=cursor, **kwargs)
 
-        except sqlite3.IntegrityError as e:
-            conn.rollback()
-            if kwargs.get('verbose', False):
-                print("Error")
-            raise ParsingError from e
-        else:
-            conn.commit()
         finally:
             conn.close()
 
@@ -409,71 +537,218 @@ def db_upload_isotherm(path, isotherm, verbose=True, **kwargs):
 
     cursor = kwargs.pop('cursor', None)
 
-    # The isotherm is going to be inserted into the database
-    # Build upload dict
-    upload_dict = {}
-    iso_dict = isotherm.to_dict()
-    iso_id = isotherm.iso_id
-    for param in Isotherm._db_columns:
-        upload_dict.update({param: iso_dict.pop(param, None)})
-    upload_dict['id'] = iso_id
+    iso_row, data_rows, prop_rows = _isotherm_rows(isotherm)
 
     # Upload isotherm info to database
-    cursor.execute(build_insert(table='isotherms',
-                                to_insert=Isotherm._db_columns), upload_dict)
+    cursor.execute(_SQL_ISOTHERM_INSERT, iso_row)
 
     # Then, the isotherm data will be uploaded into the isotherm_data table
+    cursor.executemany(_SQL_ISOTHERM_DATA_INSERT, data_rows)
 
-    # Build sql request
-    sql_insert = build_insert(table='isotherm_data',
-                              to_insert=['iso_id', 'type', 'data'])
+    # Upload the remaining data from the isotherm
+    cursor.executemany(_SQL_ISOTHERM_PROPERTY_INSERT, prop_rows)
 
-    # Insert standard data fields:
-    cursor.execute(sql_insert,
-                   {'iso_id': iso_id, 'type': 'pressure',
-                    'data': isotherm.pressure().tobytes()}
-                   )
+    if verbose:
+        # Print success
+        print("Success:", isotherm)
 
-    cursor.execute(sql_insert,
-                   {'iso_id': iso_id, 'type': 'loading',
-                    'data': isotherm.loading().tobytes()}
-                   )
 
-    # Update or insert other fields:
-    for key in isotherm.other_keys:
-        cursor.execute(sql_insert,
-                       {'iso_id': iso_id, 'type': key,
-                        'data': isotherm.other_data(key).tobytes()}
-                       )
+@with_connection
+def db_upload_isotherms(path, isotherms, journal_mode=None, synchronous=None,
+                        verbose=True, **kwargs):
+    """
+    Uploads many isotherms to the database at once.
 
-    # Upload the remaining data from the isotherm
-    for key in iso_dict:
-        if key not in isotherm._unit_params:
-            cursor.execute(build_insert(table='isotherm_properties',
-                                        to_insert=['iso_id', 'type', 'value']),
-                           {'iso_id': iso_id,
-                            'type': key,
-                            'value': iso_dict[key]
-                            })
+    All isotherms are inserted in a single transaction, with
+    one statement for each table. If this fails, the isotherms are
+    inserted one by one, and the ones that cannot be uploaded are
+    skipped and reported, without aborting the others. Isotherms which
+    cannot be converted to database rows are reported in the same way.
+
+    Parameters
+    ----------
+    path : str
+        Path to the database. Use pygaps.DATABASE for internal access.
+    isotherms : iterable of Isotherm
+        Isotherm classes to upload to the database.
+    journal_mode : str, optional
+        SQLite journal mode to use during the upload, such as 'MEMORY' or 'WAL'.
+        It cannot be set when the upload is part of a larger transaction.
+    synchronous : str, optional
+        SQLite synchronous setting to use during the upload, such as 'OFF'.
+        Faster, but the database may be corrupted if the system crashes.
+        Both settings are restored to their previous values afterwards.
+    verbose : bool
+        Print to console on success or error.
+
+    Returns
+    -------
+    list
+        List of (isotherm, error) tuples for the isotherms which failed.
+    """
+
+    cursor = kwargs.pop('cursor', None)
+    conn = cursor.connection
+
+    pragmas = [
+        ('journal_mode', _pragma_value('journal_mode', journal_mode, _JOURNAL_MODES)),
+        ('synchronous', _pragma_value('synchronous', synchronous, _SYNCHRONOUS_MODES)),
+    ]
+    if journal_mode is not None and conn.in_transaction:
+        raise ParsingError("The journal mode cannot be changed inside a transaction.")
+
+    # Pragmas must be set before the transaction begins, and are restored after
+    previous = []
+    for pragma, value in pragmas:
+        if value is not None:
+            previous.append((pragma, cursor.execute('PRAGMA ' + pragma).fetchone()[0]))
+            cursor.execute('PRAGMA {0} = {1}'.format(pragma, value))
+
+    began = not conn.in_transaction
+    try:
+        if began:
+            cursor.execute('BEGIN')
+        number, failed = _upload_isotherms(cursor, isotherms)
+        if began:
+            conn.commit()
+    except Exception:
+        if began:
+            conn.rollback()
+        raise
+    finally:
+        for pragma, value in previous:
+            cursor.execute('PRAGMA {0} = {1}'.format(pragma, value))
 
     if verbose:
-        # Print success
-        print("Success:", isotherm)
+        # Print errors and success
+        for isotherm, error in failed:
+            print("Error:", isotherm, error)
+        print("Uploaded", number - len(failed), "isotherms,", len(failed), "failed")
+
+    return failed
+
+
+_JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# Errors caused by the values of an isotherm, rather than by the database
+_ISOTHERM_ERRORS = (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError)
+
+
+def _pragma_value(pragma, value, allowed):
+    """Checks the value of a pragma against the allowed ones."""
+    if value is None:
+        return None
+    if str(value).upper() not in allowed:
+        raise ParsingError(
+            "The {0} must be one of {1}, not {2}.".format(pragma, allowed, value))
+    return str(value).upper()
+
+
+def _upload_isotherms(cursor, isotherms):
+    """Inserts the isotherms together, then one by one if this fails."""
+
+    number = 0
+    rows = []
+    failed = []
+    for isotherm in isotherms:
+        number += 1
+        try:
+            rows.append((isotherm, ) + _isotherm_rows(isotherm))
+        except Exception as e:
+            failed.append((isotherm, e))
+
+    try:
+        cursor.execute('SAVEPOINT upload_isotherms')
+        cursor.executemany(_SQL_ISOTHERM_INSERT, [row[1] for row in rows])
+        cursor.executemany(_SQL_ISOTHERM_DATA_INSERT,
+                           [data for row in rows for data in row[2]])
+        cursor.executemany(_SQL_ISOTHERM_PROPERTY_INSERT,
+                           [prop for row in rows for prop in row[3]])
+        cursor.execute('RELEASE upload_isotherms')
+
+    except _ISOTHERM_ERRORS:
+        cursor.execute('ROLLBACK TO upload_isotherms')
+        cursor.execute('RELEASE upload_isotherms')
+
+        # Find which isotherms cannot be uploaded
+        for isotherm, iso_row, data_rows, prop_rows in rows:
+            try:
+                cursor.execute('SAVEPOINT upload_isotherm')
+                cursor.execute(_SQL_ISOTHERM_INSERT, iso_row)
+                cursor.executemany(_SQL_ISOTHERM_DATA_INSERT, data_rows)
+                cursor.executemany(_SQL_ISOTHERM_PROPERTY_INSERT, prop_rows)
+                cursor.execute('RELEASE upload_isotherm')
+            except _ISOTHERM_ERRORS as e:
+                cursor.execute('ROLLBACK TO upload_isotherm')
+                cursor.execute('RELEASE upload_isotherm')
+                failed.append((isotherm, e))
+
+    return number, failed
+
+
+_SQL_ISOTHERM_INSERT = build_insert(table='isotherms',
+                                    to_insert=Isotherm._db_columns)
+_SQL_ISOTHERM_DATA_INSERT = build_insert(table='isotherm_data',
+                                         to_insert=['iso_id', 'type', 'data'])
+_SQL_ISOTHERM_PROPERTY_INSERT = build_insert(table='isotherm_properties',
+                                             to_insert=['iso_id', 'type', 'value'])
+
+
+def _isotherm_rows(isotherm):
+    """Builds the rows of the isotherms, isotherm_data and isotherm_properties tables."""
+
+    # Build upload dict
+    iso_row = {}
+    iso_dict = isotherm.to_dict()
+    iso_id = isotherm.iso_id
+    for param in Isotherm._db_columns:
+        iso_row.update({param: iso_dict.pop(param, None)})
+    iso_row['id'] = iso_id
+
+    # Standard data fields, then other fields
+    data_rows = [
+        {'iso_id': iso_id, 'type': 'pressure', 'data': isotherm.pressure().tobytes()},
+        {'iso_id': iso_id, 'type': 'loading', 'data': isotherm.loading().tobytes()},
+    ]
+    for key in isotherm.other_keys:
+        data_rows.append({'iso_id': iso_id, 'type': key,
+                          'data': isotherm.other_data(key).tobytes()})
+
+    # The remaining data from the isotherm
+    prop_rows = [{'iso_id': iso_id, 'type': key, 'value': iso_dict[key]}
+                 for key in iso_dict if key not in isotherm._unit_params]
+
+    return iso_row, data_rows, prop_rows
 
 
 @with_connection
-def db_get_isotherms(path, criteria, verbose=True, **kwargs):
+def db_get_isotherms(path, criteria, properties=None, order_by=None, limit=None,
+                     verbose=True, **kwargs):
     """
     Gets isotherms with the selected criteria from the database.
 
+    All the filtering, ordering and limiting is done by the database.
+
     Parameters
     ----------
     path : str
         Path to the database. Use pygaps.DATABASE for internal access.
     criteria : dict
         Dictionary of isotherm parameters on which to filter database.
-        For example {'name': 'a_name', 'date': 'a_date'}. Parameters
-        must exist for the filtering to take place.
+        For example {'material': 'a_name', 'temperature': 77}. Parameters
+        must be columns of the isotherm table. A value can also be
+        a list, to select any of its values, or a dictionary with
+        ``min`` and/or ``max`` keys, to select an inclusive range.
+    properties : dict, optional
+        Dictionary of other isotherm properties on which to filter, such as
+        {'user': 'a_user', 'date': {'min': '2019-01-01'}}, with the
+        same kind of values as the criteria.
+    order_by : str or list, optional
+        Isotherm table columns to order the results by. A column
+        starting with '-' is ordered in descending order.
+    limit : int, optional
+        Maximum number of isotherms to return.
     verbose : bool
         Print to console on success or error.
 
@@ -485,61 +760,190 @@ def db_get_isotherms(path, criteria, verbose=True, **kwargs):
 
     cursor = kwargs.pop('cursor', None)
 
-    # Get isotherm info from database
-    cursor.execute(
-        build_select(table='isotherms',
-                           to_select=Isotherm._db_columns,
-                           where=criteria.keys()), criteria)
+    isotherms = list(_iter_isotherms(cursor.connection, criteria, properties,
+                                     order_by=order_by, limit=limit))
+
+    if verbose:
+        # Print success
+        print("Selected", len(isotherms), "isotherms")
 
-    isotherms = []
-    alldata = cursor.fetchall()
+    return isotherms
 
-    for rows in grouped(alldata, 100):  # we are taking 100 isotherms at a time
 
-        ids = tuple(row['id'] for row in rows)
+def db_iter_isotherms(path, criteria, properties=None, order_by=None, limit=None,
+                      fields=None, chunk_size=100, verbose=False):
+    """
+    Iterates over isotherms with the selected criteria from the database.
 
-        # Get isotherm properties from database
-        cursor.execute("""
-                SELECT iso_id, type, value FROM "isotherm_properties"
-                WHERE iso_id IN (%s);
-                """ % ','.join('?' * len(ids)), ids)
-        isotherm_props = cursor.fetchall()
-
-        # Get the properties from the data table
-        cursor.execute("""
-                SELECT iso_id, type, data FROM "isotherm_data"
-                WHERE iso_id IN (%s);
-                """ % ','.join('?' * len(ids)), ids)
-        isotherm_data = cursor.fetchall()
-
-        for row in rows:
-
-            # Generate the isotherm data
-            data_dict = {data[1]: array.array('d', data[2])
-                         for data in isotherm_data if data[0] == row['id']}
-            other_keys = [key for key in data_dict.keys()
-                          if key not in ('pressure', 'loading')]
-            exp_data = pandas.DataFrame(data_dict)
-
-            # Generate the isotherm parameters dictionary
-            exp_params = dict(zip(row.keys(), row))
-            exp_params.update(
-                {prop[1]: prop[2]
-                    for prop in isotherm_props if prop[0] == row['id']})
-            exp_params.update({'other_keys': other_keys})
-            exp_params.pop('id')
-
-            # build isotherm object
-            isotherms.append(PointIsotherm(isotherm_data=exp_data,
-                                           pressure_key="pressure",
-                                           loading_key="loading",
-                                           ** exp_params))
+    Unlike ``db_get_isotherms``, the isotherms are read from the database
+    and built as they are requested, so only a few are in memory at once.
+    The connection is kept open until the iteration is finished.
+
+    Parameters
+    ----------
+    path : str or Database
+        Path to the database. Use pygaps.DATABASE for internal access.
+    criteria : dict
+        Dictionary of isotherm parameters on which to filter database.
+        For example {'material': 'a_name', 'temperature': 77}. Parameters
+        must be columns of the isotherm table. A value can also be
+        a list, to select any of its values, or a dictionary with
+        ``min`` and/or ``max`` keys, to select an inclusive range.
+    properties : dict, optional
+        Dictionary of other isotherm properties on which to filter, such as
+        {'user': 'a_user', 'date': {'min': '2019-01-01'}}, with the
+        same kind of values as the criteria.
+    order_by : str or list, optional
+        Isotherm table columns to order the results by. A column
+        starting with '-' is ordered in descending order.
+    limit : int, optional
+        Maximum number of isotherms to return.
+    fields : {None, 'metadata', 'data'}
+        What to read for each isotherm. If ``None``, a PointIsotherm
+        is built. If 'metadata', a dictionary of the isotherm parameters
+        is returned, without reading the data. If 'data', a dictionary
+        with the isotherm id and its pressure and loading arrays,
+        which are read-only views of the stored data.
+    chunk_size : int
+        Number of isotherms to read from the database at a time.
+    verbose : bool
+        Print to console on success or error.
+
+    Yields
+    ------
+    PointIsotherm or dict
+        The isotherms selected, in the form requested.
+    """
+
+    if isinstance(path, Database):
+        conn = path.connection
+    else:
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+
+    number = 0
+    try:
+        for isotherm in _iter_isotherms(conn, criteria, properties, order_by,
+                                        limit, fields, chunk_size):
+            number += 1
+            yield isotherm
+    finally:
+        if not isinstance(path, Database):
+            conn.close()
 
     if verbose:
         # Print success
-        print("Selected", len(isotherms), "isotherms")
+        print("Selected", number, "isotherms")
+
+
+def _isotherm_query(criteria, properties=None, order_by=None, limit=None):
+    """Builds the query selecting isotherms, and its parameters."""
+
+    conditions = []
+    params = {}
+
+    for column, value in criteria.items():
+        if column not in Isotherm._db_columns:
+            raise ParsingError(
+                "Isotherms can only be selected by {0}, not {1}.".format(
+                    Isotherm._db_columns, column))
+        condition, condition_params = build_condition(column, value, column)
+        conditions.append(condition)
+        params.update(condition_params)
+
+    # Properties are selected through the isotherm_properties index
+    for index, (prop_type, value) in enumerate((properties or {}).items()):
+        name = 'prop{0}'.format(index)
+        condition, condition_params = build_condition('value', value, name)
+        conditions.append(
+            'id IN (SELECT iso_id FROM "isotherm_properties" '
+            'WHERE type = :{0} AND {1})'.format(name + '_type', condition))
+        params[name + '_type'] = prop_type
+        params.update(condition_params)
+
+    sql_q = build_select(table='isotherms',
+                         to_select=Isotherm._db_columns,
+                         where=[])
+    if conditions:
+        sql_q += ' WHERE ' + ' AND '.join(conditions)
+
+    if order_by:
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        order = []
+        for column in order_by:
+            descending = column.startswith('-')
+            column = column.lstrip('-')
+            if column not in Isotherm._db_columns:
+                raise ParsingError(
+                    "Isotherms can only be ordered by {0}, not {1}.".format(
+                        Isotherm._db_columns, column))
+            order.append(column + (' DESC' if descending else ''))
+        sql_q += ' ORDER BY ' + ', '.join(order)
+
+    if limit is not None:
+        sql_q += ' LIMIT :limit'
+        params['limit'] = int(limit)
+
+    return sql_q, params
+
+
+def _iter_isotherms(conn, criteria, properties=None, order_by=None, limit=None,
+                    fields=None, chunk_size=100):
+    """Reads and builds isotherms from the database, a chunk at a time."""
+
+    if fields not in (None, 'metadata', 'data'):
+        raise ParsingError("Fields to read must be None, 'metadata' or 'data'.")
 
-    return isotherms
+    # Get isotherm info from database
+    iso_cursor = conn.execute(*_isotherm_query(criteria, properties, order_by, limit))
+
+    while True:
+        rows = iso_cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+
+        ids = tuple(row['id'] for row in rows)
+        params = {row['id']: dict(zip(row.keys(), row)) for row in rows}
+        data = {iso_id: {} for iso_id in ids}
+
+        # Get isotherm properties from database
+        if fields != 'data':
+            for iso_id, prop_type, value in conn.execute("""
+                    SELECT iso_id, type, value FROM "isotherm_properties"
+                    WHERE iso_id IN (%s);
+                    """ % ','.join('?' * len(ids)), ids):
+                params[iso_id][prop_type] = value
+
+        # Get the isotherm data, decoded without copying
+        if fields != 'metadata':
+            sql_data = """
+                    SELECT iso_id, type, data FROM "isotherm_data"
+                    WHERE iso_id IN (%s)""" % ','.join('?' * len(ids))
+            if fields == 'data':
+                sql_data += " AND type IN ('pressure', 'loading')"
+            for iso_id, data_type, blob in conn.execute(sql_data, ids):
+                data[iso_id][data_type] = numpy.frombuffer(blob, dtype='d')
+
+        for iso_id in ids:
+            if fields == 'metadata':
+                yield params[iso_id]
+
+            elif fields == 'data':
+                yield dict(id=iso_id, **data[iso_id])
+
+            else:
+                # Generate the isotherm parameters dictionary
+                exp_params = params[iso_id]
+                exp_params.pop('id')
+                exp_params['other_keys'] = [key for key in data[iso_id]
+                                            if key not in ('pressure', 'loading')]
+
+                # build isotherm object
+                yield PointIsotherm(isotherm_data=pandas.DataFrame(data[iso_id]),
+                                    pressure_key="pressure",
+                                    loading_key="loading",
+                                    **exp_params)
 
 
 @with_connection
@@ -1,5 +1,6 @@
 """A class used for isotherm interpolation."""
 
+import numpy
 from scipy.interpolate import interp1d
 
 
@@ -10,6 +11,9 @@ class isotherm_interpolator():
     Call directly to use.
 
     It is mainly a wrapper around scipy.interpolate.interp1d.
+    The data is sorted once on creation. Linear interpolation
+    with a scalar, two-element or "extrapolate" fill is done
+    directly with numpy.interp, without creating an interp1d object.
 
     Parameters
     ----------
@@ -48,20 +52,71 @@ class isotherm_interpolator():
 
         # The actual interpolator. This is generated
         # the first time it is needed to make calculations faster.
+        self.interp_fun = None
         if known_data is None:
             return
 
+        # Sort the data once
+        known_data = numpy.asarray(known_data, dtype=float)
+        interp_data = numpy.asarray(interp_data, dtype=float)
+        order = numpy.argsort(known_data, kind='mergesort')
+        self._known = known_data[order]
+        self._interp = interp_data[order]
+
+        # Fill values on the left and right for the numpy fast path
+        self._fill = None
+        if interp_kind == 'linear':
+            if interp_fill is None or \
+                    (isinstance(interp_fill, str) and interp_fill == 'extrapolate'):
+                self._fill = interp_fill
+            elif numpy.ndim(interp_fill) == 0:
+                self._fill = (float(interp_fill), float(interp_fill))
+            elif numpy.shape(interp_fill) == (2,):
+                self._fill = tuple(float(fill) for fill in interp_fill)
+            else:
+                self._fill = False
+
+            if self._fill is not False:
+                return
+
         if interp_fill is None:
-            self.interp_fun = interp1d(known_data, interp_data,
-                                       kind=interp_kind)
+            self.interp_fun = interp1d(self._known, self._interp,
+                                       kind=interp_kind,
+                                       assume_sorted=True)
         else:
-            self.interp_fun = interp1d(known_data, interp_data,
+            self.interp_fun = interp1d(self._known, self._interp,
                                        kind=interp_kind,
                                        fill_value=interp_fill,
-                                       bounds_error=False)
+                                       bounds_error=False,
+                                       assume_sorted=True)
 
         return
 
     def __call__(self, data):
         """Override direct call."""
-        return self.interp_fun(data)
+        if self.interp_fun is not None:
+            return self.interp_fun(data)
+
+        data = numpy.asarray(data, dtype=float)
+        known, interp = self._known, self._interp
+
+        if self._fill is None:
+            if numpy.any(data < known[0]):
+                raise ValueError("A value in x_new is below the interpolation range.")
+            if numpy.any(data > known[-1]):
+                raise ValueError("A value in x_new is above the interpolation range.")
+            return numpy.interp(data, known, interp)
+
+        if self._fill == 'extrapolate':
+            result = numpy.interp(data, known, interp)
+            below = data < known[0]
+            above = data > known[-1]
+            if numpy.any(below):
+                slope = (interp[1] - interp[0]) / (known[1] - known[0])
+                result = numpy.where(below, interp[0] + slope * (data - known[0]), result)
+            if numpy.any(above):
+                slope = (interp[-1] - interp[-2]) / (known[-1] - known[-2])
+                result = numpy.where(above, interp[-1] + slope * (data - known[-1]), result)
+            return result
+
+        return numpy.interp(data, known, interp, left=self._fill[0], right=self._fill[1])
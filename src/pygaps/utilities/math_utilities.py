@@ -5,6 +5,7 @@ from itertools import groupby
 import numpy
 import scipy.interpolate as interp
 
+from .exceptions import CalculationError
 from .exceptions import ParameterError
 
 
@@ -92,3 +93,83 @@ def bspline(xs, ys, n=100, degree=2, periodic=False):
 
     return (numpy.array([x[0] for x in res]),
             numpy.array([y[1] for y in res]))
+
+
+def bracketed_root(func, target, lower, upper, rtol=1e-12, max_iter=200):
+    """
+    Solve ``func(x) = target`` element-wise for an increasing function.
+
+    All values are solved at once with a false position method using the
+    Illinois modification, which keeps each root bracketed. Where the
+    interpolated step is not finite, the bracket is bisected instead.
+
+    Parameters
+    ----------
+    func : callable
+        Increasing function, which must accept and return arrays.
+    target : array
+        Values of the function to find.
+    lower : array
+        Lower end of the brackets, where ``func(lower) <= target``.
+    upper : array
+        Upper end of the brackets, where ``func(upper) >= target``.
+    rtol : float, optional
+        Relative size of the bracket at which to stop.
+    max_iter : int, optional
+        Maximum number of iterations.
+
+    Returns
+    -------
+    array
+        The roots, of the same shape as the target.
+
+    Raises
+    ------
+    CalculationError
+        If the roots are not found within the maximum number of iterations.
+    """
+    target = numpy.asarray(target, dtype=float)
+    lower, upper = numpy.broadcast_arrays(
+        numpy.array(lower, dtype=float), numpy.array(upper, dtype=float), target)[:2]
+    lower = lower.copy()
+    upper = upper.copy()
+
+    with numpy.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        f_lower = func(lower) - target
+        f_upper = func(upper) - target
+        side = numpy.zeros(target.shape, dtype=int)
+
+        # roots which are found are not iterated further
+        root = numpy.where(f_lower == 0, lower, upper)
+        done = (f_lower == 0) | (f_upper == 0)
+
+        for _ in range(max_iter):
+            if numpy.all(done):
+                break
+
+            # false position step, bisection if it is not usable
+            step = lower - f_lower * (upper - lower) / (f_upper - f_lower)
+            bisect = ~(numpy.isfinite(step) & (step > lower) & (step < upper))
+            step = numpy.where(bisect, (lower + upper) / 2, step)
+
+            f_step = func(step) - target
+            root = numpy.where(done, root, step)
+            done = done | (f_step == 0) | (upper - lower <= rtol * numpy.abs(step))
+
+            below = f_step < 0
+
+            # Illinois modification: halve the value at an end which is kept twice
+            f_upper = numpy.where(below & (side == 1), f_upper / 2, f_upper)
+            f_lower = numpy.where(~below & (side == -1), f_lower / 2, f_lower)
+            side = numpy.where(below, 1, -1)
+
+            lower = numpy.where(below, step, lower)
+            f_lower = numpy.where(below, f_step, f_lower)
+            upper = numpy.where(below, upper, step)
+            f_upper = numpy.where(below, f_upper, f_step)
+        else:
+            if not numpy.all(done):
+                raise CalculationError(
+                    "Root finding did not converge in {0} iterations.".format(max_iter))
+
+    return root
@@ -60,6 +60,10 @@ PRAGMA_ISOTHERMS = """
                 FOREIGN KEY(`iso_type`)         REFERENCES `isotherm_type`(`type`),
                 FOREIGN KEY(`adsorbate`)        REFERENCES `adsorbates`(`name`)
                 );
+
+            CREATE INDEX "isotherms_search" ON "isotherms" (
+                `material`, `adsorbate`, `temperature`
+                );
 """
 
 PRAGMA_ISOTHERM_TYPE = """
@@ -85,6 +89,10 @@ PRAGMA_ISOTHERM_PROPERTIES = """
                 FOREIGN KEY(`iso_id`)    REFERENCES `isotherms`(`id`),
                 FOREIGN KEY(`type`)      REFERENCES 'isotherm_properties_type'('type')
                 );
+
+            CREATE INDEX "isotherm_properties_search" ON "isotherm_properties" (
+                `type`, `value`
+                );
 """
 
 PRAGMA_ISOTHERM_PROPERTY_TYPE = """
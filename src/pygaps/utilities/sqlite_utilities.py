@@ -1,5 +1,7 @@
 """General functions for SQL query building."""
 
+from .exceptions import ParameterError
+
 
 def build_update(table, to_set, where, prefix=None):
     """
@@ -89,6 +91,51 @@ def build_select(table, to_select, where):
     return sql_q
 
 
+def build_condition(column, value, name):
+    """
+    Build a condition on a column from a criteria value.
+
+    Parameters
+    ----------
+    column : str
+        The column to constrain.
+    value : object
+        The criteria value. It can be a single value for equality,
+        a list, tuple or set for membership, or a dictionary with
+        ``min`` and/or ``max`` keys for an inclusive range. Any
+        other key raises a ParameterError.
+    name : str
+        Name to give to the query parameters.
+
+    Returns
+    -------
+    str, dict
+        Built condition and its named parameters.
+
+    """
+    if isinstance(value, dict):
+        unknown = set(value) - {'min', 'max'}
+        if unknown:
+            raise ParameterError(
+                "A range can only have 'min' and 'max' keys, not {0}.".format(
+                    sorted(unknown)))
+        conditions = []
+        params = {}
+        if value.get('min') is not None:
+            conditions.append('{0} >= :{1}_min'.format(column, name))
+            params[name + '_min'] = value['min']
+        if value.get('max') is not None:
+            conditions.append('{0} <= :{1}_max'.format(column, name))
+            params[name + '_max'] = value['max']
+        return ' AND '.join(conditions) or '1', params
+
+    if isinstance(value, (list, tuple, set)):
+        params = {'{0}_{1}'.format(name, i): val for i, val in enumerate(value)}
+        return '{0} IN ({1})'.format(column, ', '.join(':' + key for key in params)), params
+
+    return '{0} = :{1}'.format(column, name), {name: value}
+
+
 def build_select_unnamed(table, to_select, where, join='AND'):
     """
     Build an select request with multiple parameters.
@@ -1,5 +1,7 @@
 """Perform conversions between different units used."""
 
+import collections
+
 import pygaps
 
 from .exceptions import ParameterError
@@ -43,6 +45,177 @@ _MATERIAL_MODE = {
 }
 
 
+class ConversionPlan():
+    """
+    A unit conversion, resolved into a single multiplicative factor.
+
+    Plans are created through the :meth:`pressure`, :meth:`loading`
+    and :meth:`adsorbent` class methods, which check the units and
+    look up any adsorbate or material property only once.
+    Plans are cached, so that repeating a conversion, for example
+    on the data of many isotherms, only costs a multiplication.
+    Call the plan on a value or array to convert it.
+
+    Parameters
+    ----------
+    factor : float, optional
+        The factor by which values are multiplied. If ``None``,
+        values are returned unchanged.
+
+    Notes
+    -----
+    Cached plans assume that the properties of adsorbates and materials
+    do not change. If they are modified, clear the cache with
+    :meth:`cache_clear`. Plans which use calculated adsorbate properties
+    are kept separately for each CoolProp backend.
+    """
+
+    __slots__ = ('factor',)
+
+    #: Maximum number of plans kept in the cache.
+    cache_size = 512
+
+    _cache = collections.OrderedDict()
+
+    def __init__(self, factor=None):
+        """Store the factor."""
+        self.factor = factor
+
+    def __call__(self, value):
+        """Convert a value or array."""
+        if self.factor is None:
+            return value
+        return value * self.factor
+
+    def __mul__(self, other):
+        """Combine two conversions into one."""
+        if self.factor is None:
+            return other
+        if other.factor is None:
+            return self
+        return ConversionPlan(self.factor * other.factor)
+
+    def __repr__(self):
+        """Print the conversion factor."""
+        return "ConversionPlan({0})".format(self.factor)
+
+    @property
+    def identity(self):
+        """Whether the plan leaves values unchanged."""
+        return self.factor is None
+
+    @classmethod
+    def _cached(cls, key, build, *args):
+        """Return a plan from the cache, or build and cache it."""
+        try:
+            plan = cls._cache.get(key)
+        except TypeError:
+            # Unhashable arguments, such as an array of temperatures
+            return cls(build(*args))
+
+        if plan is None:
+            plan = cls(build(*args))
+            cls._cache[key] = plan
+            if len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        else:
+            cls._cache.move_to_end(key)
+
+        return plan
+
+    @classmethod
+    def cache_clear(cls):
+        """Empty the cache of conversion plans."""
+        cls._cache.clear()
+
+    @classmethod
+    def pressure(cls,
+                 mode_from, mode_to,
+                 unit_from, unit_to,
+                 adsorbate_name=None, temp=None):
+        """
+        Get the plan for a pressure conversion.
+
+        Parameters are the same as for :func:`c_pressure`.
+
+        Returns
+        -------
+        ConversionPlan
+            The conversion plan.
+
+        Raises
+        ------
+        ``ParameterError``
+            If the mode or units selected are not an option.
+        """
+        key = ('pressure', mode_from, mode_to, unit_from, unit_to)
+        if mode_from != mode_to:
+            key += (str(adsorbate_name), temp, pygaps.COOLPROP_BACKEND)
+
+        return cls._cached(key, _pressure_factor,
+                           mode_from, mode_to,
+                           unit_from, unit_to,
+                           adsorbate_name, temp)
+
+    @classmethod
+    def loading(cls,
+                basis_from, basis_to,
+                unit_from, unit_to,
+                adsorbate_name=None, temp=None):
+        """
+        Get the plan for a loading conversion.
+
+        Parameters are the same as for :func:`c_loading`.
+
+        Returns
+        -------
+        ConversionPlan
+            The conversion plan.
+
+        Raises
+        ------
+        ``ParameterError``
+            If the basis or units selected are not an option.
+        """
+        key = ('loading', basis_from, basis_to, unit_from, unit_to)
+        if basis_from != basis_to:
+            key += (str(adsorbate_name), temp, pygaps.COOLPROP_BACKEND)
+
+        return cls._cached(key, _loading_factor,
+                           basis_from, basis_to,
+                           unit_from, unit_to,
+                           adsorbate_name, temp)
+
+    @classmethod
+    def adsorbent(cls,
+                  basis_from, basis_to,
+                  unit_from, unit_to,
+                  material=None, material_batch=None):
+        """
+        Get the plan for an adsorbent conversion.
+
+        Parameters are the same as for :func:`c_adsorbent`.
+
+        Returns
+        -------
+        ConversionPlan
+            The conversion plan.
+
+        Raises
+        ------
+        ``ParameterError``
+            If the basis or units selected are not an option.
+        """
+        key = ('adsorbent', basis_from, basis_to, unit_from, unit_to)
+        if basis_from != basis_to:
+            key += (str(material), material_batch)
+
+        return cls._cached(key, _adsorbent_factor,
+                           basis_from, basis_to,
+                           unit_from, unit_to,
+                           material, material_batch)
+
+
 def c_pressure(value,
                mode_from, mode_to,
                unit_from, unit_to,
@@ -81,6 +254,14 @@ def c_pressure(value,
     ``ParameterError``
         If the mode selected is not an option.
     """
+    return ConversionPlan.pressure(
+        mode_from, mode_to, unit_from, unit_to, adsorbate_name, temp)(value)
+
+
+def _pressure_factor(mode_from, mode_to,
+                     unit_from, unit_to,
+                     adsorbate_name, temp):
+    """Calculate the factor of a pressure conversion, or None if not needed."""
     if mode_from != mode_to:
 
         if mode_to not in _PRESSURE_MODE:
@@ -102,14 +283,13 @@ def c_pressure(value,
             unit = unit_from
             sign = -1
 
-        value = value * \
-            pygaps.core.adsorbate.Adsorbate.find(adsorbate_name).saturation_pressure(
-                temp, unit=unit) ** sign
+        return pygaps.core.adsorbate.Adsorbate.find(adsorbate_name).saturation_pressure(
+            temp, unit=unit) ** sign
 
     elif unit_to and mode_from == 'absolute':
-        value = c_unit(_PRESSURE_MODE[mode_from], value, unit_from, unit_to)
+        return _unit_factor(_PRESSURE_MODE[mode_from], unit_from, unit_to)
 
-    return value
+    return None
 
 
 def c_loading(value,
@@ -150,66 +330,52 @@ def c_loading(value,
     ``ParameterError``
         If the mode selected is not an option.
     """
-    if basis_from != basis_to:
+    return ConversionPlan.loading(
+        basis_from, basis_to, unit_from, unit_to, adsorbate_name, temp)(value)
 
-        if basis_to not in _MATERIAL_MODE:
-            raise ParameterError(
-                "Basis selected for loading ({}) is not an option. Viable"
-                " modes are {}".format(basis_to, list(_MATERIAL_MODE)))
 
-        if not unit_to or not unit_from:
-            raise ParameterError("Specify both from and to units")
+def _loading_factor(basis_from, basis_to,
+                    unit_from, unit_to,
+                    adsorbate_name, temp):
+    """Calculate the factor of a loading conversion, or None if not needed."""
+    if basis_from != basis_to:
 
-        if unit_to not in _MATERIAL_MODE[basis_to]:
-            raise ParameterError(
-                "Unit to is not an option. Viable"
-                " units are {}".format(list(_MATERIAL_MODE[basis_to])))
+        _check_basis_units('loading', basis_from, basis_to, unit_from, unit_to)
 
-        if unit_from not in _MATERIAL_MODE[basis_from]:
-            raise ParameterError(
-                "Unit from is not an option. Viable"
-                " units are {}".format(list(_MATERIAL_MODE[basis_from])))
+        adsorbate = pygaps.core.adsorbate.Adsorbate.find(adsorbate_name)
 
         if basis_from == 'mass':
             if basis_to == 'volume':
-                constant = pygaps.core.adsorbate.Adsorbate.find(
-                    adsorbate_name).gas_density(temp=temp)
+                constant = adsorbate.gas_density(temp=temp)
                 sign = -1
             elif basis_to == 'molar':
-                constant = pygaps.core.adsorbate.Adsorbate.find(
-                    adsorbate_name).molar_mass()
+                constant = adsorbate.molar_mass()
                 sign = -1
         elif basis_from == 'volume':
             if basis_to == 'mass':
-                constant = pygaps.core.adsorbate.Adsorbate.find(
-                    adsorbate_name).gas_density(temp=temp)
+                constant = adsorbate.gas_density(temp=temp)
                 sign = 1
             elif basis_to == 'molar':
-                adsorbate = pygaps.core.adsorbate.Adsorbate.find(
-                    adsorbate_name)
                 constant = adsorbate.gas_density(
                     temp=temp) / adsorbate.molar_mass()
                 sign = -1
         elif basis_from == 'molar':
             if basis_to == 'mass':
-                constant = pygaps.core.adsorbate.Adsorbate.find(
-                    adsorbate_name).molar_mass()
+                constant = adsorbate.molar_mass()
                 sign = 1
             elif basis_to == 'volume':
-                adsorbate = pygaps.core.adsorbate.Adsorbate.find(
-                    adsorbate_name)
                 constant = adsorbate.gas_density(
                     temp=temp) / adsorbate.molar_mass()
                 sign = -1
 
-        value = value * _MATERIAL_MODE[basis_from][unit_from] \
+        return _MATERIAL_MODE[basis_from][unit_from] \
             * constant ** sign \
             / _MATERIAL_MODE[basis_to][unit_to]
 
     elif unit_to and unit_from != unit_to:
-        value = c_unit(_MATERIAL_MODE[basis_from], value, unit_from, unit_to)
+        return _unit_factor(_MATERIAL_MODE[basis_from], unit_from, unit_to)
 
-    return value
+    return None
 
 
 def c_adsorbent(value,
@@ -250,67 +416,73 @@ def c_adsorbent(value,
         If the mode selected is not an option.
 
     """
-    if basis_from != basis_to:
+    return ConversionPlan.adsorbent(
+        basis_from, basis_to, unit_from, unit_to, material, material_batch)(value)
 
-        if basis_to not in _MATERIAL_MODE:
-            raise ParameterError(
-                "Basis selected for adsorbent ({}) is not an option. Viable"
-                " modes are {}".format(basis_to, list(_MATERIAL_MODE)))
 
-        if not unit_to or not unit_from:
-            raise ParameterError("Specify both from and to units")
+def _adsorbent_factor(basis_from, basis_to,
+                      unit_from, unit_to,
+                      material, material_batch):
+    """Calculate the factor of an adsorbent conversion, or None if not needed."""
+    if basis_from != basis_to:
 
-        if unit_to not in _MATERIAL_MODE[basis_to]:
-            raise ParameterError(
-                "Unit to is not an option. Viable"
-                " units are {}".format(list(_MATERIAL_MODE[basis_to])))
+        _check_basis_units('adsorbent', basis_from, basis_to, unit_from, unit_to)
 
-        if unit_from not in _MATERIAL_MODE[basis_from]:
-            raise ParameterError(
-                "Unit from is not an option. Viable"
-                " units are {}".format(list(_MATERIAL_MODE[basis_from])))
+        material = pygaps.core.material.Material.find(material, material_batch)
 
         if basis_from == 'mass':
             if basis_to == 'volume':
-                constant = pygaps.core.material.Material.find(
-                    material, material_batch).get_prop('density')
+                constant = material.get_prop('density')
                 sign = -1
             elif basis_to == 'molar':
-                constant = pygaps.core.material.Material.find(
-                    material, material_batch).get_prop('molar_mass')
+                constant = material.get_prop('molar_mass')
                 sign = -1
         elif basis_from == 'volume':
             if basis_to == 'mass':
-                constant = pygaps.core.material.Material.find(
-                    material, material_batch).get_prop('density')
+                constant = material.get_prop('density')
                 sign = 1
             elif basis_to == 'molar':
-                material = pygaps.core.material.Material.find(
-                    material, material_batch)
                 constant = material.get_prop(
                     'density') / material.get_prop('molar_mass')
                 sign = -1
         elif basis_from == 'molar':
             if basis_to == 'mass':
-                constant = pygaps.core.material.Material.find(
-                    material, material_batch).get_prop('molar_mass')
+                constant = material.get_prop('molar_mass')
                 sign = 1
             elif basis_to == 'volume':
-                material = pygaps.core.material.Material.find(
-                    material, material_batch)
                 constant = material.get_prop(
                     'density') / material.get_prop('molar_mass')
                 sign = -1
 
-        value = value / _MATERIAL_MODE[basis_from][unit_from] \
-            / constant ** sign \
-            * _MATERIAL_MODE[basis_to][unit_to]
+        return _MATERIAL_MODE[basis_to][unit_to] \
+            / _MATERIAL_MODE[basis_from][unit_from] \
+            / constant ** sign
 
     elif unit_to and unit_from != unit_to:
-        value = c_unit(_MATERIAL_MODE[basis_from],
-                       value, unit_from, unit_to, sign=-1)
+        return _unit_factor(_MATERIAL_MODE[basis_from], unit_from, unit_to, sign=-1)
+
+    return None
 
-    return value
+
+def _check_basis_units(name, basis_from, basis_to, unit_from, unit_to):
+    """Check the basis and units of a loading or adsorbent conversion."""
+    if basis_to not in _MATERIAL_MODE:
+        raise ParameterError(
+            "Basis selected for {} ({}) is not an option. Viable"
+            " modes are {}".format(name, basis_to, list(_MATERIAL_MODE)))
+
+    if not unit_to or not unit_from:
+        raise ParameterError("Specify both from and to units")
+
+    if unit_to not in _MATERIAL_MODE[basis_to]:
+        raise ParameterError(
+            "Unit to is not an option. Viable"
+            " units are {}".format(list(_MATERIAL_MODE[basis_to])))
+
+    if unit_from not in _MATERIAL_MODE[basis_from]:
+        raise ParameterError(
+            "Unit from is not an option. Viable"
+            " units are {}".format(list(_MATERIAL_MODE[basis_from])))
 
 
 def c_unit(unit_list, value, unit_from, unit_to, sign=1):
@@ -340,15 +512,17 @@ def c_unit(unit_list, value, unit_from, unit_to, sign=1):
     ``ParameterError``
         If the unit selected is not an option.
     """
+    return value * _unit_factor(unit_list, unit_from, unit_to, sign)
+
+
+def _unit_factor(unit_list, unit_from, unit_to, sign=1):
+    """Calculate the factor between two units of a dictionary."""
     if unit_to not in unit_list or unit_from not in unit_list:
         raise ParameterError(
             "Units selected for conversion (from {} to {}) are not an option. Viable"
             " units are {}".format(unit_from, unit_to, unit_list.keys()))
 
-    value = value * \
-        (unit_list[unit_from] / unit_list[unit_to]) ** sign
-
-    return value
+    return (unit_list[unit_from] / unit_list[unit_to]) ** sign
 
 
 def find_basis(unit):
@@ -69,3 +69,44 @@ class TestAreaBET():
         filepath = os.path.join(DATA_N77_PATH, sample['file'])
         isotherm = pygaps.isotherm_from_jsonf(filepath)
         pygaps.area_BET(isotherm, verbose=True)
+
+    def test_area_BET_full_search(self):
+        """Test the search of all regions on an ideal BET isotherm."""
+        import numpy
+        import scipy.stats
+        from pygaps.characterisation.area_bet import bet_optimal_region
+        from pygaps.characterisation.area_bet import bet_transform
+
+        n_monolayer, c_const = 0.01, 100
+        pressure = numpy.linspace(0.01, 0.6, 60)
+        loading = n_monolayer * c_const * pressure / \
+            ((1 - pressure) * (1 - pressure + c_const * pressure))
+
+        minimum, maximum, scores = bet_optimal_region(pressure, loading)
+        assert scores.shape == (60, 60)
+        assert numpy.isnan(scores[numpy.tril_indices(60, 1)]).all()
+
+        # Scores are the correlation of each region
+        starts, ends = numpy.nonzero(~numpy.isnan(scores))
+        for start, end in zip(starts[:10], ends[:10]):
+            fit = scipy.stats.linregress(
+                pressure[start:end], bet_transform(pressure[start:end], loading[start:end]))
+            assert isclose(scores[start, end], fit.rvalue)
+
+        (_, c_fit, n_fit, _, _, _, raw_min, raw_max, _) = pygaps.area_BET_raw(
+            pressure, loading, 0.162, full_search=True)
+        assert (raw_min, raw_max) == (minimum, maximum)
+        assert isclose(n_fit, n_monolayer)
+        assert isclose(c_fit, c_const)
+
+    def test_area_BET_full_search_isotherm(self):
+        """Test the search of all regions on a real isotherm."""
+        sample = DATA['MCM-41']
+        filepath = os.path.join(DATA_N77_PATH, sample['file'])
+        isotherm = pygaps.isotherm_from_jsonf(filepath)
+
+        results = pygaps.area_BET(isotherm, full_search=True)
+        minimum, maximum = results['limits']
+        assert isclose(results['region_scores'][minimum, maximum], results['corr_coef'])
+        assert results['c_const'] > 0
+        assert isclose(results['area'], sample['bet_area'], 0.2, 0.1)
@@ -0,0 +1,75 @@
+"""
+This test module has tests relating to batch characterisation.
+
+All functions in /batch.py are tested here.
+The purposes are:
+
+    - testing that results match the individual functions
+    - testing error isolation and the process pool.
+"""
+
+import os
+
+import pytest
+from numpy import isclose
+
+import pygaps
+
+from .conftest import DATA
+from .conftest import DATA_N77_PATH
+
+
+def failing_method(isotherm):
+    """Characterisation which always fails."""
+    raise pygaps.CalculationError("Failed on purpose.")
+
+
+@pytest.fixture(scope='module')
+def bet_isotherms():
+    """Load the isotherms with a BET area."""
+    return [
+        pygaps.isotherm_from_jsonf(os.path.join(DATA_N77_PATH, sample['file']))
+        for sample in DATA.values() if sample.get('bet_area', None)
+    ]
+
+
+@pytest.mark.characterisation
+class TestBatch():
+    """Tests characterisation of many isotherms."""
+
+    @pytest.mark.parametrize('n_jobs', [None, 2])
+    def test_characterise(self, bet_isotherms, n_jobs):
+        """Results are the same as from the individual functions."""
+        results = pygaps.batch.characterise(
+            bet_isotherms,
+            methods=['area_BET', failing_method],
+            n_jobs=n_jobs,
+            chunksize=2,
+        )
+
+        assert len(results) == 2 * len(bet_isotherms)
+        assert (results.time >= 0).all()
+
+        bet = results[results.method == 'area_BET']
+        assert list(bet.isotherm) == list(range(len(bet_isotherms)))
+        assert bet.error.isnull().all()
+        for isotherm, area in zip(bet_isotherms, bet.area):
+            assert isclose(area, pygaps.area_BET(isotherm)['area'])
+
+        failed = results[results.method == 'failing_method']
+        assert all(isinstance(error, pygaps.CalculationError) for error in failed.error)
+        assert failed.result.isnull().all()
+
+    def test_characterise_labels(self, bet_isotherms):
+        """The same method can be applied with different parameters."""
+        results = pygaps.batch.characterise(
+            bet_isotherms[:1],
+            methods={
+                'default': 'area_BET',
+                'limited': ('area_BET', {'limits': [0.05, 0.30]}),
+            },
+        )
+        assert list(results.method) == ['default', 'limited']
+
+        with pytest.raises(pygaps.ParameterError):
+            pygaps.batch.characterise(bet_isotherms, methods=['unknown'])
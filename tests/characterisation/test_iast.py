@@ -96,6 +96,61 @@ class TestIAST():
         pygaps.iast(load_iast, [0.5, 0.5], 1, verbose=True)
 
 
+@pytest.mark.modelling
+class TestIASTBatch():
+    """Test batched IAST calculations."""
+
+    def test_iast_batch_checks(self, load_iast):
+        """Checks for built-in safeguards."""
+
+        ch4, c2h6 = load_iast
+
+        # Raises "not enough components error"
+        with pytest.raises(pygaps.ParameterError):
+            pygaps.iast_batch([ch4], [[1]], [1])
+
+        # Raises "different dimensions of arrays"
+        with pytest.raises(pygaps.ParameterError):
+            pygaps.iast_batch([ch4, c2h6], [[0.1, 0.4, 0.5]], [1])
+
+        # Raises "fractions do not add up to 1"
+        with pytest.raises(pygaps.ParameterError):
+            pygaps.iast_batch([ch4, c2h6], [[0.1, 0.4]], [1])
+
+    @pytest.mark.parametrize('use_models', [False, True])
+    def test_iast_batch(self, load_iast, load_iast_models, use_models):
+        """Test against the single composition calculation."""
+
+        isotherms = load_iast_models if use_models else load_iast
+
+        fractions = numpy.linspace(0.1, 0.9, 5)
+        gas_fractions = numpy.column_stack([fractions, 1 - fractions])
+        pressures = numpy.linspace(0.5, 5, 5)
+
+        loadings, converged = pygaps.iast_batch(
+            isotherms, gas_fractions, pressures, warningoff=True)
+
+        assert loadings.shape == (5, 2)
+        assert converged.all()
+
+        for index, gas_fraction in enumerate(gas_fractions):
+            expected = pygaps.iast(
+                isotherms, gas_fraction, pressures[index], warningoff=True)
+            assert numpy.allclose(loadings[index], expected, rtol=1e-5)
+
+    def test_iast_batch_failed(self, load_iast):
+        """Test that rows which cannot be solved are flagged."""
+
+        gas_fractions = [[0.5, 0.5], [0.5, 0.5]]
+        pressures = [1, 1000]
+
+        loadings, converged = pygaps.iast_batch(
+            load_iast, gas_fractions, pressures, warningoff=True)
+
+        assert list(converged) == [True, False]
+        assert numpy.isnan(loadings[1]).all()
+
+
 @pytest.mark.modelling
 class TestReverseIAST():
     """Test reverse IAST calculations."""
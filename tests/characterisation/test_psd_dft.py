@@ -50,7 +50,7 @@ class TestPSDDFT():
         """Test psd calculation with several model isotherms"""
         sample = DATA[sample]
         # exclude datasets where it is not applicable
-        if sample.get('psd_dft_pore_volume', None):
+        if sample.get('psd_dft_pore_size', None):
 
             filepath = os.path.join(DATA_N77_PATH, sample['file'])
             isotherm = pygaps.isotherm_from_jsonf(filepath)
@@ -65,9 +65,22 @@ class TestPSDDFT():
 
             assert np.isclose(
                 principal_peak,
-                sample['psd_micro_pore_size'],
+                sample['psd_dft_pore_size'],
                 err_relative, err_absolute)
 
+    def test_psd_dft_end_to_end(self):
+        """Test a full calculation with the bundled kernel."""
+        data = DATA['MCM-41']
+        filepath = os.path.join(DATA_N77_PATH, data['file'])
+        isotherm = pygaps.isotherm_from_jsonf(filepath)
+
+        pdft._LOADED.clear()
+        result_dict = pdft.psd_dft(isotherm, kernel='DFT-N2-77K-carbon-slit')
+
+        assert len(result_dict['pore_widths']) == len(result_dict['pore_distribution'])
+        assert np.all(np.isfinite(result_dict['pore_distribution']))
+        assert result_dict['pore_volume_cumulative'][-1] > 0
+
     @cleanup
     def test_psd_dft_verbose(self):
         """Test verbosity."""
@@ -75,3 +88,194 @@ class TestPSDDFT():
         filepath = os.path.join(DATA_N77_PATH, data['file'])
         isotherm = pygaps.isotherm_from_jsonf(filepath)
         pygaps.psd_dft(isotherm, verbose=True)
+
+    @staticmethod
+    def _kernel_fit_data():
+        """Return the MCM-41 adsorption branch and the points of the carbon kernel."""
+        data = DATA['MCM-41']
+        filepath = os.path.join(DATA_N77_PATH, data['file'])
+        isotherm = pygaps.isotherm_from_jsonf(filepath)
+        pressure = isotherm.pressure(branch='ads', pressure_mode='relative')
+        loading = isotherm.loading(branch='ads', loading_unit='mmol', loading_basis='molar')
+
+        kernel = pdft._load_kernel(pdft._KERNELS['DFT-N2-77K-carbon-slit'])
+        kernel_points = pdft._kernel_points(kernel, pressure)
+        return pressure, loading, kernel_points
+
+    @staticmethod
+    def _slsqp_fit(kernel_points, loading):
+        """Fit the kernel with a generic constrained minimisation."""
+        import scipy.optimize
+
+        def sum_squares(contributions):
+            return np.square(np.dot(kernel_points, contributions) - loading).sum()
+
+        return scipy.optimize.minimize(
+            sum_squares, np.zeros(kernel_points.shape[1]), method='SLSQP',
+            bounds=[(0, None)] * kernel_points.shape[1], options={'ftol': 1e-04}).x
+
+    def test_psd_dft_kernel_fit_nnls(self):
+        """The NNLS fit is at least as good as a generic constrained minimisation."""
+        pressure, loading, kernel_points = self._kernel_fit_data()
+        kernel = pdft._load_kernel(pdft._KERNELS['DFT-N2-77K-carbon-slit'])
+        assert kernel_points.shape == (len(pressure), len(kernel['pore_widths']))
+
+        def sum_squares(contributions):
+            return np.square(np.dot(kernel_points, contributions) - loading).sum()
+
+        reference = self._slsqp_fit(kernel_points, loading)
+        contributions = pdft._kernel_nnls(kernel_points, loading)
+
+        assert np.all(contributions >= 0)
+        assert sum_squares(contributions) <= sum_squares(reference) * (1 + 1e-6)
+
+        # regularisation shrinks the contributions
+        regularised = pdft._kernel_nnls(kernel_points, loading, regularisation=1)
+        assert np.linalg.norm(regularised) < np.linalg.norm(contributions)
+
+        with pytest.raises(pygaps.ParameterError):
+            pdft.psd_dft_kernel_fit(pressure, loading, pdft._KERNELS['DFT-N2-77K-carbon-slit'],
+                                    regularisation=-1)
+
+    @pytest.mark.benchmark
+    def test_psd_dft_kernel_fit_nnls_benchmark(self):
+        """Benchmark the NNLS fit against a generic constrained minimisation."""
+        import time
+
+        pressure, loading, kernel_points = self._kernel_fit_data()
+
+        start = time.perf_counter()
+        self._slsqp_fit(kernel_points, loading)
+        time_slsqp = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pdft._kernel_nnls(kernel_points, loading)
+        time_nnls = time.perf_counter() - start
+
+        assert time_nnls < time_slsqp
+
+    def test_psd_dft_compiled_kernel(self, tmpdir):
+        """Compiled kernels are memory-mapped and give the same results."""
+        import scipy.interpolate
+
+        csv_path = pdft._KERNELS['DFT-N2-77K-carbon-slit']
+        path = pdft.compile_kernel(
+            csv_path, str(tmpdir.join('kernel.npy')),
+            adsorbate='nitrogen', temperature=77, pore_geometry='slit')
+        assert os.path.exists(str(tmpdir.join('kernel.json')))
+
+        kernel = pdft._load_kernel(path)
+        assert isinstance(kernel['loading'], np.memmap)
+        assert kernel['adsorbate'] == 'nitrogen'
+        assert kernel['pore_geometry'] == 'slit'
+
+        # same interpolation as a cubic interpolator per pore width
+        pressure = np.linspace(1e-6, 0.9, 50)
+        reference = scipy.interpolate.interp1d(
+            kernel['pressure'], kernel['loading'], kind='cubic', axis=0)
+        assert np.allclose(pdft._kernel_points(kernel, pressure), reference(pressure))
+
+        with pytest.raises(pygaps.CalculationError):
+            pdft._kernel_points(kernel, [2])
+
+        # use the compiled kernel by name
+        pdft.register_kernel('test-kernel', path)
+        try:
+            data = DATA['MCM-41']
+            isotherm = pygaps.isotherm_from_jsonf(os.path.join(DATA_N77_PATH, data['file']))
+            result = pdft.psd_dft(isotherm, kernel='test-kernel')
+            expected = pdft.psd_dft(isotherm, kernel='DFT-N2-77K-carbon-slit')
+            assert np.allclose(result['pore_distribution'], expected['pore_distribution'])
+        finally:
+            del pdft._KERNELS['test-kernel']
+
+    def test_psd_dft_kernel_cache(self, tmpdir, monkeypatch):
+        """CSV kernels are only compiled to a cache private to the user."""
+        csv_path = pdft._KERNELS['DFT-N2-77K-carbon-slit']
+        cache = str(tmpdir.join('cache'))
+        monkeypatch.setattr(pdft, 'KERNEL_CACHE', cache)
+        monkeypatch.setattr(pdft, '_LOADED', {})
+
+        kernel = pdft._load_kernel(csv_path)
+        assert isinstance(kernel['loading'], np.memmap)
+        assert os.stat(cache).st_mode & 0o777 == 0o700
+        assert os.path.exists(pdft._compiled_path(csv_path))
+
+        # a cache which other users can write to is not used
+        if hasattr(os, 'getuid'):
+            pdft._LOADED.clear()
+            os.remove(pdft._compiled_path(csv_path))
+            os.chmod(cache, 0o777)
+            kernel = pdft._load_kernel(csv_path)
+            assert not isinstance(kernel['loading'], np.memmap)
+            assert not os.path.exists(pdft._compiled_path(csv_path))
+
+    @pytest.mark.parametrize('n_jobs', [None, 2])
+    def test_psd_dft_batch(self, n_jobs):
+        """Batch fits give the same distributions as single fits."""
+        isotherms = [
+            pygaps.isotherm_from_jsonf(os.path.join(DATA_N77_PATH, sample['file']))
+            for sample in DATA.values() if sample.get('psd_dft_pore_size', None)
+        ]
+        isotherms.append(isotherms[0])
+
+        result = pdft.psd_dft_batch(isotherms, n_jobs=n_jobs)
+        assert result['pore_distribution'].shape == (len(isotherms), len(result['pore_widths']))
+        assert result['pore_volume_cumulative'].shape == result['pore_distribution'].shape
+        assert np.allclose(result['pore_distribution'][0], result['pore_distribution'][-1])
+
+        for isotherm, dist in zip(isotherms, result['pore_distribution']):
+            expected = pdft.psd_dft(isotherm)
+            assert np.allclose(result['pore_widths'], expected['pore_widths'])
+            assert np.isclose(
+                result['pore_widths'][np.argmax(dist)],
+                expected['pore_widths'][np.argmax(expected['pore_distribution'])],
+                0.05, 0.01)
+
+    def test_psd_dft_batch_grid(self):
+        """Isotherms can be resampled on a common pressure grid."""
+        data = DATA['MCM-41']
+        isotherm = pygaps.isotherm_from_jsonf(os.path.join(DATA_N77_PATH, data['file']))
+        pressure = isotherm.pressure(branch='ads', pressure_mode='relative')
+
+        result = pdft.psd_dft_batch([isotherm, isotherm], pressure_grid=pressure[1:-1])
+        assert np.allclose(result['pore_distribution'][0], result['pore_distribution'][1])
+
+        with pytest.raises(pygaps.CalculationError):
+            pdft.psd_dft_batch([isotherm], pressure_grid=[0, 2])
+
+    @pytest.mark.parametrize('criterion', ['gcv', 'lcurve'])
+    def test_psd_dft_regularisation_scan(self, criterion):
+        """The scores of the scan match separate regularised fits."""
+        data = DATA['MCM-41']
+        isotherm = pygaps.isotherm_from_jsonf(os.path.join(DATA_N77_PATH, data['file']))
+        pressure = isotherm.pressure(branch='ads', pressure_mode='relative')
+        loading = isotherm.loading(branch='ads', loading_unit='mmol', loading_basis='molar')
+        kernel_path = pdft._KERNELS['DFT-N2-77K-carbon-slit']
+
+        result = pdft.psd_dft_regularisation_scan(pressure, loading, kernel_path, criterion=criterion)
+        assert result['regularisation'] in result['regularisations']
+        assert np.all(np.diff(result['residual_norm']) >= -1e-10)
+        assert np.all(np.diff(result['solution_norm']) <= 1e-10)
+
+        kernel_points = pdft._kernel_points(pdft._load_kernel(kernel_path), pressure)
+        size = kernel_points.shape[1]
+        for position in [0, 30, 60]:
+            strength = result['regularisations'][position]
+            solution = np.linalg.lstsq(
+                np.vstack([kernel_points, strength * np.identity(size)]),
+                np.concatenate([loading, np.zeros(size)]), rcond=None)[0]
+            assert np.isclose(np.linalg.norm(np.dot(kernel_points, solution) - loading),
+                              result['residual_norm'][position], rtol=1e-4)
+            assert np.isclose(np.linalg.norm(solution),
+                              result['solution_norm'][position], rtol=1e-4)
+
+        # the chosen strength is used by the fitting functions
+        widths, dist, _ = pdft.psd_dft_kernel_fit(pressure, loading, kernel_path, regularisation=criterion)
+        assert np.allclose(dist, result['pore_distribution'])
+        pdft.psd_dft(isotherm, regularisation=criterion)
+
+        with pytest.raises(pygaps.ParameterError):
+            pdft.psd_dft_regularisation_scan(pressure, loading, kernel_path, criterion='test')
+        with pytest.raises(pygaps.ParameterError):
+            pdft.psd_dft(isotherm, regularisation='test')
@@ -89,3 +89,89 @@ class TestPSDMeso():
         filepath = os.path.join(DATA_N77_PATH, data['file'])
         isotherm = pygaps.isotherm_from_jsonf(filepath)
         pygaps.psd_mesoporous(isotherm, verbose=True)
+
+    @pytest.mark.parametrize('method', [
+        'pygaps-DH',
+        'BJH',
+        'DH',
+    ])
+    def test_psd_meso_batch(self, method):
+        """Batch distributions are the same as single ones."""
+        isotherms = [
+            pygaps.isotherm_from_jsonf(os.path.join(DATA_N77_PATH, sample['file']))
+            for sample in DATA.values() if sample.get('psd_meso_pore_size', None)
+        ]
+        pressure = isotherms[0].pressure(branch='des', pressure_mode='relative')
+
+        result = pmes.psd_mesoporous_batch(
+            isotherms[:1] * 2, psd_model=method)
+        expected = pmes.psd_mesoporous(isotherms[0], psd_model=method)
+        for key in expected:
+            assert result[key].shape == (2, len(expected[key]))
+            assert np.allclose(result[key], expected[key])
+
+        # resampled on a common grid, within the range of all isotherms
+        ranges = [iso.pressure(branch='des', pressure_mode='relative') for iso in isotherms]
+        grid = np.linspace(max(min(p) for p in ranges), min(max(p) for p in ranges), 50)
+        result = pmes.psd_mesoporous_batch(isotherms, pressure_grid=grid, psd_model=method)
+        assert result['pore_distribution'].shape == (len(isotherms), len(grid) - 1)
+
+        with pytest.raises(pygaps.CalculationError):
+            pmes.psd_mesoporous_batch(isotherms, pressure_grid=[0, 2], psd_model=method)
+        if len(isotherms) > 1 and not all(
+                np.array_equal(iso.pressure(branch='des', pressure_mode='relative'), pressure)
+                for iso in isotherms):
+            with pytest.raises(pygaps.ParameterError):
+                pmes.psd_mesoporous_batch(isotherms, psd_model=method)
+
+    @staticmethod
+    def _scaled_isotherms(number):
+        """Build many isotherms with the pressures of MCM-41 and scaled loadings."""
+        data = DATA['MCM-41']
+        reference = pygaps.isotherm_from_jsonf(os.path.join(DATA_N77_PATH, data['file']))
+        pressure = reference.pressure(branch='des', pressure_mode='relative')
+        loading = reference.loading(branch='des', loading_unit='mmol', loading_basis='molar')
+
+        scales = np.random.RandomState(0).uniform(0.5, 2, number)
+        return pygaps.PointIsotherm.from_arrays_batch(
+            np.tile(pressure, (len(scales), 1)), np.outer(scales, loading),
+            branch='des', storage='numpy',
+            material=reference.material, adsorbate=str(reference.adsorbate),
+            temperature=reference.temperature,
+            pressure_mode='relative', loading_basis='molar', loading_unit='mmol',
+            adsorbent_basis='mass', adsorbent_unit='g')
+
+    def test_psd_meso_batch_many(self):
+        """Batch distributions of many isotherms are the same as single ones."""
+        isotherms = self._scaled_isotherms(20)
+        pressure = isotherms[0].pressure(branch='des', pressure_mode='relative')
+
+        result = pmes.psd_mesoporous_batch(isotherms)
+        assert result['pore_distribution'].shape == (len(isotherms), len(pressure) - 1)
+        for index in (0, 19):
+            single = pmes.psd_mesoporous(isotherms[index])
+            assert np.allclose(result['pore_distribution'][index], single['pore_distribution'])
+
+    @pytest.mark.benchmark
+    def test_psd_meso_batch_benchmark(self):
+        """Benchmark the batch calculation on 10000 isotherms against single calls."""
+        import time
+
+        isotherms = self._scaled_isotherms(10000)
+        pressure = isotherms[0].pressure(branch='des', pressure_mode='relative')
+
+        # the first calculation loads CoolProp and the adsorbate state
+        pmes.psd_mesoporous(isotherms[0])
+
+        start = time.perf_counter()
+        result = pmes.psd_mesoporous_batch(isotherms)
+        time_batch = (time.perf_counter() - start) / len(isotherms)
+
+        start = time.perf_counter()
+        for isotherm in isotherms[:100]:
+            single = pmes.psd_mesoporous(isotherm)
+        time_single = (time.perf_counter() - start) / 100
+
+        assert result['pore_distribution'].shape == (len(isotherms), len(pressure) - 1)
+        assert np.allclose(result['pore_distribution'][99], single['pore_distribution'])
+        assert time_batch < time_single
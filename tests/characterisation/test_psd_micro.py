@@ -83,3 +83,21 @@ class TestPSDMicro():
         filepath = os.path.join(DATA_N77_PATH, data['file'])
         isotherm = pygaps.isotherm_from_jsonf(filepath)
         pygaps.psd_microporous(isotherm, verbose=True)
+
+    def test_psd_horvath_kawazoe_inversion(self):
+        """Test the tabulated HK model is inverted correctly."""
+        adsorbent = pygaps.characterisation.models_hk.PROPERTIES_CARBON
+        parameters = (0.3, adsorbent['molecular_diameter'],
+                      1.76e-30, adsorbent['polarizability'] * 1e-27,
+                      3.6e-35, adsorbent['magnetic_susceptibility'] * 1e-27,
+                      6.7e18, adsorbent['surface_density'], 77)
+
+        table = pmic._hk_slit_table(*parameters)
+        assert pmic._hk_slit_table(*parameters) is table
+
+        pressure = np.logspace(-7, -0.01, 100)
+        l_pore = pmic._hk_slit_invert(pressure, table)
+        ln_pressure = pmic._hk_slit_pressure(l_pore, table)[0]
+
+        assert np.all(np.diff(l_pore) > 0)
+        assert np.allclose(ln_pressure, np.log(pressure), rtol=1e-8, atol=1e-10)
@@ -2,6 +2,7 @@
 
 import warnings
 
+import numpy
 import pytest
 
 import pygaps
@@ -47,6 +48,17 @@ class TestAdsorbate():
         with pytest.raises(pygaps.ParameterError):
             pygaps.Adsorbate.find('noname')
 
+    def test_adsorbate_find_registry(self):
+        """Check the lookup index follows changes to the master list."""
+        ads = pygaps.Adsorbate(name='Registered', alias=['reg1'])
+        pygaps.ADSORBATE_LIST.append(ads)
+        assert pygaps.Adsorbate.find('REG1') is ads
+        assert pygaps.Adsorbate.find('registered') is ads
+
+        pygaps.ADSORBATE_LIST.remove(ads)
+        with pytest.raises(pygaps.ParameterError):
+            pygaps.Adsorbate.find('reg1')
+
     def test_adsorbate_find_equals(self):
         """Check standard adsorbates can be found."""
         ads = pygaps.Adsorbate.find('N2')
@@ -102,6 +114,34 @@ class TestAdsorbate():
             with pytest.raises(error):
                 ads.enthalpy_liquefaction(temp, calculate=calculated)
 
+    def test_adsorbate_property_cache(self, basic_adsorbate):
+        """Check calculated properties are cached and can be vectorized."""
+        temp = 77.355
+        first = basic_adsorbate.saturation_pressure(temp)
+        assert basic_adsorbate.saturation_pressure(temp) == first
+        info = basic_adsorbate.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+        assert info.currsize == 1
+
+        values = basic_adsorbate.saturation_pressure(numpy.array([temp, temp + 1]), unit='bar')
+        assert values.shape == (2,)
+        assert values[0] == pytest.approx(first / 1e5)
+        assert basic_adsorbate.cache_info().hits == 2
+
+        # Switching the backend empties the cache
+        pygaps.backend_use_refprop()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                basic_adsorbate.saturation_pressure(temp)
+            assert basic_adsorbate.cache_info().currsize == 0
+        finally:
+            pygaps.backend_use_coolprop()
+
+        basic_adsorbate.cache_clear()
+        assert basic_adsorbate.cache_info() == (0, 0, basic_adsorbate.cache_size, 0)
+
     def test_adsorbate_print(self, basic_adsorbate):
         """Check printing is possible."""
         print(basic_adsorbate)
@@ -0,0 +1,64 @@
+"""Tests relating to the package import."""
+
+import subprocess
+import sys
+
+import pytest
+
+#: Modules which are slow to import, and only imported on first use.
+DEFERRED_MODULES = ('CoolProp', 'matplotlib', 'xlrd', 'xlwt', 'requests')
+
+IMPORT_SCRIPT = """
+import sys
+import pygaps
+print(','.join(m for m in {0} if m in sys.modules))
+print(pygaps.ADSORBATE_LIST.loaded or pygaps.MATERIAL_LIST.loaded)
+""".format(DEFERRED_MODULES)
+
+#: Maximum time in seconds that ``import pygaps`` should take.
+IMPORT_TIME_BUDGET = 2.0
+
+IMPORT_TIME_SCRIPT = """
+import time
+start = time.perf_counter()
+import pygaps
+print(time.perf_counter() - start)
+"""
+
+
+@pytest.mark.core
+class TestImport():
+    """Test that importing the package is cheap."""
+
+    def test_import_lazy(self):
+        """Check the import is lazy, in a fresh interpreter."""
+        output = subprocess.check_output(
+            [sys.executable, '-c', IMPORT_SCRIPT],
+            universal_newlines=True,
+        ).splitlines()
+
+        assert output[0] == ''
+        assert output[1] == 'False'
+
+    @pytest.mark.benchmark
+    def test_import_time(self):
+        """Check the import is within budget, in a fresh interpreter."""
+        output = subprocess.check_output(
+            [sys.executable, '-c', IMPORT_TIME_SCRIPT],
+            universal_newlines=True,
+        )
+
+        assert float(output) < IMPORT_TIME_BUDGET
+
+    def test_lazy_access(self):
+        """Lazy objects are loaded on first use."""
+        import pygaps
+
+        assert len(pygaps.ADSORBATE_LIST) > 0
+        assert pygaps.ADSORBATE_LIST.loaded
+        assert pygaps.ADSORBATE_LIST is pygaps.data.ADSORBATE_LIST
+        assert 'nitrogen' in pygaps.ADSORBATE_NAME_LIST
+        assert callable(pygaps.plot_iso)
+        assert 'isotherm_to_xl' in dir(pygaps)
+        with pytest.raises(AttributeError):
+            pygaps.not_a_function
@@ -147,6 +147,39 @@ class TestModelIsotherm():
             pygaps.ModelIsotherm.from_pointisotherm(
                 isotherm, guess_model=['Henry', 'DummyModel'], verbose=True)
 
+    def test_isotherm_guess_parallel(self):
+        """Check models can be guessed in parallel, with a table of attempts."""
+
+        filepath = os.path.join(DATA_N77_PATH, list(DATA.values())[0]['file'])
+        isotherm = pygaps.isotherm_from_jsonf(filepath)
+        guess_params = dict(
+            isotherm_data=isotherm.data(branch='ads'),
+            pressure_key=isotherm.pressure_key,
+            loading_key=isotherm.loading_key,
+            models=['Henry', 'Langmuir', 'BET'],
+            return_attempts=True,
+            **isotherm.to_dict()
+        )
+
+        # the adsorbate has a CoolProp state, which cannot be sent to other processes
+        isotherm.adsorbate.backend
+        assert isotherm.adsorbate._state is not None
+
+        best, attempts = pygaps.ModelIsotherm.guess(**guess_params)
+        best_parallel, attempts_parallel = pygaps.ModelIsotherm.guess(n_jobs=2, **guess_params)
+
+        assert best.model.name == best_parallel.model.name == attempts['model'][0]
+        assert list(attempts['model']) == list(attempts_parallel['model'])
+        assert numpy.allclose(attempts['rmse'], attempts_parallel['rmse'], equal_nan=True)
+
+        # stops at the first model under the threshold
+        best, attempts = pygaps.ModelIsotherm.guess(rmse_threshold=numpy.inf, **guess_params)
+        assert len(attempts) == 1
+        assert best.model.name == 'Henry'
+        best, attempts = pygaps.ModelIsotherm.guess(rmse_threshold=numpy.inf, n_jobs=2, **guess_params)
+        assert len(attempts) == 1
+        assert best.model.name == 'Henry'
+
     def test_isotherm_ret_pressure(self, basic_modelisotherm, use_adsorbate):
         """Check that all the functions in ModelIsotherm return their specified parameter."""
 
@@ -106,6 +106,132 @@ class TestPointIsotherm():
         isotherm.temperature = 0
         assert isotherm != basic_pointisotherm
 
+    def test_isotherm_storage(self, isotherm_parameters, isotherm_data, basic_pointisotherm):
+        "Checks the numpy storage behaves as the pandas one"
+
+        isotherm = pygaps.PointIsotherm(
+            isotherm_data=isotherm_data,
+            loading_key='loading',
+            pressure_key='pressure',
+            other_keys=['enthalpy'],
+            branch=[False, True, False, False, False, False, True, True],
+            storage='numpy',
+            **isotherm_parameters
+        )
+        reference = pygaps.PointIsotherm(
+            isotherm_data=isotherm_data,
+            loading_key='loading',
+            pressure_key='pressure',
+            other_keys=['enthalpy'],
+            branch=[False, True, False, False, False, False, True, True],
+            **isotherm_parameters
+        )
+        assert isotherm.storage == 'numpy'
+        assert isotherm == reference
+        assert isotherm.raw_data.equals(reference.raw_data)
+        for branch in [None, 'ads', 'des']:
+            assert isotherm.data(branch=branch).equals(reference.data(branch=branch))
+            assert numpy.array_equal(isotherm.pressure(branch=branch), reference.pressure(branch=branch))
+            assert numpy.array_equal(isotherm.other_data('enthalpy', branch=branch),
+                                     reference.other_data('enthalpy', branch=branch))
+            assert isotherm.loading(branch=branch, indexed=True).equals(
+                reference.loading(branch=branch, indexed=True))
+
+        # the numpy storage uses less memory
+        assert isotherm._points.nbytes < reference.raw_data.memory_usage(deep=True).sum()
+
+        isotherm.convert_loading(unit_to='mol')
+        reference.convert_loading(unit_to='mol')
+        assert numpy.allclose(isotherm.loading(branch='ads'), reference.loading(branch='ads'))
+
+    @pytest.mark.benchmark
+    def test_isotherm_storage_benchmark(self, isotherm_parameters):
+        "Compares the branch access time of the two storages"
+        import time
+
+        pressure = numpy.concatenate([numpy.linspace(0.01, 1, 100), numpy.linspace(0.99, 0.01, 99)])
+        isotherms = {
+            storage: pygaps.PointIsotherm(
+                pressure=pressure, loading=pressure * 2,
+                storage=storage, **isotherm_parameters)
+            for storage in ['pandas', 'numpy']
+        }
+
+        timings = {}
+        for storage, isotherm in isotherms.items():
+            start = time.perf_counter()
+            for _ in range(1000):
+                isotherm._column('pressure', 'des')
+            timings[storage] = time.perf_counter() - start
+        assert timings['numpy'] < timings['pandas']
+
+    @pytest.mark.parametrize('storage', ['pandas', 'numpy'])
+    def test_isotherm_create_batch(self, isotherm_parameters, storage):
+        "Checks isotherms created in bulk are the same as created one by one"
+
+        pressures = [
+            [1.0, 2.0, 3.0, 4.0, 5.0, 3.0, 2.0],
+            [1.0, 2.0, 3.0],
+            [5.0, 4.0, 3.0, 2.0],
+            [1.0, 2.0, 1.5, 1.0],
+        ]
+        loadings = [[value * 2 for value in pressure] for pressure in pressures]
+        parameters = [{}, {}, {'temperature': 87}, {}]
+
+        isotherms = pygaps.PointIsotherm.from_arrays_batch(
+            pressures, loadings, storage=storage,
+            parameters=parameters, **isotherm_parameters)
+
+        assert len(isotherms) == len(pressures)
+        for isotherm, pressure, loading, params in zip(isotherms, pressures, loadings, parameters):
+            reference = pygaps.PointIsotherm(
+                pressure=pressure, loading=loading,
+                **dict(isotherm_parameters, **params))
+            assert isotherm.storage == storage
+            assert isotherm.raw_data.equals(reference.raw_data)
+            assert isotherm.to_dict() == reference.to_dict()
+            assert isotherm == reference
+
+        # Stacked arrays, with other data and explicit branches
+        pressure = numpy.array([[1.0, 2.0, 3.0, 2.0], [2.0, 4.0, 6.0, 4.0]])
+        isotherms = pygaps.PointIsotherm.from_arrays_batch(
+            pressure, pressure * 2,
+            other_data={'enthalpy': pressure + 1},
+            branch=numpy.array([[False, False, True, True], [False, True, True, True]]),
+            storage=storage, **isotherm_parameters)
+
+        assert numpy.array_equal(isotherms[0].pressure(branch='des'), [3.0, 2.0])
+        assert numpy.array_equal(isotherms[1].other_data('enthalpy', branch='des'), [5.0, 7.0, 5.0])
+
+        with pytest.raises(pygaps.ParameterError):
+            pygaps.PointIsotherm.from_arrays_batch(
+                pressure, [[1.0, 2.0]], **isotherm_parameters)
+
+    @pytest.mark.parametrize('storage', ['pandas', 'numpy'])
+    def test_isotherm_pickle(self, isotherm_parameters, isotherm_data, storage):
+        "Checks isotherms are pickled without their caches"
+        import pickle
+
+        isotherm = pygaps.PointIsotherm(
+            isotherm_data=isotherm_data,
+            loading_key='loading',
+            pressure_key='pressure',
+            other_keys=['enthalpy'],
+            storage=storage,
+            **dict(isotherm_parameters, adsorbate='nitrogen')
+        )
+        isotherm.loading_at(2)
+        isotherm.pressure(branch='ads')
+        isotherm.adsorbate.saturation_pressure(77)
+
+        restored = pickle.loads(pickle.dumps(isotherm))
+        assert restored == isotherm
+        assert restored.storage == storage
+        assert not restored._interpolators
+        assert not restored._columns
+        assert restored.loading_at(2) == isotherm.loading_at(2)
+        assert restored.adsorbate.saturation_pressure(77) == isotherm.adsorbate.saturation_pressure(77)
+
     def test_isotherm_create_from_isotherm(self, basic_isotherm):
         "Checks isotherm can be created from isotherm"
 
@@ -282,6 +408,16 @@ class TestPointIsotherm():
             [5.0, 5.0, 5.0, 5.0, 5.0, 5.0, 4.0, 4.0]
         ))
 
+    def test_isotherm_ret_cached(self, basic_pointisotherm):
+        """Checks that returned columns are cached, read-only and discarded on conversion."""
+        pressure = basic_pointisotherm.pressure(branch='ads')
+        assert basic_pointisotherm.pressure(branch='ads') is pressure
+        with pytest.raises(ValueError):
+            pressure[0] = 0
+
+        basic_pointisotherm.convert_pressure(unit_to='Pa')
+        assert basic_pointisotherm.pressure(branch='ads')[0] == pytest.approx(pressure[0] * 1e5)
+
     ##########################
 
     @pytest.mark.parametrize('inp, expected, parameters', [
@@ -309,6 +445,21 @@ class TestPointIsotherm():
         assert numpy.isclose(basic_pointisotherm.loading_at(
             inp, **parameters), expected, 1e-5)
 
+    def test_isotherm_interpolator_cache(self, basic_pointisotherm):
+        """Checks that interpolators are kept for each branch and configuration."""
+        ads = basic_pointisotherm.loading_at(3, branch='ads')
+        des = basic_pointisotherm.loading_at(3, branch='des')
+        interpolators = dict(basic_pointisotherm._interpolators)
+        assert len(interpolators) == 2
+
+        assert basic_pointisotherm.loading_at(3, branch='ads') == ads
+        assert basic_pointisotherm.loading_at(3, branch='des') == des
+        assert all(a is b for a, b in zip(
+            interpolators.values(), basic_pointisotherm._interpolators.values()))
+
+        basic_pointisotherm.convert_pressure(unit_to='Pa')
+        assert not basic_pointisotherm._interpolators
+
     @pytest.mark.parametrize('inp, expected, parameters', [
         (1, 1, dict()),
         (4, 4, dict(branch='des')),
@@ -346,6 +497,39 @@ class TestPointIsotherm():
         assert numpy.isclose(basic_pointisotherm.spreading_pressure_at(
             inp, **parameters), expected, 1e-5)
 
+    def test_isotherm_spreading_pressure_at_array(self, basic_pointisotherm):
+        """Check that spreading pressure works on arrays and after conversion."""
+
+        pressures = [1, 2.5, 4.2, 6]
+        expected = [basic_pointisotherm.spreading_pressure_at(p) for p in pressures]
+
+        assert numpy.allclose(
+            basic_pointisotherm.spreading_pressure_at(pressures), expected)
+
+        with pytest.raises(pygaps.CalculationError):
+            basic_pointisotherm.spreading_pressure_at([1, 10])
+
+        basic_pointisotherm.convert_loading(unit_to='mol')
+        assert numpy.allclose(
+            basic_pointisotherm.spreading_pressure_at(pressures),
+            numpy.asarray(expected) / 1000)
+
+    @pytest.mark.parametrize('inp, parameters', [
+        (1, dict()),
+        ([1.5, 4, 6], dict()),
+        (0.5, dict(interp_fill=(0, 6))),
+        (100000, dict(pressure_unit='Pa')),
+        ([8, 20], dict(interp_fill=(0, 6))),
+    ])
+    def test_isotherm_pressure_at_spreading_pressure(self, basic_pointisotherm,
+                                                     inp, parameters):
+        """Check that the inverse of the spreading pressure is consistent."""
+
+        spreading_pressure = basic_pointisotherm.spreading_pressure_at(inp, **parameters)
+
+        assert numpy.allclose(basic_pointisotherm.pressure_at_spreading_pressure(
+            spreading_pressure, **parameters), inp)
+
     ##########################
 
     @pytest.mark.parametrize('unit, multiplier', [
@@ -111,3 +111,95 @@ class TestIsothermModels():
         )
         # for param in param_real:
         #     assert numpy.isclose(model.params[param], param_real[param], 0.01)
+
+    @pytest.mark.parametrize("m_name", ['DA', 'Toth', 'Jensen-Seaton', 'Virial', 'FH-VST'])
+    def test_models_tabulated(self, m_name):
+        """Test the tabulated representation of the models."""
+
+        model = models.get_isotherm_model(m_name)
+        model.params = dict(MODEL_DATA[m_name]['test_parameters'])
+        test_values = MODEL_DATA[m_name]['test_values']
+        pressures = [p for p in test_values['pressure'] if p > 0]
+        loadings = [n for n in test_values['loading'] if n > 0]
+
+        model.tabulate([0.9 * min(pressures), 1.1 * max(pressures)], tolerance=1e-7)
+
+        for i, p in enumerate(pressures):
+            assert numpy.isclose(model.tabulated('loading', p), loadings[i], 0.001)
+            if model.calculates == 'loading':
+                assert numpy.isclose(model.tabulated('pressure', loadings[i]), p, 0.001)
+            else:
+                assert model.tabulated('pressure', loadings[i]) is None
+
+        # arrays are supported
+        assert model.tabulated('loading', pressures).shape == (len(pressures), )
+
+        # outside the table
+        assert model.tabulated('loading', 2 * max(pressures)) is None
+
+        # changing the parameters discards the table
+        model.params[model.param_names[0]] *= 2
+        assert model.tabulated('loading', pressures[0]) is None
+        assert model._table is None
+
+    def test_models_tabulated_spreading(self):
+        """Test tabulated spreading pressure against known values."""
+
+        model = models.get_isotherm_model('Toth')
+        model.params = dict(MODEL_DATA['Toth']['test_parameters'])
+        test_values = MODEL_DATA['Toth']['test_values']
+        model.tabulate([0.1, 10])
+        for i, p in enumerate(test_values['pressure']):
+            assert numpy.isclose(
+                model.tabulated('spreading_pressure', p), test_values['spreading_pressure'][i], 0.001)
+
+        # the virial spreading pressure can be integrated analytically
+        model = models.get_isotherm_model('Virial')
+        model.params = dict(MODEL_DATA['Virial']['test_parameters'])
+        model.tabulate([0.04, 0.5])
+        for n in [0.2, 0.6, 1.0, 2.0]:
+            p = model.pressure(n)
+            spreading = n + model.params['A'] * n**2 / 2 + \
+                2 * model.params['B'] * n**3 / 3 + 3 * model.params['C'] * n**4 / 4
+            assert numpy.isclose(model.tabulated('spreading_pressure', p), spreading, 1e-5)
+
+        with pytest.raises(ParameterError):
+            model.tabulate([0, 1])
+
+    @pytest.mark.parametrize("m_name", ['Virial', 'FH-VST', 'W-VST'])
+    def test_models_loading_array(self, m_name):
+        """Test implicit models solve arrays of pressures as single values."""
+
+        model = models.get_isotherm_model(m_name)
+        model.params = dict(MODEL_DATA[m_name]['test_parameters'])
+        test_values = MODEL_DATA[m_name]['test_values']
+
+        pressures = numpy.linspace(0, max(test_values['pressure']), 1000)
+        loadings = model.loading(pressures)
+        assert loadings.shape == pressures.shape
+
+        for p, n in zip(pressures[::50], loadings[::50]):
+            assert numpy.isclose(model.loading(p), n, 1e-9)
+        assert numpy.allclose(model.pressure(loadings), pressures, 1e-9, 1e-12)
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize("m_name", ['Virial', 'FH-VST', 'W-VST'])
+    def test_models_loading_array_benchmark(self, m_name):
+        """Benchmark solving an array of pressures against a loop over the points."""
+        import time
+
+        model = models.get_isotherm_model(m_name)
+        model.params = dict(MODEL_DATA[m_name]['test_parameters'])
+        test_values = MODEL_DATA[m_name]['test_values']
+        pressures = numpy.linspace(0, max(test_values['pressure']), 1000)
+
+        start = time.perf_counter()
+        loadings = model.loading(pressures)
+        time_array = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single = [model.loading(p) for p in pressures]
+        time_loop = time.perf_counter() - start
+
+        assert numpy.allclose(loadings, single, 1e-9)
+        assert time_array < time_loop
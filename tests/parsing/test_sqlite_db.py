@@ -1,8 +1,12 @@
 """Tests sqlite database utilities."""
 
+import sqlite3
+
+import numpy
 import pytest
 
 import pygaps
+from pygaps.parsing.sqliteinterface import with_connection
 from pygaps.utilities.sqlite_db_creator import db_create
 from pygaps.utilities.sqlite_db_creator import db_execute_general
 
@@ -254,3 +258,158 @@ class TestDatabase():
         pygaps.db_upload_isotherm(db_file, basic_pointisotherm)
 
         return
+
+    def test_isotherms_bulk(self, db_file, isotherm_parameters, isotherm_data):
+        "Tests uploading many isotherms at once"
+
+        isotherms = []
+        for index in range(5):
+            isotherm_parameters['temperature'] = 200.0 + index
+            isotherms.append(pygaps.PointIsotherm(
+                isotherm_data=isotherm_data,
+                pressure_key='pressure',
+                loading_key='loading',
+                **isotherm_parameters))
+
+        assert not pygaps.db_upload_isotherms(db_file, isotherms[:3],
+                                              journal_mode='MEMORY', synchronous='OFF')
+        assert len(pygaps.db_get_isotherms(db_file, {'temperature': 201.0})) == 1
+
+        # Failures are reported and do not stop the others
+        failed = pygaps.db_upload_isotherms(db_file, isotherms)
+        assert [iso for iso, error in failed] == isotherms[:3]
+        assert len(pygaps.db_get_isotherms(db_file, {'temperature': 204.0})) == 1
+
+        # Isotherms which cannot be converted are reported as well
+        isotherm_parameters['temperature'] = 205.0
+        isotherm = pygaps.PointIsotherm(
+            isotherm_data=isotherm_data,
+            pressure_key='pressure',
+            loading_key='loading',
+            **isotherm_parameters)
+        failed = pygaps.db_upload_isotherms(db_file, [None, isotherm])
+        assert [iso for iso, error in failed] == [None]
+        assert len(pygaps.db_get_isotherms(db_file, {'temperature': 205.0})) == 1
+        pygaps.db_delete_isotherm(db_file, isotherm)
+
+        # The pragmas are checked and restored after the upload
+        with pytest.raises(pygaps.ParsingError):
+            pygaps.db_upload_isotherms(db_file, [], journal_mode='WAL; DROP TABLE isotherms')
+        with pytest.raises(pygaps.ParsingError):
+            pygaps.db_upload_isotherms(db_file, [], synchronous='SLOW')
+
+        pygaps.db_upload_isotherms(db_file, [], journal_mode='WAL', synchronous='OFF')
+        with sqlite3.connect(db_file) as conn:
+            assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+
+    def test_database_session(self, db_file, isotherm_parameters, isotherm_data):
+        "Tests passing a database session instead of a path"
+
+        db = pygaps.Database(db_file)
+        assert len(pygaps.db_get_isotherm_types(db)) == len(pygaps.db_get_isotherm_types(db_file))
+
+        isotherm_parameters['temperature'] = 300.0
+        isotherm = pygaps.PointIsotherm(
+            isotherm_data=isotherm_data,
+            pressure_key='pressure',
+            loading_key='loading',
+            **isotherm_parameters)
+
+        # Failed calls in a batch do not affect the others
+        with db:
+            pygaps.db_upload_isotherm(db, isotherm)
+            with pytest.raises(pygaps.ParsingError):
+                pygaps.db_upload_isotherm(db, isotherm)
+            assert len(pygaps.db_get_isotherms(db, {'temperature': 300.0})) == 1
+        assert len(pygaps.db_get_isotherms(db_file, {'temperature': 300.0})) == 1
+
+        # The batch is rolled back on error
+        with pytest.raises(pygaps.ParsingError):
+            with db:
+                pygaps.db_delete_isotherm(db, isotherm)
+                pygaps.db_delete_isotherm(db, isotherm)
+        assert len(pygaps.db_get_isotherms(db_file, {'temperature': 300.0})) == 1
+
+        db.close()
+
+    def test_database_session_error(self, db_file):
+        "Tests that a call failing with any error is rolled back"
+
+        @with_connection
+        def upload_then_fail(path, **kwargs):
+            cursor = kwargs.pop('cursor')
+            cursor.execute(
+                'INSERT INTO "material_properties_type" (type) VALUES (\'partial\')')
+            raise ValueError("Failed after writing.")
+
+        db = pygaps.Database(db_file)
+        for path in (db_file, db):
+            with pytest.raises(ValueError):
+                upload_then_fail(path)
+            assert not db.connection.in_transaction
+
+            # A later successful call does not commit the partial write
+            pygaps.db_get_material_property_types(db)
+            db.close()
+            with sqlite3.connect(db_file) as conn:
+                assert not conn.execute(
+                    'SELECT type FROM "material_properties_type" '
+                    'WHERE type = \'partial\'').fetchall()
+
+    def test_isotherms_iter(self, db_file):
+        "Tests iterating over isotherms"
+
+        isotherms = pygaps.db_get_isotherms(db_file, {})
+        iterated = list(pygaps.db_iter_isotherms(db_file, {}, chunk_size=2))
+        assert [iso.iso_id for iso in isotherms] == [iso.iso_id for iso in iterated]
+
+        # The ids reported are the ones stored in the database
+        with sqlite3.connect(db_file) as conn:
+            stored_ids = [row[0] for row in conn.execute(
+                'SELECT id FROM "isotherms" ORDER BY id')]
+
+        metadata = list(pygaps.db_iter_isotherms(
+            db_file, {}, order_by='id', fields='metadata'))
+        assert [meta['id'] for meta in metadata] == stored_ids
+
+        metadata = next(pygaps.db_iter_isotherms(db_file, {}, fields='metadata'))
+        assert metadata['material'] == isotherms[0].material
+
+        data = next(pygaps.db_iter_isotherms(db_file, {}, fields='data'))
+        assert set(data) == {'id', 'pressure', 'loading'}
+        assert data['id'] in stored_ids
+        assert numpy.array_equal(data['pressure'], isotherms[0].pressure())
+
+        with pytest.raises(pygaps.ParsingError):
+            next(pygaps.db_iter_isotherms(db_file, {}, fields='wrong'))
+
+    def test_isotherms_filter(self, db_file):
+        "Tests filtering isotherms in the database"
+
+        selected = pygaps.db_get_isotherms(
+            db_file, {'temperature': {'min': 201, 'max': 203}, 'adsorbate': ['TA', 'other']})
+        assert sorted(iso.temperature for iso in selected) == [201.0, 202.0, 203.0]
+
+        selected = pygaps.db_get_isotherms(db_file, {'temperature': [100.0, 204.0]},
+                                           properties={'user': 'TU'})
+        assert sorted(iso.temperature for iso in selected) == [100.0, 204.0]
+        assert not pygaps.db_get_isotherms(db_file, {}, properties={'user': 'nobody'})
+
+        selected = pygaps.db_get_isotherms(db_file, {}, order_by='-temperature', limit=2)
+        assert [iso.temperature for iso in selected] == [300.0, 204.0]
+
+        with pytest.raises(pygaps.ParsingError):
+            pygaps.db_get_isotherms(db_file, {'user': 'TU'})
+
+    def test_isotherms_filter_indexes(self, db_file):
+        "Tests that the isotherm filters use the database indexes"
+
+        sql_q, params = pygaps.parsing.sqliteinterface._isotherm_query(
+            {'material': 'TEST', 'adsorbate': 'TA', 'temperature': {'min': 77, 'max': 300}},
+            {'user': 'TU'})
+
+        with sqlite3.connect(db_file) as conn:
+            plan = ' '.join(row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql_q, params))
+
+        assert 'USING INDEX isotherms_search' in plan
+        assert 'USING INDEX isotherm_properties_search' in plan
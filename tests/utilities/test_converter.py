@@ -1,4 +1,6 @@
 """Tests unit converter."""
+import time
+
 import numpy
 import pytest
 
@@ -84,3 +86,79 @@ class TestConversions():
         )
 
         assert numpy.isclose(result, value, 0.01, 0.01)
+
+    def test_convert_loading_many(self):
+        """Adsorbates are found among many others by a case-insensitive name."""
+        from pygaps.utilities.unit_converter import ConversionPlan
+
+        extra = [pygaps.Adsorbate('bench{0}'.format(i)) for i in range(100)]
+        extra.append(pygaps.Adsorbate('bench', backend_name='nitrogen'))
+        pygaps.ADSORBATE_LIST.extend(extra)
+
+        try:
+            ConversionPlan.cache_clear()
+            result = pygaps.utilities.unit_converter.c_loading(
+                1,
+                basis_from='mass', basis_to='molar',
+                unit_from='g', unit_to='mmol',
+                adsorbate_name='BENCH', temp=77.344,
+            )
+            assert numpy.isclose(result, 35.7, 0.01)
+        finally:
+            del pygaps.ADSORBATE_LIST[-len(extra):]
+
+    @pytest.mark.benchmark
+    def test_convert_loading_many_benchmark(self):
+        """Benchmark adsorbate lookups, which should not scale with the adsorbate list."""
+        extra = [pygaps.Adsorbate('bench{0}'.format(i)) for i in range(5000)]
+        extra.append(pygaps.Adsorbate('bench', backend_name='nitrogen'))
+        pygaps.ADSORBATE_LIST.extend(extra)
+
+        try:
+            start = time.perf_counter()
+            for _ in range(2000):
+                pygaps.Adsorbate.find('BENCH')
+            assert time.perf_counter() - start < 1.0
+        finally:
+            del pygaps.ADSORBATE_LIST[-len(extra):]
+
+    def test_conversion_plan(self, use_adsorbate, use_material):
+        """Plans are resolved once, cached and give the same result as the functions."""
+        from pygaps.utilities.unit_converter import ConversionPlan
+        ConversionPlan.cache_clear()
+
+        plan = ConversionPlan.loading(
+            basis_from='mass', basis_to='molar',
+            unit_from='g', unit_to='mmol',
+            adsorbate_name='TA', temp=77.344)
+        assert plan is ConversionPlan.loading(
+            basis_from='mass', basis_to='molar',
+            unit_from='g', unit_to='mmol',
+            adsorbate_name='TA', temp=77.344)
+
+        values = numpy.linspace(0, 10, 5)
+        assert numpy.allclose(plan(values), pygaps.utilities.unit_converter.c_loading(
+            values,
+            basis_from='mass', basis_to='molar',
+            unit_from='g', unit_to='mmol',
+            adsorbate_name='TA', temp=77.344))
+
+        # No conversion leaves values untouched
+        identity = ConversionPlan.pressure(
+            mode_from='absolute', mode_to='absolute',
+            unit_from='bar', unit_to=None)
+        assert identity.identity
+        assert identity(values) is values
+
+        # Plans can be combined
+        adsorbent = ConversionPlan.adsorbent(
+            basis_from='mass', basis_to='volume',
+            unit_from='g', unit_to='cm3',
+            material='TEST', material_batch='TB')
+        assert numpy.allclose((adsorbent * plan)(values), adsorbent(plan(values)))
+        assert (identity * plan) is plan
+
+        with pytest.raises(pygaps.ParameterError):
+            ConversionPlan.pressure(
+                mode_from='absolute', mode_to='absolute',
+                unit_from='bar', unit_to='unknown')
@@ -1,6 +1,9 @@
 """Test sqlite utilities."""
 
+import pytest
+
 import pygaps.utilities.sqlite_utilities as squ
+from pygaps.utilities.exceptions import ParameterError
 
 tb = 'table'
 s1 = ['a', 'b']
@@ -39,3 +42,15 @@ def test_select_unnamed():
 def test_delete():
     delete = r'DELETE FROM "table" WHERE a = :a AND b = :b'
     assert delete == squ.build_delete(tb, s1)
+
+
+def test_condition():
+    assert ('a = :a', {'a': 1}) == squ.build_condition('a', 1, 'a')
+
+    assert ('a IN (:n_0, :n_1)', {'n_0': 1, 'n_1': 2}) == squ.build_condition('a', [1, 2], 'n')
+
+    assert ('a >= :n_min AND a <= :n_max', {'n_min': 1, 'n_max': 2}) == \
+        squ.build_condition('a', {'min': 1, 'max': 2}, 'n')
+
+    with pytest.raises(ParameterError):
+        squ.build_condition('a', {'mn': 3}, 'n')
@@ -4,6 +4,7 @@ Tests utilities
 
 import os
 
+import numpy
 import pytest
 
 import pygaps.utilities as utilities
@@ -29,3 +30,35 @@ def test_file_paths():
         path, extension='.tst')
 
     assert all([path in known_paths for path in paths])
+
+
+@pytest.mark.core
+def test_bracketed_root():
+    targets = numpy.array([0, 0.5, 8, 27])
+    roots = utilities.math_utilities.bracketed_root(lambda x: x**3, targets, 0, 4)
+    assert numpy.allclose(roots, numpy.cbrt(targets))
+
+    with pytest.raises(utilities.exceptions.CalculationError):
+        utilities.math_utilities.bracketed_root(lambda x: x**3, targets, 0, 4, max_iter=2)
+
+
+@pytest.mark.core
+@pytest.mark.parametrize('fill', [None, 7.0, (0, 20), 'extrapolate'])
+def test_isotherm_interpolator(fill):
+    from scipy.interpolate import interp1d
+    from pygaps.utilities.isotherm_interpolator import isotherm_interpolator
+
+    known = numpy.array([3.0, 1.0, 2.0, 5.0, 4.0])
+    interp = known ** 2
+    points = numpy.linspace(1, 5, 17)
+    if fill is not None:
+        points = numpy.linspace(0, 6, 25)
+        expected = interp1d(known, interp, fill_value=fill, bounds_error=False)(points)
+    else:
+        expected = interp1d(known, interp)(points)
+        with pytest.raises(ValueError):
+            isotherm_interpolator('loading', known, interp)(6)
+
+    interpolator = isotherm_interpolator('loading', known, interp, interp_fill=fill)
+    assert interpolator.interp_fun is None
+    assert numpy.allclose(interpolator(points), expected)